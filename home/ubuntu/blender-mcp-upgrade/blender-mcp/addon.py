@@ -6,42 +6,32 @@
         if cmd_type == "get_polyhaven_status":
             return {"status": "success", "result": self.get_polyhaven_status()}
         
-        # Base handlers that are always available
-        handlers = {
-            "get_scene_info": self.get_scene_info,
-            "create_object": self.create_object,
-            "modify_object": self.modify_object,
-            "delete_object": self.delete_object,
-            "get_object_info": self.get_object_info,
-            "execute_code": self.execute_code,
-            "set_material": self.set_material,
-            "get_polyhaven_status": self.get_polyhaven_status,
-            "get_hyper3d_status": self.get_hyper3d_status,
-        }
-        
-        # Add Polyhaven handlers only if enabled
-        if bpy.context.scene.blendermcp_use_polyhaven:
-            polyhaven_handlers = {
-                "get_polyhaven_categories": self.get_polyhaven_categories,
-                "search_polyhaven_assets": self.search_polyhaven_assets,
-                "download_polyhaven_asset": self.download_polyhaven_asset,
-                "set_texture": self.set_texture,
+        # Run an ordered list of sub-commands in this same main-thread slice
+        if cmd_type == "batch":
+            from blender_mcp.dispatch import execute_batch
+            return {
+                "status": "success",
+                "result": execute_batch(
+                    self._execute_command_internal,
+                    params.get("commands", []),
+                    stop_on_error=params.get("stop_on_error", False)
+                )
             }
-            handlers.update(polyhaven_handlers)
         
-        # Add Hyper3d handlers only if enabled
-        if bpy.context.scene.blendermcp_use_hyper3d:
-            polyhaven_handlers = {
-                "create_rodin_job": self.create_rodin_job,
-                "poll_rodin_job_status": self.poll_rodin_job_status,
-                "import_generated_asset": self.import_generated_asset,
-            }
-            handlers.update(polyhaven_handlers)
-
-        handler = handlers.get(cmd_type)
+        # Handlers come from the precomputed registry, built on first use; the
+        # PolyHaven/Hyper3D toggles update it through their update callbacks
+        handler_registry = getattr(self, "handler_registry", None)
+        if handler_registry is None:
+            from blender_mcp.dispatch import build_addon_handler_registry
+            handler_registry = self.handler_registry = build_addon_handler_registry(self, bpy.context.scene)
+        handler = handler_registry.get(cmd_type)
         if handler:
             try:
                 print(f"Executing handler for {cmd_type}")
                 result = handler(**params)
+                if handler.chunked:
+                    # Generator handler; the main-thread scheduler resumes it between ticks
+                    from blender_mcp.scheduler import chunked_response
+                    return chunked_response(result)
                 print(f"Handler execution complete")
                 return {"status": "success", "result": result}
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Cold-startup budget check for BlenderMCPUltimate.
+
+Imports `blender_mcp.modules.integration` and creates `BlenderMCPUltimate`,
+then fails (exit status 1) if that took longer than the budget or pulled in
+any subsystem that should only load when one of its commands is routed.
+Run it with Blender's bundled Python to measure the real startup:
+
+    blender --background --factory-startup --python benchmarks/import_budget.py -- --budget 0.25
+
+Outside Blender (e.g. in CI) `bpy` is replaced by a stub, so the lazy-import
+check still runs; the timing then leaves out Blender's own modules:
+
+    python benchmarks/import_budget.py --budget 0.25
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Modules that must not be imported by a cold start
+LAZY_MODULES = (
+    "blender_mcp.modules.asset_management",
+    "blender_mcp.modules.scene_setup",
+    "blender_mcp.modules.character_animation",
+    "blender_mcp.modules.physics_vfx",
+    "blender_mcp.modules.rendering",
+    "blender_mcp.modules.progress_tracking",
+    "blender_mcp.modules.performance_optimization",
+    "requests",
+    "psutil",
+)
+
+
+def stub_bpy() -> bool:
+    """
+    Put a stub `bpy` in `sys.modules` if Blender's is not available.
+
+    Any attribute of the stub is another stub, so a subsystem imported
+    eagerly still imports and is reported instead of failing the import.
+
+    Returns:
+        Whether the stub was installed
+    """
+    try:
+        import bpy  # noqa: F401
+        return False
+    except ImportError:
+        sys.modules["bpy"] = mock.MagicMock(name="bpy")
+        return True
+
+
+def main():
+    # Blender passes its own arguments; ours follow "--"
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.25, help="Maximum seconds for import and construction")
+    args = parser.parse_args(argv)
+
+    if stub_bpy():
+        print("bpy is not available; using a stub")
+
+    already_loaded = [name for name in LAZY_MODULES if name in sys.modules]
+
+    start = time.perf_counter()
+    from blender_mcp.modules.integration import BlenderMCPUltimate
+    BlenderMCPUltimate()
+    elapsed = time.perf_counter() - start
+
+    eager = [name for name in LAZY_MODULES if name in sys.modules and name not in already_loaded]
+
+    print(f"Cold startup: {elapsed * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)")
+    if eager:
+        print(f"Imported eagerly: {', '.join(eager)}")
+
+    if elapsed > args.budget or eager:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Loopback load test for the MCP server's Blender connection.
+
+Starts a stand-in addon server (no Blender required) and drives
+`blender_mcp.server.BlenderConnection` with N concurrent clients, each
+sending commands back to back. Reports latency percentiles, throughput,
+errors and reconnects.
+
+    python benchmarks/load_test.py --clients 16 --duration 10 --latency 0.002 --response-size 4096
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from blender_mcp.server import BlenderConnection  # noqa: E402
+from blender_mcp.standin import StandInAddonServer  # noqa: E402
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of pre-sorted values."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class ClientWorker(threading.Thread):
+    """A client sending commands in a closed loop until the deadline."""
+
+    def __init__(self, connection: BlenderConnection, command_type: str, deadline: float):
+        super().__init__(daemon=True)
+        self.connection = connection
+        self.command_type = command_type
+        self.deadline = deadline
+        self.latencies = []
+        self.errors = 0
+
+    def run(self):
+        while time.perf_counter() < self.deadline:
+            start = time.perf_counter()
+            try:
+                self.connection.send_command(self.command_type)
+            except Exception:
+                self.errors += 1
+                continue
+            self.latencies.append(time.perf_counter() - start)
+
+
+def run_load_test(clients: int, duration: float, latency: float, response_size: int,
+                  drop_rate: float, command_type: str, unix_path: str = None, pool_size: int = 1) -> dict:
+    """Run one load test and return its report."""
+    server = StandInAddonServer(latency=latency, response_size=response_size,
+                                drop_rate=drop_rate, unix_path=unix_path)
+    server.start()
+
+    connections = [BlenderConnection(host=server.host, port=server.port, unix_path=unix_path, pool_size=pool_size)
+                   for _ in range(clients)]
+    try:
+        for connection in connections:
+            if not connection.connect():
+                raise RuntimeError("Could not connect to the stand-in server")
+
+        start = time.perf_counter()
+        workers = [ClientWorker(connection, command_type, start + duration) for connection in connections]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        pool_stats = [connection.get_pool_stats() for connection in connections]
+    finally:
+        for connection in connections:
+            connection.disconnect()
+        server.stop()
+
+    latencies = sorted(value for worker in workers for value in worker.latencies)
+    return {
+        "clients": clients,
+        "duration": round(elapsed, 3),
+        "requests": len(latencies),
+        "errors": sum(worker.errors for worker in workers),
+        "throughput": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0
+        },
+        "reconnects": sum(stats["reconnects"] for stats in pool_stats),
+        "retries": sum(stats["retries"] for stats in pool_stats),
+        "max_checkout_wait_ms": round(max(stats["max_checkout_wait"] for stats in pool_stats) * 1000, 3),
+        "dropped_connections": server.dropped_connections
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Handler latency in seconds")
+    parser.add_argument("--response-size", type=int, default=1024, help="Bytes of payload per response")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="Probability the server drops a connection after a response")
+    parser.add_argument("--pool-size", type=int, default=1, help="Connections per client")
+    parser.add_argument("--command", default="get_scene_info", help="Command type to send")
+    parser.add_argument("--unix-path", default=None, help="Use a Unix domain socket at this path")
+    args = parser.parse_args()
+
+    # Connection errors are expected when dropping connections; keep the report readable
+    logging.disable(logging.ERROR)
+
+    report = run_load_test(args.clients, args.duration, args.latency, args.response_size,
+                           args.drop_rate, args.command, args.unix_path, args.pool_size)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
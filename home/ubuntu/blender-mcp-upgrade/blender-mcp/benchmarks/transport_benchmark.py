@@ -0,0 +1,91 @@
+"""
+Compare bulk payload transfer over TCP + base64 JSON against a Unix domain
+socket + shared memory.
+
+Runs two stand-in addon servers (no Blender required) whose `get_mesh_vertices`
+handler returns a synthetic float32 vertex array, and times full round trips
+from `AsyncBlenderConnection.get_mesh_vertices`.
+
+    python benchmarks/transport_benchmark.py --vertices 1000000 --rounds 10
+"""
+
+import argparse
+import array
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from blender_mcp.addon_server import AddonSocketServer  # noqa: E402
+from blender_mcp.bulk_transfer import encode_bulk  # noqa: E402
+from blender_mcp.client import AsyncBlenderConnection  # noqa: E402
+
+
+def make_executor(vertex_count: int):
+    """Build a stand-in command executor serving a fixed vertex array."""
+    coordinates = array.array("f", range(vertex_count * 3))
+
+    def execute(command):
+        params = command.get("params", {})
+        if command.get("type") != "get_mesh_vertices":
+            return {"status": "error", "message": f"Unknown command type: {command.get('type')}"}
+
+        return {"status": "success", "result": {
+            "name": params["name"],
+            "vertex_count": vertex_count,
+            "vertices": encode_bulk(coordinates, params.get("transport"), format="f", shape=[vertex_count, 3])
+        }}
+
+    return execute
+
+
+async def time_transfers(connection: AsyncBlenderConnection, rounds: int, vertex_count: int):
+    """Time `rounds` vertex fetches, returning per-round latencies in seconds."""
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        vertices = await connection.get_mesh_vertices("Benchmark")
+        latencies.append(time.perf_counter() - start)
+        assert len(vertices) == vertex_count * 3
+    await connection.disconnect()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vertices", type=int, default=1000000, help="Vertices in the synthetic mesh")
+    parser.add_argument("--rounds", type=int, default=10, help="Transfers per transport")
+    args = parser.parse_args()
+
+    execute = make_executor(args.vertices)
+    unix_path = os.path.join(tempfile.mkdtemp(), "blendermcp.sock")
+
+    tcp_server = AddonSocketServer(port=0, execute=execute)
+    unix_server = AddonSocketServer(execute=execute, unix_path=unix_path)
+    tcp_server.start()
+    unix_server.start()
+
+    try:
+        transports = {
+            "tcp+base64": AsyncBlenderConnection("localhost", tcp_server.port),
+            "uds+shm": AsyncBlenderConnection("localhost", 0, unix_path=unix_path),
+        }
+        payload_mb = args.vertices * 3 * 4 / (1024 * 1024)
+
+        print(f"Payload: {args.vertices} vertices ({payload_mb:.1f} MB), {args.rounds} rounds")
+        for name, connection in transports.items():
+            latencies = asyncio.run(time_transfers(connection, args.rounds, args.vertices))
+            median = statistics.median(latencies)
+            print(f"{name:>12}: median {median * 1000:8.2f} ms, "
+                  f"min {min(latencies) * 1000:8.2f} ms, {payload_mb / median:8.1f} MB/s")
+    finally:
+        tcp_server.stop()
+        unix_server.stop()
+
+
+if __name__ == "__main__":
+    main()
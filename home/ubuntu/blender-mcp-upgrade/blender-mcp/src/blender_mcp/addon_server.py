@@ -0,0 +1,415 @@
+"""
+BlenderMCP addon socket server.
+
+Accepts connections from the MCP server, reads framed commands (see
+`blender_mcp.protocol`) and hands them to the addon's command executor.
+The server itself does not depend on `bpy`: the addon supplies either a
+`MainThreadScheduler` (see `blender_mcp.scheduler`) or a plain `schedule`
+callable that runs work on Blender's main thread, which keeps this module
+usable outside of Blender. `create_addon_server` builds the addon's server on
+the shared `main_thread_scheduler`.
+
+A command envelope may carry a "timeout" in seconds, after which the command
+is abandoned if it has not finished, and "profile": true to record a
+sampling profile of it (see `blender_mcp.profiler`). The `cancel` and `ping` commands are
+answered on the socket thread, without waiting for the main thread; `cancel`
+flags the command with the given request id (or every running command) as
+cancelled.
+
+`subscribe_progress` starts pushing progress events (see
+`blender_mcp.events`) to the client as frames without a request id, until
+`unsubscribe_progress` or disconnect.
+
+With a `metrics_address` (or `BLENDER_MCP_METRICS_PORT`), the server also
+serves OpenMetrics text for Prometheus from its own thread: command latency as
+seen by the client, including queue wait, plus queue depth, cache hit ratios,
+active operations, Blender's RSS and datablock counts (see
+`blender_mcp.openmetrics`).
+"""
+
+import os
+import socket
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Any, Optional, Set, Tuple
+
+from blender_mcp.cancellation import CancelToken, OperationCancelled, activate
+from blender_mcp import openmetrics
+from blender_mcp.dispatch import get_cache_stats, ping
+from blender_mcp.events import DEFAULT_MAX_RATE, ProgressEventHub, progress_events
+from blender_mcp.metrics import MetricsRegistry, metrics
+from blender_mcp.pipeline import stage_cache
+from blender_mcp.profiler import command_profiler
+from blender_mcp.scene_cache import unregister_scene_tracking
+from blender_mcp.scheduler import MainThreadScheduler, command_lane, main_thread_scheduler, run_to_completion
+from blender_mcp.protocol import (
+    DEFAULT_MAX_FRAME_SIZE,
+    FrameReader,
+    FrameTooLargeError,
+    ProtocolError,
+    send_message
+)
+
+
+def run_immediately(callback: Callable[[], None]) -> None:
+    """Default scheduler that runs the callback on the calling thread."""
+    callback()
+
+
+def run_on_blender_main_thread(callback: Callable[[], None]) -> None:
+    """Scheduler that runs the callback on Blender's main thread."""
+    import bpy
+
+    def timer_callback():
+        callback()
+        return None  # Run once
+
+    bpy.app.timers.register(timer_callback, first_interval=0.0)
+
+
+def create_addon_server(execute: Callable[[Dict], Dict], host: str = "localhost", port: int = 9876,
+                        **kwargs) -> "AddonSocketServer":
+    """
+    Create the command server the Blender addon runs.
+
+    Commands are queued on the shared `main_thread_scheduler`, so chunked
+    handlers are resumed between timer ticks instead of running to completion.
+
+    Args:
+        execute: The addon's command executor
+        host: Host to listen on
+        port: Port to listen on
+        **kwargs: Further `AddonSocketServer` options
+
+    Returns:
+        The server, not yet started
+    """
+    return AddonSocketServer(host, port, execute=execute, scheduler=main_thread_scheduler, **kwargs)
+
+
+class AddonSocketServer:
+    """
+    Socket server used by the Blender addon to receive commands.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 9876,
+                 execute: Callable[[Dict], Dict] = None,
+                 schedule: Callable[[Callable[[], None]], None] = run_immediately,
+                 scheduler: MainThreadScheduler = None,
+                 max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+                 unix_path: str = None,
+                 events: ProgressEventHub = progress_events,
+                 metrics_address: Optional[Tuple[str, int]] = None):
+        self.host = host
+        self.port = port
+        # Listen on a Unix domain socket instead of TCP when set
+        self.unix_path = unix_path
+        self.execute = execute
+        self.schedule = schedule
+        self.scheduler = scheduler
+        self.max_frame_size = max_frame_size
+        self.events = events
+        self.running = False
+        self.socket = None
+        self.server_thread = None
+        # Tokens of every command accepted and not yet finished, across clients
+        self.active_tokens: Set[CancelToken] = set()
+        self._tokens_lock = threading.Lock()
+        # Latency of every dispatched command from receipt to response
+        self.command_metrics = MetricsRegistry()
+        if metrics_address is None:
+            metrics_address = openmetrics.parse_metrics_address(os.environ.get(openmetrics.METRICS_PORT_ENV))
+        self.metrics_address = metrics_address
+        self.metrics_exporter = None
+
+    def start(self) -> None:
+        """Start listening for connections in a background thread."""
+        if self.running:
+            print("Server is already running")
+            return
+
+        if self.unix_path:
+            # Remove a socket file left behind by a previous run
+            if os.path.exists(self.unix_path):
+                os.unlink(self.unix_path)
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.bind(self.unix_path)
+            address = self.unix_path
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.bind((self.host, self.port))
+
+            # Pick up the real port when binding to port 0
+            self.port = self.socket.getsockname()[1]
+            address = f"{self.host}:{self.port}"
+
+        self.socket.listen(5)
+        self.running = True
+
+        self.server_thread = threading.Thread(target=self._server_loop, daemon=True)
+        self.server_thread.start()
+
+        print(f"BlenderMCP server started on {address}")
+
+        if self.metrics_address is not None:
+            self._start_metrics_exporter()
+
+    def stop(self) -> None:
+        """Stop the server and close the listening socket."""
+        self.running = False
+
+        if self.socket:
+            try:
+                self.socket.close()
+            except Exception:
+                pass
+            self.socket = None
+
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+        if self.server_thread and self.server_thread is not threading.current_thread():
+            self.server_thread.join(timeout=1.0)
+        self.server_thread = None
+
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+
+        # Installed by the addon's handler registry; a no-op outside Blender
+        unregister_scene_tracking()
+
+        print("BlenderMCP server stopped")
+
+    def _start_metrics_exporter(self) -> None:
+        """Serve the addon's metrics; failing to bind the port leaves the server running."""
+        # Datablocks can only be counted on the main thread
+        schedule = self.scheduler.schedule if self.scheduler is not None else self.schedule
+        datablocks = openmetrics.DatablockCounts(schedule)
+
+        collectors = [
+            lambda: openmetrics.registry_families(self.command_metrics, "command", include_cpu=False),
+            lambda: openmetrics.registry_families(metrics, "operation"),
+            lambda: openmetrics.cache_families(dict(get_cache_stats(), stage_cache=stage_cache.get_stats())),
+            openmetrics.process_families,
+            openmetrics.progress_families,
+            datablocks.families
+        ]
+        if self.scheduler is not None:
+            collectors.append(lambda: openmetrics.scheduler_families(self.scheduler.get_stats()))
+
+        host, port = self.metrics_address
+        exporter = openmetrics.MetricsExporter(collectors, host, port)
+        try:
+            exporter.start()
+        except OSError as e:
+            print(f"Could not serve metrics on {host}:{port}: {str(e)}")
+            return
+        self.metrics_exporter = exporter
+
+    def _server_loop(self) -> None:
+        """Accept incoming connections and serve each in its own thread."""
+        self.socket.settimeout(1.0)  # Allows checking self.running periodically
+
+        while self.running:
+            try:
+                client, address = self.socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            print(f"Connected to client: {address}")
+            client_thread = threading.Thread(target=self._handle_client, args=(client,), daemon=True)
+            client_thread.start()
+
+    def _handle_client(self, client: socket.socket) -> None:
+        """
+        Serve framed commands from a single client until it disconnects.
+
+        Commands are handed to the scheduler as soon as they are read, so a
+        client may pipeline many requests; each response echoes the request id
+        of its command and may be sent in any order.
+
+        Args:
+            client: Connected client socket
+        """
+        if client.family != socket.AF_UNIX:
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        reader = FrameReader(max_frame_size=self.max_frame_size)
+        send_lock = threading.Lock()
+        # Tokens of this client's unfinished commands by request id
+        tokens: Dict[Any, CancelToken] = {}
+        subscriptions: Set[int] = set()
+
+        try:
+            while self.running:
+                try:
+                    command = reader.read_message(client)
+                except ProtocolError as e:
+                    # Without a readable request id the error cannot be matched to a
+                    # pending request, and after an oversized frame the stream cannot
+                    # be resynchronized, so report the error and drop the connection
+                    self._send_response(client, send_lock, {"status": "error", "message": str(e)})
+                    break
+
+                if command.get("type") == "cancel":
+                    self._cancel(client, send_lock, tokens, command)
+                elif command.get("type") == "ping":
+                    # A long job on the main thread must not fail health checks
+                    self._reply(client, send_lock, command, ping())
+                elif command.get("type") in ("subscribe_progress", "unsubscribe_progress"):
+                    self._subscription(client, send_lock, subscriptions, command)
+                else:
+                    self._dispatch(client, send_lock, tokens, command)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            # Nobody is left to receive the results
+            for token in list(tokens.values()):
+                token.cancel("Client disconnected")
+            for subscription_id in subscriptions:
+                self.events.unsubscribe(subscription_id)
+            try:
+                client.close()
+            except Exception:
+                pass
+            print("Client disconnected")
+
+    def _cancel(self, client: socket.socket, send_lock: threading.Lock, tokens: Dict[Any, CancelToken],
+                command: Dict[str, Any]) -> None:
+        """
+        Flag commands as cancelled and acknowledge right away.
+
+        Params are either "request_id" of one of this client's commands, or
+        "all": true to cancel every unfinished command on the server.
+        """
+        params = command.get("params", {})
+
+        if params.get("all"):
+            with self._tokens_lock:
+                targets = list(self.active_tokens)
+        else:
+            token = tokens.get(params.get("request_id"))
+            targets = [token] if token is not None else []
+
+        for token in targets:
+            token.cancel(params.get("reason", "Cancelled by client"))
+
+        self._reply(client, send_lock, command, {"cancelled": len(targets)})
+
+    def _subscription(self, client: socket.socket, send_lock: threading.Lock, subscriptions: Set[int],
+                      command: Dict[str, Any]) -> None:
+        """
+        Start or stop streaming progress events to the client.
+
+        `subscribe_progress` takes an optional "max_rate" (progress updates per
+        second per operation) and returns the "subscription" id that
+        `unsubscribe_progress` takes.
+        """
+        params = command.get("params", {})
+
+        if command["type"] == "subscribe_progress":
+            subscription_id = self.events.subscribe(
+                lambda message: self._send_response(client, send_lock, message),
+                params.get("max_rate", DEFAULT_MAX_RATE)
+            )
+            subscriptions.add(subscription_id)
+            self._reply(client, send_lock, command, {"subscription": subscription_id})
+            return
+
+        subscription_id = params.get("subscription")
+        subscriptions.discard(subscription_id)
+        self._reply(client, send_lock, command, {"unsubscribed": self.events.unsubscribe(subscription_id)})
+
+    def _reply(self, client: socket.socket, send_lock: threading.Lock, command: Dict[str, Any], result: Any) -> None:
+        """Send a success response for a command answered on the socket thread."""
+        response = {"status": "success", "result": result}
+        if command.get("id") is not None:
+            response["id"] = command["id"]
+        self._send_response(client, send_lock, response)
+
+    def _dispatch(self, client: socket.socket, send_lock: threading.Lock, tokens: Dict[Any, CancelToken],
+                  command: Dict[str, Any]) -> None:
+        """
+        Schedule a command and send its response once it has run.
+
+        Args:
+            client: Client socket the response is written to
+            send_lock: Lock serializing writes to the client socket
+            tokens: The client's unfinished commands by request id
+            command: Decoded command
+        """
+        request_id = command.get("id")
+        token = CancelToken(command.get("timeout"))
+        received = time.perf_counter_ns()
+
+        if request_id is not None:
+            tokens[request_id] = token
+        with self._tokens_lock:
+            self.active_tokens.add(token)
+
+        def finish(response, error):
+            tokens.pop(request_id, None)
+            with self._tokens_lock:
+                self.active_tokens.discard(token)
+
+            if isinstance(error, OperationCancelled):
+                response = {"status": "error", "message": f"Command cancelled: {str(error)}", "cancelled": True}
+            elif error is not None:
+                traceback.print_exception(type(error), error, error.__traceback__)
+                response = {"status": "error", "message": str(error)}
+
+            if request_id is not None:
+                response = dict(response, id=request_id)
+
+            self.command_metrics.record({
+                "operation_name": command.get("type", "unknown"),
+                "success": response.get("status") != "error",
+                "execution_time": (time.perf_counter_ns() - received) / 1e9,
+                "cpu_time": None,
+                "memory_usage": None,
+                "timestamp": time.time()
+            })
+            self._send_response(client, send_lock, response)
+
+        if self.scheduler is not None:
+            # Chunked handlers are resumed by the scheduler between ticks
+            self.scheduler.submit(lambda: self._execute(command), lane=command_lane(command), on_done=finish,
+                                  token=token)
+            return
+
+        def execute_wrapper():
+            try:
+                token.check()
+                with activate(token):
+                    result = self._execute(command)
+                response = run_to_completion(result, token)
+            except Exception as e:
+                finish(None, e)
+                return
+
+            finish(response, None)
+
+        self.schedule(execute_wrapper)
+
+    def _execute(self, command: Dict[str, Any]) -> Any:
+        """Run a command, under the sampling profiler if it is selected or flagged with "profile"."""
+        return command_profiler.call(command.get("type", "unknown"), self.execute, command,
+                                     force=bool(command.get("profile")))
+
+    def _send_response(self, client: socket.socket, send_lock: threading.Lock, response: Dict[str, Any]) -> None:
+        """Send a framed response, replacing it with an error if it is too large."""
+        try:
+            with send_lock:
+                try:
+                    send_message(client, response, self.max_frame_size)
+                except FrameTooLargeError as e:
+                    error = {"status": "error", "message": str(e)}
+                    if "id" in response:
+                        error["id"] = response["id"]
+                    send_message(client, error, self.max_frame_size)
+        except OSError:
+            pass
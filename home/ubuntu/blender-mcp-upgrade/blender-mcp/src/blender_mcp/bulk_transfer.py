@@ -0,0 +1,190 @@
+"""
+BlenderMCP bulk payload transfer.
+
+Large binary payloads (mesh vertex arrays, viewport captures, rendered
+frames) are expensive to push through base64 and JSON. When the MCP server
+and the addon run on the same machine, the addon can instead place the
+payload in a `multiprocessing.shared_memory` segment and send only a small
+descriptor over the socket. The reader copies the bytes out and unlinks the
+segment.
+
+Descriptors look like:
+
+    {"encoding": "shm", "name": "psm_1234", "size": 12000000, "format": "f", "shape": [1000000, 3]}
+    {"encoding": "base64", "data": "...", "size": 12000000, "format": "f", "shape": [1000000, 3]}
+"""
+
+import array
+import base64
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Optional
+
+BASE64 = "base64"
+SHM = "shm"
+
+# Segments not consumed within this many seconds are reclaimed by the producer
+DEFAULT_SEGMENT_TTL = 60.0
+
+
+def _untrack(segment: shared_memory.SharedMemory) -> None:
+    """
+    Hand ownership of a segment to the reader.
+
+    Otherwise the producer's resource tracker would unlink it (and warn) when
+    the producer exits.
+    """
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, "shared_memory")
+    except Exception:
+        pass
+
+
+class SharedMemoryChannel:
+    """
+    Producer side of the shared-memory side channel.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_SEGMENT_TTL):
+        self.ttl = ttl
+        self.published: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, data) -> Dict[str, Any]:
+        """
+        Copy a payload into a new shared-memory segment.
+
+        Args:
+            data: Bytes-like payload
+
+        Returns:
+            Descriptor with the segment name and size
+        """
+        self.sweep()
+
+        view = memoryview(data).cast("B")
+        segment = shared_memory.SharedMemory(create=True, size=max(view.nbytes, 1))
+        try:
+            segment.buf[:view.nbytes] = view
+            name = segment.name
+        finally:
+            segment.close()
+        _untrack(segment)
+
+        with self._lock:
+            self.published[name] = time.monotonic()
+
+        return {"encoding": SHM, "name": name, "size": view.nbytes}
+
+    def sweep(self) -> int:
+        """
+        Unlink published segments older than the TTL that nobody consumed.
+
+        Returns:
+            Number of segments reclaimed
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [name for name, published_at in self.published.items() if now - published_at > self.ttl]
+            for name in expired:
+                del self.published[name]
+
+        for name in expired:
+            try:
+                segment = shared_memory.SharedMemory(name=name)
+            except FileNotFoundError:
+                continue  # Already consumed
+            segment.close()
+            segment.unlink()
+
+        return len(expired)
+
+
+# Channel used by the addon's bulk handlers
+shm_channel = SharedMemoryChannel()
+
+
+def encode_bulk(data, transport: str = BASE64, format: str = "B", shape: Optional[List[int]] = None) -> Dict[str, Any]:
+    """
+    Encode a bulk payload for a command result.
+
+    Args:
+        data: Bytes-like payload
+        transport: "shm" for the shared-memory side channel, otherwise base64
+        format: `array`/`struct` format code of the items
+        shape: Logical shape of the items
+
+    Returns:
+        Descriptor to embed in the result
+    """
+    if transport == SHM:
+        descriptor = shm_channel.publish(data)
+    else:
+        raw = memoryview(data).cast("B")
+        descriptor = {"encoding": BASE64, "data": base64.b64encode(raw).decode("ascii"), "size": raw.nbytes}
+
+    descriptor["format"] = format
+    descriptor["shape"] = shape
+    return descriptor
+
+
+def read_bulk(descriptor: Dict[str, Any]) -> bytes:
+    """
+    Read a bulk payload from its descriptor.
+
+    Shared-memory segments are unlinked after they have been read.
+
+    Args:
+        descriptor: Descriptor produced by `encode_bulk`
+
+    Returns:
+        Payload bytes
+    """
+    if descriptor.get("encoding") == SHM:
+        # Attaching registers the segment with this process's resource
+        # tracker and unlink() unregisters it again
+        segment = shared_memory.SharedMemory(name=descriptor["name"])
+        try:
+            return bytes(segment.buf[:descriptor["size"]])
+        finally:
+            segment.close()
+            segment.unlink()
+
+    return base64.b64decode(descriptor["data"])
+
+
+def read_bulk_array(descriptor: Dict[str, Any]) -> array.array:
+    """Read a bulk payload into an `array.array` of its item format."""
+    values = array.array(descriptor.get("format") or "B")
+    values.frombytes(read_bulk(descriptor))
+    return values
+
+
+def get_mesh_vertices(name: str, transport: str = BASE64) -> Dict[str, Any]:
+    """
+    Get the vertex coordinates of a mesh object as a packed float array.
+
+    Args:
+        name: Name of the mesh object
+        transport: "shm" to return the array through shared memory, otherwise base64
+
+    Returns:
+        Dict with the vertex count and a bulk descriptor of float32 xyz triples
+    """
+    import bpy
+
+    obj = bpy.data.objects.get(name)
+    if obj is None or obj.type != 'MESH':
+        raise ValueError(f"Mesh object not found: {name}")
+
+    mesh = obj.data
+    coordinates = array.array("f", bytes(4 * 3 * len(mesh.vertices)))
+    mesh.vertices.foreach_get("co", coordinates)
+
+    return {
+        "name": name,
+        "vertex_count": len(mesh.vertices),
+        "vertices": encode_bulk(coordinates, transport, format="f", shape=[len(mesh.vertices), 3])
+    }
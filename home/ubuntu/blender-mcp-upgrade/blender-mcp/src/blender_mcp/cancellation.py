@@ -0,0 +1,90 @@
+"""
+BlenderMCP cooperative cancellation.
+
+Every command the addon accepts gets a `CancelToken`. The token carries the
+command's deadline (from the "timeout" field of the request envelope) and a
+flag set by the `cancel` command. Handlers cannot be interrupted while they
+run, so cancellation is cooperative: the scheduler checks the token before a
+job starts and between the chunks of chunked handlers, and long handlers can
+call `check_cancelled()` between their own units of work.
+"""
+
+import contextlib
+import threading
+import time
+from typing import Iterator, Optional
+
+
+class OperationCancelled(Exception):
+    """Raised when a command was cancelled or ran past its deadline."""
+
+
+class CancelToken:
+    """
+    Cancellation flag and deadline of a single command.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: Seconds from now until the command's deadline
+        """
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.reason: Optional[str] = None
+        self._cancelled = threading.Event()
+
+    def cancel(self, reason: str = "Cancelled by client") -> None:
+        """Flag the command as cancelled; safe to call from any thread."""
+        if self.reason is None:
+            self.reason = reason
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def should_stop(self) -> bool:
+        """Whether the command was cancelled or ran past its deadline."""
+        return self.cancelled or self.expired
+
+    def check(self) -> None:
+        """Raise `OperationCancelled` if the command should stop."""
+        if self.cancelled:
+            raise OperationCancelled(self.reason)
+        if self.expired:
+            raise OperationCancelled("Deadline exceeded")
+
+
+class _ActiveToken(threading.local):
+    token: Optional[CancelToken] = None
+
+
+_active = _ActiveToken()
+
+
+@contextlib.contextmanager
+def activate(token: Optional[CancelToken]) -> Iterator[Optional[CancelToken]]:
+    """Make a token the current one for this thread while a job step runs."""
+    previous = _active.token
+    _active.token = token
+    try:
+        yield token
+    finally:
+        _active.token = previous
+
+
+def current_token() -> Optional[CancelToken]:
+    """Get the token of the command currently running on this thread, if any."""
+    return _active.token
+
+
+def check_cancelled() -> None:
+    """Raise `OperationCancelled` if the command currently running should stop."""
+    token = _active.token
+    if token is not None:
+        token.check()
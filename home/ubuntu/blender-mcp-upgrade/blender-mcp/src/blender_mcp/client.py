@@ -0,0 +1,546 @@
+"""
+BlenderMCP asyncio client.
+
+`AsyncBlenderConnection` keeps a single socket to the Blender addon and
+multiplexes many requests over it: every command is tagged with a request id,
+any number of commands may be in flight at once, and responses are matched
+back to their callers by id in whatever order the addon sends them.
+
+Every command has a deadline. It is sent to the addon in the envelope and
+enforced here: when it passes, the caller gets `BlenderTimeoutError` and the
+addon is asked to cancel the command.
+
+Frames with an "event" key are not responses but events pushed by the addon,
+e.g. for `ProgressSubscription`s.
+"""
+
+import asyncio
+import collections
+import itertools
+import json
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Coroutine, Set
+
+from blender_mcp.bulk_transfer import BASE64, SHM, read_bulk_array
+from blender_mcp.events import DEFAULT_MAX_RATE
+from blender_mcp.protocol import DEFAULT_MAX_FRAME_SIZE, encode_message, read_message_async
+from blender_mcp.scene_cache import CACHED_QUERIES
+
+logger = logging.getLogger("BlenderMCPClient")
+
+# Seconds a command may take unless the caller passes its own timeout
+DEFAULT_COMMAND_TIMEOUT = 300.0
+
+# Seconds to wait for the acknowledgement of a cancel request
+CANCEL_TIMEOUT = 5.0
+
+# Events kept for subscriptions whose subscribe response has not been processed yet
+MAX_UNCLAIMED_EVENTS = 1000
+
+
+class BlenderCommandError(Exception):
+    """Raised when Blender reports an error for a command."""
+
+
+class BlenderTimeoutError(BlenderCommandError):
+    """Raised when a command does not finish before its deadline."""
+
+
+class ClientQueryCache:
+    """
+    Client-side copies of read-only query results.
+
+    Each entry remembers the scene version it was computed at. The next call
+    for the same query sends that version as `if_version`, and the addon
+    answers with a small "not modified" reply while the scene is unchanged.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "collections.OrderedDict[str, tuple]" = collections.OrderedDict()
+        self.revalidated = 0
+        self.refreshed = 0
+
+    @staticmethod
+    def make_key(command_type: str, params: Optional[Dict[str, Any]]) -> str:
+        """Build the cache key for a query."""
+        return command_type + ":" + json.dumps(params or {}, sort_keys=True, default=str)
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Get the (scene_version, result) cached for a query."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a query result that carries its scene version."""
+        if not isinstance(result, dict) or "scene_version" not in result:
+            return
+
+        self.entries[key] = (result["scene_version"], result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. when the addon may have restarted with a new scene."""
+        self.entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Get the number of entries and how often they were revalidated."""
+        lookups = self.revalidated + self.refreshed
+        return {
+            "size": len(self.entries),
+            "revalidated": self.revalidated,
+            "refreshed": self.refreshed,
+            "hit_rate": self.revalidated / lookups if lookups else 0.0
+        }
+
+
+class AsyncBlenderConnection:
+    """
+    Pipelined, multiplexed connection to the Blender addon.
+    """
+
+    def __init__(self, host: str, port: int, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+                 use_query_cache: bool = True, unix_path: Optional[str] = None,
+                 default_timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT):
+        self.host = host
+        self.port = port
+        # Connect over a Unix domain socket instead of TCP when set
+        self.unix_path = unix_path
+        self.max_frame_size = max_frame_size
+        self.default_timeout = default_timeout
+        self.query_cache = ClientQueryCache() if use_query_cache else None
+        self.timeouts = 0
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        # Requests given up on after their deadline; late responses are dropped quietly
+        self._abandoned: Set[int] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._subscriptions: Dict[int, "ProgressSubscription"] = {}
+        # Events can arrive before the subscribing coroutine resumes and registers its subscription
+        self._unclaimed_events: Dict[int, List[Dict[str, Any]]] = collections.defaultdict(list)
+        self._unclaimed_count = 0
+        self._request_ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+        # Successful connects, so reconnects can be told apart from the first one
+        self.connects = 0
+
+    @property
+    def reconnects(self) -> int:
+        """Number of times the connection was re-established after the first connect."""
+        return max(self.connects - 1, 0)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the connection is currently open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    @property
+    def address(self) -> str:
+        """Human-readable address of the addon endpoint."""
+        return self.unix_path or f"{self.host}:{self.port}"
+
+    @property
+    def bulk_transport(self) -> str:
+        """Transport to request for bulk payloads; shared memory needs a co-located addon."""
+        return SHM if self.unix_path else BASE64
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests waiting for a response."""
+        return len(self._pending)
+
+    async def connect(self) -> bool:
+        """Connect to the Blender addon socket server"""
+        async with self._connect_lock:
+            if self.connected:
+                return True
+
+            try:
+                if self.unix_path:
+                    self._reader, self._writer = await asyncio.open_unix_connection(self.unix_path)
+                else:
+                    self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                logger.error(f"Failed to connect to Blender: {str(e)}")
+                self._reader = self._writer = None
+                return False
+
+            self.connects += 1
+            self._read_task = asyncio.get_running_loop().create_task(self._read_loop())
+            logger.info(f"Connected to Blender at {self.address}")
+            return True
+
+    async def disconnect(self) -> None:
+        """Disconnect from the Blender addon and fail any in-flight requests"""
+        if self._read_task and self._read_task is not asyncio.current_task():
+            self._read_task.cancel()
+        self._read_task = None
+
+        self._close(ConnectionError("Disconnected from Blender"))
+
+    def _close(self, error: Exception) -> None:
+        """Close the transport and fail every pending request with `error`."""
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception as e:
+                logger.error(f"Error disconnecting from Blender: {str(e)}")
+        self._reader = self._writer = None
+        self._abandoned.clear()
+        self._unclaimed_events.clear()
+        self._unclaimed_count = 0
+
+        # Scene versions restart at 0 with the addon, so after a reconnect a
+        # cached version could match a different scene
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
+        subscriptions, self._subscriptions = self._subscriptions, {}
+        for subscription in subscriptions.values():
+            subscription.queue.put_nowait(error)
+
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _read_loop(self) -> None:
+        """Read responses and resolve the matching pending requests."""
+        try:
+            while True:
+                response = await read_message_async(self._reader, self.max_frame_size)
+                if "event" in response:
+                    self._dispatch_event(response)
+                    continue
+
+                future = self._pending.pop(response.get("id"), None)
+
+                if future is None and response.get("id") in self._abandoned:
+                    self._abandoned.discard(response.get("id"))
+                elif future is None:
+                    logger.warning(f"Dropping response for unknown request id: {response.get('id')}")
+                elif not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Any read failure leaves the stream out of sync, so start over
+            logger.error(f"Error communicating with Blender: {str(e)}")
+            self._read_task = None
+            self._close(ConnectionError(f"Communication error with Blender: {str(e)}"))
+
+    def _dispatch_event(self, event: Dict[str, Any]) -> None:
+        """Hand a pushed event to its subscription."""
+        subscription_id = event.get("subscription")
+        subscription = self._subscriptions.get(subscription_id)
+
+        if subscription is not None:
+            subscription.queue.put_nowait(event)
+        elif self._unclaimed_count < MAX_UNCLAIMED_EVENTS:
+            self._unclaimed_events[subscription_id].append(event)
+            self._unclaimed_count += 1
+
+    async def subscribe_progress(self, max_rate: Optional[float] = DEFAULT_MAX_RATE) -> "ProgressSubscription":
+        """
+        Subscribe to progress events pushed by the addon.
+
+        Args:
+            max_rate: Maximum progress updates per second per operation; 0 sends every update
+
+        Returns:
+            Async iterator over the events
+        """
+        result = await self._request("subscribe_progress", {"max_rate": max_rate})
+        subscription = ProgressSubscription(self, result["subscription"])
+        self._subscriptions[subscription.id] = subscription
+
+        early_events = self._unclaimed_events.pop(subscription.id, [])
+        self._unclaimed_count -= len(early_events)
+        for event in early_events:
+            subscription.queue.put_nowait(event)
+
+        return subscription
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None,
+                           timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Send a command to Blender and wait for its response.
+
+        Read-only scene queries are answered from the client-side cache when
+        the addon confirms the scene has not changed.
+
+        Args:
+            command_type: Addon command type
+            params: Parameters for the command
+            timeout: Seconds before the command is abandoned and cancelled;
+                defaults to `default_timeout`
+
+        Returns:
+            The command result
+        """
+        if self.query_cache is None or command_type not in CACHED_QUERIES:
+            return await self._request(command_type, params, timeout)
+
+        key = self.query_cache.make_key(command_type, params)
+        cached = self.query_cache.get(key)
+
+        request_params = dict(params or {})
+        if cached is not None:
+            request_params["if_version"] = cached[0]
+
+        result = await self._request(command_type, request_params, timeout)
+
+        if cached is not None and isinstance(result, dict) and result.get("not_modified"):
+            self.query_cache.revalidated += 1
+            return cached[1]
+
+        self.query_cache.refreshed += 1
+        self.query_cache.put(key, result)
+        return result
+
+    async def _request(self, command_type: str, params: Dict[str, Any] = None,
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a command and wait for its response, bypassing any caches."""
+        if not self.connected and not await self.connect():
+            raise ConnectionError("Not connected to Blender")
+
+        if timeout is None:
+            timeout = self.default_timeout
+
+        request_id = next(self._request_ids)
+        command = {
+            "id": request_id,
+            "type": command_type,
+            "params": params or {}
+        }
+        if timeout is not None:
+            command["timeout"] = timeout
+
+        frame = encode_message(command, self.max_frame_size)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        try:
+            logger.debug(f"Sending command {request_id}: {command_type}")
+            self._writer.write(frame)
+            await self._writer.drain()
+            response = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._abandoned.add(request_id)
+            if command_type != "cancel":
+                self._cancel_in_background(request_id)
+            logger.error(f"Command {request_id} ({command_type}) timed out after {timeout}s")
+            raise BlenderTimeoutError(f"Command {command_type} timed out after {timeout}s")
+        except (OSError, ConnectionError) as e:
+            logger.error(f"Error communicating with Blender: {str(e)}")
+            self._close(ConnectionError(f"Communication error with Blender: {str(e)}"))
+            raise ConnectionError(f"Communication error with Blender: {str(e)}")
+        finally:
+            self._pending.pop(request_id, None)
+
+        if response.get("status") == "error":
+            logger.error(f"Blender error: {response.get('message')}")
+            raise BlenderCommandError(response.get("message", "Unknown error from Blender"))
+
+        return response.get("result", {})
+
+    def _cancel_in_background(self, request_id: int) -> None:
+        """Ask the addon to cancel a request without making the caller wait for the acknowledgement."""
+        async def cancel():
+            try:
+                await self._request("cancel", {"request_id": request_id, "reason": "Deadline exceeded"},
+                                    CANCEL_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Could not cancel command {request_id}: {str(e)}")
+
+        task = asyncio.get_running_loop().create_task(cancel())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def cancel_all(self, reason: str = "Cancelled by client") -> int:
+        """
+        Cancel every unfinished command on the addon, from any client.
+
+        Returns:
+            Number of commands flagged as cancelled
+        """
+        result = await self._request("cancel", {"all": True, "reason": reason}, CANCEL_TIMEOUT)
+        return result.get("cancelled", 0)
+
+    async def get_mesh_vertices(self, name: str):
+        """
+        Fetch a mesh's vertex coordinates as a flat float32 `array.array` of xyz triples.
+
+        Over a Unix domain socket the array travels through shared memory
+        instead of base64-encoded JSON.
+        """
+        result = await self.send_command("get_mesh_vertices", {"name": name, "transport": self.bulk_transport})
+        return read_bulk_array(result["vertices"])
+
+    async def send_batch(self, commands: List[Dict[str, Any]], stop_on_error: bool = False) -> List[Dict[str, Any]]:
+        """
+        Send several commands to Blender in a single round trip.
+
+        Args:
+            commands: Commands to run in order, each a dict with "type" and optional "params"
+            stop_on_error: Skip the remaining commands after the first failure
+
+        Returns:
+            Per-command responses, each with a "status" of success, error or skipped
+        """
+        result = await self.send_command("batch", {
+            "commands": commands,
+            "stop_on_error": stop_on_error
+        })
+        return result.get("results", [])
+
+
+class ProgressSubscription:
+    """
+    Async iterator over the progress events of one subscription.
+
+    Each event is a dict with the event "type" (operation_started,
+    progress_updated, operation_completed, ...) and the "operation" state.
+    Iteration ends after `aclose()` and raises `ConnectionError` if the
+    connection is lost.
+    """
+
+    def __init__(self, connection: AsyncBlenderConnection, subscription_id: int):
+        self.connection = connection
+        self.id = subscription_id
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        event = await self.next_event()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    async def next_event(self) -> Optional[Dict[str, Any]]:
+        """Wait for the next event; None once the subscription is closed."""
+        if self.closed and self.queue.empty():
+            return None
+
+        item = await self.queue.get()
+        if isinstance(item, Exception):
+            self.closed = True
+            raise item
+        return item
+
+    async def aclose(self) -> None:
+        """Unsubscribe and end iteration."""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put_nowait(None)
+
+        if self.connection._subscriptions.pop(self.id, None) is not None and self.connection.connected:
+            try:
+                await self.connection._request("unsubscribe_progress", {"subscription": self.id}, CANCEL_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Could not unsubscribe from progress events: {str(e)}")
+
+
+class SceneMirror:
+    """
+    Local mirror of the Blender scene kept up to date with `get_scene_info` deltas.
+    """
+
+    def __init__(self, connection: Optional[AsyncBlenderConnection] = None):
+        self.connection = connection
+        self.address: Optional[str] = None
+        self.version: Optional[int] = None
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    async def sync(self, connection: Optional[AsyncBlenderConnection] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the changes since the last sync and apply them.
+
+        Args:
+            connection: Connection to fetch the changes over; defaults to the mirror's own
+
+        Returns:
+            Dict mapping object names to their summaries
+        """
+        connection = connection or self.connection
+        async with self._lock:
+            if connection.address != self.address:
+                # Scene versions are only meaningful for the addon that issued them
+                self.reset()
+                self.address = connection.address
+
+            since_version = self.version if self.version is not None else -1
+            delta = await connection._request("get_scene_info", {"since_version": since_version})
+
+            if not delta.get("delta"):
+                self.objects.clear()
+
+            for obj in delta.get("added", []) + delta.get("changed", []):
+                self.objects[obj["name"]] = obj
+            for name in delta.get("removed", []):
+                self.objects.pop(name, None)
+
+            self.version = delta.get("scene_version")
+            return self.objects
+
+    def reset(self) -> None:
+        """Drop the mirror so the next sync fetches a full snapshot."""
+        self.version = None
+        self.objects = {}
+
+
+class EventLoopThread:
+    """
+    Runs an asyncio event loop in a daemon thread so synchronous code can
+    submit coroutines to connections owned by that loop.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self.loop.run_forever, name="BlenderMCPClientLoop", daemon=True)
+                self._thread.start()
+        return self.loop
+
+    def submit(self, coro: Coroutine):
+        """
+        Schedule a coroutine on the loop.
+
+        Returns:
+            A `concurrent.futures.Future` for the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None):
+        """Run a coroutine on the loop and block until it finishes."""
+        if self._thread is threading.current_thread():
+            coro.close()
+            raise RuntimeError("Cannot block on the client event loop from inside it")
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro: Coroutine):
+        """Await a coroutine running on the loop from another event loop."""
+        return await asyncio.wrap_future(self.submit(coro))
+
+
+# Shared loop for all synchronous connection facades
+client_loop = EventLoopThread()
@@ -0,0 +1,195 @@
+"""
+BlenderMCP code execution cache.
+
+Agents send the same Python snippets through `execute_code` over and over.
+Compiled code objects are kept in a bounded LRU keyed by a hash of the
+source, so repeated snippets skip parsing and compilation. Optional named
+namespaces persist between calls, so helpers defined once can be reused
+without being re-sent.
+
+Long scripts can hand the main thread back between steps. A snippet passes
+generator functions to `run_in_chunks`; they run after the snippet itself and
+each `yield` ends a chunk, so the main-thread scheduler (see
+`blender_mcp.scheduler`) redraws the UI and answers interactive queries in
+between.
+"""
+
+import collections
+import hashlib
+import threading
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from blender_mcp.cancellation import OperationCancelled, check_cancelled
+
+
+def default_namespace() -> Dict[str, Any]:
+    """Create the globals a snippet runs with; long snippets can call `check_cancelled()` between steps."""
+    import bpy
+    return {"bpy": bpy, "check_cancelled": check_cancelled, "__name__": "__blendermcp__"}
+
+
+class CompiledCodeCache:
+    """
+    Bounded LRU of compiled code objects keyed by source hash.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "collections.OrderedDict[str, Any]" = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(source: str) -> str:
+        """Normalize line endings and trailing whitespace, which do not change the code."""
+        return source.replace("\r\n", "\n").rstrip()
+
+    def get(self, source: str, filename: str = "<blendermcp>") -> Tuple[Any, bool]:
+        """
+        Get the compiled code for a snippet, compiling it on a miss.
+
+        Args:
+            source: Python source code
+            filename: Filename reported in tracebacks
+
+        Returns:
+            Tuple of (code object, whether it was a cache hit)
+        """
+        source = self.normalize(source)
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            code = self.entries.get(key)
+            if code is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return code, True
+
+        # Compile outside the lock; a concurrent miss on the same key just compiles twice
+        code = compile(source, filename, "exec")
+
+        with self._lock:
+            self.misses += 1
+            self.entries[key] = code
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        return code, False
+
+    def get_stats(self) -> Dict:
+        """Get cache size and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self) -> None:
+        """Drop all cached code objects."""
+        with self._lock:
+            self.entries.clear()
+
+
+class CodeExecutor:
+    """
+    Runs `execute_code` snippets using the compiled-code cache and optional
+    persistent namespaces.
+    """
+
+    def __init__(self, cache: CompiledCodeCache = None, namespace_factory: Callable[[], Dict] = default_namespace,
+                 max_namespaces: int = 32):
+        self.cache = cache or CompiledCodeCache()
+        self.namespace_factory = namespace_factory
+        self.max_namespaces = max_namespaces
+        self.namespaces: "collections.OrderedDict[str, Dict]" = collections.OrderedDict()
+
+    def _get_namespace(self, name: Optional[str], reset: bool) -> Dict[str, Any]:
+        """Get a fresh namespace, or the persistent namespace called `name`."""
+        if name is None:
+            return self.namespace_factory()
+
+        if reset or name not in self.namespaces:
+            self.namespaces[name] = self.namespace_factory()
+        self.namespaces.move_to_end(name)
+
+        # Evict the least recently used namespaces beyond the limit
+        while len(self.namespaces) > self.max_namespaces:
+            self.namespaces.popitem(last=False)
+
+        return self.namespaces[name]
+
+    def execute(self, code: str, namespace: Optional[str] = None, reset_namespace: bool = False):
+        """
+        Execute a Python snippet.
+
+        A chunked handler: generator functions the snippet passes to
+        `run_in_chunks` are resumed one `yield` at a time after it has run.
+
+        Args:
+            code: Python source code
+            namespace: Name of a persistent namespace to run in, so definitions
+                survive for later calls. A fresh namespace is used if omitted.
+            reset_namespace: Start the persistent namespace over
+
+        Returns:
+            Generator returning a dict with execution status, the number of
+            chunks run and cache metadata
+        """
+        try:
+            compiled, cache_hit = self.cache.get(code)
+        except SyntaxError as e:
+            raise Exception(f"Code execution error: {str(e)}")
+
+        globals_dict = self._get_namespace(namespace, reset_namespace)
+        chunked = []
+        globals_dict["run_in_chunks"] = chunked.append
+
+        try:
+            exec(compiled, globals_dict)
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Code execution error: {str(e)}")
+
+        chunks = 0
+        for func in chunked:
+            steps = func()
+            while True:
+                try:
+                    next(steps)
+                except StopIteration:
+                    break
+                except OperationCancelled:
+                    raise
+                except Exception as e:
+                    raise Exception(f"Code execution error: {str(e)}")
+                chunks += 1
+                yield
+
+        return {
+            "executed": True,
+            "namespace": namespace,
+            "chunks": chunks,
+            "cache": dict(self.cache.get_stats(), hit=cache_hit)
+        }
+
+    def clear_namespace(self, namespace: str) -> Dict:
+        """
+        Drop a persistent namespace.
+
+        Args:
+            namespace: Name of the namespace
+
+        Returns:
+            Dict with whether the namespace existed
+        """
+        return {"namespace": namespace, "cleared": self.namespaces.pop(namespace, None) is not None}
+
+
+# Executor used by the addon's execute_code handler
+code_executor = CodeExecutor()
@@ -0,0 +1,365 @@
+"""
+BlenderMCP addon command dispatch helpers.
+"""
+
+import inspect
+import time
+from typing import Callable, Dict, List, Any, Optional
+
+from blender_mcp.bulk_transfer import get_mesh_vertices
+from blender_mcp.code_cache import code_executor
+from blender_mcp.profiler import command_profiler
+from blender_mcp.scene_cache import query_cache, register_scene_tracking, wrap_scene_handler
+from blender_mcp.scheduler import main_thread_scheduler, run_to_completion
+
+BATCH_COMMAND = "batch"
+
+# Handlers exposed by the addon's command server, grouped so optional
+# integrations can be switched on and off as a unit
+ADDON_HANDLER_GROUPS = {
+    "base": [
+        "ping",
+        "get_scene_info",
+        "create_object",
+        "modify_object",
+        "delete_object",
+        "get_object_info",
+        "execute_code",
+        "clear_code_namespace",
+        "get_mesh_vertices",
+        "set_material",
+        "get_polyhaven_status",
+        "get_hyper3d_status",
+    ],
+    "polyhaven": [
+        "get_polyhaven_categories",
+        "search_polyhaven_assets",
+        "download_polyhaven_asset",
+        "set_texture",
+    ],
+    "hyper3d": [
+        "create_rodin_job",
+        "poll_rodin_job_status",
+        "import_generated_asset",
+    ],
+}
+
+# Scene properties that enable the optional handler groups
+ADDON_GROUP_PROPERTIES = {
+    "polyhaven": "blendermcp_use_polyhaven",
+    "hyper3d": "blendermcp_use_hyper3d",
+}
+
+
+def execute_batch(execute: Callable[[Dict], Dict], commands: List[Dict], stop_on_error: bool = False) -> Dict:
+    """
+    Execute an ordered list of sub-commands in a single call.
+
+    The addon runs the whole batch inside one main-thread slice, so a client can
+    build a scene with one round trip instead of one per command.
+
+    Args:
+        execute: Executor for a single command, returning a status/result dict
+        commands: Sub-commands, each a dict with "type" and optional "params"
+        stop_on_error: Skip the remaining sub-commands after the first failure
+
+    Returns:
+        Dict with per-item results in the order of `commands`
+    """
+    results = []
+    failed = 0
+    skipped = 0
+    stopped = False
+
+    for command in commands:
+        if stopped:
+            results.append({"status": "skipped"})
+            skipped += 1
+            continue
+
+        if not isinstance(command, dict) or not command.get("type"):
+            response = {"status": "error", "message": f"Invalid batch item: {command!r}"}
+        elif command["type"] == BATCH_COMMAND:
+            response = {"status": "error", "message": "Nested batch commands are not supported"}
+        else:
+            try:
+                # Chunked handlers are run to completion to keep the batch in one slice
+                response = run_to_completion(
+                    execute({"type": command["type"], "params": command.get("params") or {}})
+                )
+            except Exception as e:
+                response = {"status": "error", "message": str(e)}
+
+        results.append(response)
+
+        if response.get("status") == "error":
+            failed += 1
+            stopped = stop_on_error
+
+    return {
+        "results": results,
+        "succeeded": len(results) - failed - skipped,
+        "failed": failed,
+        "skipped": skipped,
+        "stopped": stopped
+    }
+
+
+class TimedHandler:
+    """
+    Wraps a command handler and records how often it runs and for how long.
+
+    Generator (chunked) handlers are timed across all of their chunks.
+    """
+
+    __slots__ = ("name", "func", "chunked", "calls", "errors", "total_time", "max_time")
+
+    def __init__(self, name: str, func: Callable):
+        self.name = name
+        self.func = func
+        self.chunked = inspect.isgeneratorfunction(func)
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def __call__(self, **params):
+        if self.chunked:
+            return self._call_chunked(params)
+
+        start_time = time.perf_counter()
+        failed = True
+        try:
+            result = self.func(**params)
+            failed = False
+            return result
+        finally:
+            self._record(time.perf_counter() - start_time, failed)
+
+    def _call_chunked(self, params: Dict):
+        """Run a generator handler, timing only the chunks themselves."""
+        generator = self.func(**params)
+        elapsed = 0.0
+        failed = True
+        try:
+            while True:
+                start_time = time.perf_counter()
+                try:
+                    value = next(generator)
+                except StopIteration as stop:
+                    failed = False
+                    return stop.value
+                finally:
+                    elapsed += time.perf_counter() - start_time
+                yield value
+        finally:
+            self._record(elapsed, failed)
+
+    def _record(self, elapsed: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def get_stats(self) -> Dict:
+        """Get call counters and cumulative timings for this handler."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "average_time": self.total_time / self.calls if self.calls else 0.0,
+            "max_time": self.max_time
+        }
+
+
+class HandlerRegistry:
+    """
+    Precomputed command handler table for the addon's command executor.
+
+    Handlers are registered once in named groups. The lookup table is only
+    rebuilt when a group is enabled or disabled, so dispatching a command is a
+    single dict lookup.
+    """
+
+    def __init__(self):
+        self.groups: Dict[str, Dict[str, TimedHandler]] = {}
+        self.enabled_groups: Dict[str, bool] = {}
+        self.handlers: Dict[str, TimedHandler] = {}
+
+    def register_group(self, group_name: str, handlers: Dict[str, Callable], enabled: bool = True) -> None:
+        """
+        Register a group of handlers.
+
+        Args:
+            group_name: Name of the group
+            handlers: Mapping of command type to handler callable
+            enabled: Whether the group's commands are available
+        """
+        self.groups[group_name] = {
+            name: TimedHandler(name, func) for name, func in handlers.items()
+        }
+        self.enabled_groups[group_name] = enabled
+        self.rebuild()
+
+    def set_group_enabled(self, group_name: str, enabled: bool) -> None:
+        """
+        Enable or disable a handler group, rebuilding the table if it changed.
+
+        Args:
+            group_name: Name of the group
+            enabled: Whether the group's commands are available
+        """
+        if self.enabled_groups.get(group_name) == enabled:
+            return
+
+        self.enabled_groups[group_name] = enabled
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Rebuild the command lookup table from the enabled groups."""
+        handlers = {}
+        for group_name, group in self.groups.items():
+            if self.enabled_groups.get(group_name):
+                handlers.update(group)
+        self.handlers = handlers
+
+    def get(self, command_type: str) -> Optional[TimedHandler]:
+        """Get the handler for a command type, or None if it is unavailable."""
+        return self.handlers.get(command_type)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Get per-handler call counters and timings.
+
+        Returns:
+            Dict mapping command types to their stats, most expensive first
+        """
+        stats = {
+            name: handler.get_stats()
+            for group in self.groups.values()
+            for name, handler in group.items()
+            if handler.calls
+        }
+        return dict(sorted(stats.items(), key=lambda item: item[1]["total_time"], reverse=True))
+
+    def reset_stats(self) -> None:
+        """Reset all call counters and timings."""
+        for group in self.groups.values():
+            for handler in group.values():
+                handler.calls = handler.errors = 0
+                handler.total_time = handler.max_time = 0.0
+
+
+# Registry used by the addon's command server
+handler_registry = HandlerRegistry()
+
+
+def ping() -> Dict:
+    """Answer a connection health check."""
+    return {"pong": True, "time": time.time()}
+
+
+def get_shared_handlers() -> Dict[str, Callable]:
+    """Get handlers implemented by shared BlenderMCP modules instead of the server class."""
+    return {
+        "ping": ping,
+        "execute_code": code_executor.execute,
+        "clear_code_namespace": code_executor.clear_namespace,
+        "get_mesh_vertices": get_mesh_vertices,
+    }
+
+
+def get_cache_stats() -> Dict:
+    """Get hit rates of the addon's query and compiled-code caches."""
+    return {
+        "query_cache": query_cache.get_stats(),
+        "code_cache": code_executor.cache.get_stats()
+    }
+
+
+def build_addon_handler_registry(server, scene=None) -> HandlerRegistry:
+    """
+    Populate the addon handler registry from the command server's methods.
+
+    Read-only scene queries are wrapped with the versioned result cache and
+    write handlers bump the scene version (see `blender_mcp.scene_cache`).
+    The depsgraph and file-load handlers that bump it for every other scene
+    change are installed here as well, and removed when the server stops.
+    Objects named by a command count as used for memory eviction (see
+    `blender_mcp.modules.memory_accounting`).
+    Called once, by the addon's command executor on the first command.
+    Optional groups take their initial state from the scene toggles and are
+    kept in sync afterwards by `update_handler_groups`, which is attached to
+    the toggles here (see `watch_handler_group_toggles`).
+
+    Args:
+        server: Addon command server providing the handler methods
+        scene: Scene holding the integration toggles
+
+    Returns:
+        The populated registry
+    """
+    # Imports bpy, so only imported once the addon builds its registry
+    from blender_mcp.modules.memory_accounting import touching
+
+    # UI edits, module commands, undo and file loads invalidate cached queries too
+    register_scene_tracking()
+
+    shared_handlers = get_shared_handlers()
+
+    for group_name, command_types in ADDON_HANDLER_GROUPS.items():
+        property_name = ADDON_GROUP_PROPERTIES.get(group_name)
+        enabled = True if property_name is None else bool(getattr(scene, property_name, False))
+
+        handler_registry.register_group(
+            group_name,
+            {
+                name: touching(wrap_scene_handler(name, shared_handlers.get(name) or getattr(server, name)))
+                for name in command_types
+            },
+            enabled=enabled
+        )
+
+    handler_registry.register_group("diagnostics", {
+        "get_handler_stats": handler_registry.get_stats,
+        "get_scheduler_stats": main_thread_scheduler.get_stats,
+        "get_cache_stats": get_cache_stats,
+        "configure_profiler": command_profiler.configure,
+        "get_profiles": command_profiler.get_profiles,
+    })
+
+    watch_handler_group_toggles()
+
+    return handler_registry
+
+
+def update_handler_groups(scene, context) -> None:
+    """
+    Update callback for the integration toggle scene properties.
+
+    Pass as `update=` to `blendermcp_use_polyhaven` and `blendermcp_use_hyper3d`
+    so the handler table is only rebuilt when a toggle actually changes.
+    """
+    for group_name, property_name in ADDON_GROUP_PROPERTIES.items():
+        handler_registry.set_group_enabled(group_name, bool(getattr(scene, property_name, False)))
+
+
+def watch_handler_group_toggles() -> None:
+    """
+    Attach `update_handler_groups` as the `update=` callback of the integration toggles.
+
+    The toggles are declared by the addon's `register()`. They are declared
+    again with the same name, description and default plus the callback; the
+    values already stored in the scenes are kept.
+    """
+    import bpy
+
+    for property_name in ADDON_GROUP_PROPERTIES.values():
+        current = bpy.types.Scene.bl_rna.properties.get(property_name)
+        setattr(bpy.types.Scene, property_name, bpy.props.BoolProperty(
+            name=current.name if current is not None else property_name,
+            description=current.description if current is not None else "",
+            default=current.default if current is not None else False,
+            update=update_handler_groups
+        ))
@@ -0,0 +1,190 @@
+"""
+BlenderMCP progress event streaming.
+
+`ProgressEventHub` is registered as a `ProgressTracker` listener in the addon
+and fans progress events out to clients that subscribed over the addon
+socket. Events are pushed as frames without a request id:
+
+    {"event": "progress", "subscription": 3, "type": "progress_updated", "operation": {...}}
+
+`progress_updated` events are coalesced per operation so each subscriber
+receives at most `max_rate` of them per second per operation, always ending
+with the latest state. Lifecycle events (started, completed, failed,
+cancelled) are never dropped and flush the pending update of their operation
+first. All socket writes happen on the hub's sender thread, so the tracker's
+callers on Blender's main thread never block on a slow client.
+"""
+
+import collections
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Any, Optional
+
+PROGRESS_EVENT = "progress"
+
+# Event type that is coalesced; every other event type is delivered as is
+COALESCED_EVENT = "progress_updated"
+
+# Updates per second per operation delivered to a subscriber by default
+DEFAULT_MAX_RATE = 10.0
+
+# Operation fields left out of events because they grow without bound
+OMITTED_FIELDS = ("logs",)
+
+
+def snapshot_operation(operation_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy the operation state at the time of the event, without its log."""
+    snapshot = {key: value for key, value in operation_data.items() if key not in OMITTED_FIELDS}
+    if isinstance(snapshot.get("sub_operations"), list):
+        snapshot["sub_operations"] = list(snapshot["sub_operations"])
+    return snapshot
+
+
+class Subscription:
+    """
+    A client's progress subscription and its coalescing state.
+    """
+
+    def __init__(self, subscription_id: int, send: Callable[[Dict[str, Any]], None],
+                 max_rate: Optional[float] = DEFAULT_MAX_RATE):
+        self.id = subscription_id
+        self.send = send
+        self.interval = 1.0 / max_rate if max_rate else 0.0
+        # Messages ready to be sent, in order
+        self.outbox: "collections.deque[Dict[str, Any]]" = collections.deque()
+        # Latest coalesced update per operation and when it may be sent
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.due: Dict[str, float] = {}
+        self.last_sent: Dict[str, float] = {}
+        self.delivered = 0
+        self.coalesced = 0
+
+    def message(self, event_type: str, operation: Dict[str, Any]) -> Dict[str, Any]:
+        return {"event": PROGRESS_EVENT, "subscription": self.id, "type": event_type, "operation": operation}
+
+    def add(self, event_type: str, operation: Dict[str, Any]) -> None:
+        """Queue an event, coalescing progress updates of the same operation."""
+        operation_id = operation.get("id")
+
+        if event_type != COALESCED_EVENT:
+            # Deliver the latest update before the lifecycle event that follows it
+            pending = self.pending.pop(operation_id, None)
+            self.due.pop(operation_id, None)
+            if pending is not None:
+                self.outbox.append(pending)
+            self.outbox.append(self.message(event_type, operation))
+            if event_type != "operation_started":
+                self.last_sent.pop(operation_id, None)
+            return
+
+        if operation_id in self.pending:
+            self.coalesced += 1
+        self.pending[operation_id] = self.message(event_type, operation)
+        self.due.setdefault(operation_id, self.last_sent.get(operation_id, 0.0) + self.interval)
+
+    def take_ready(self, now: float) -> List[Dict[str, Any]]:
+        """Remove and return the messages that may be sent now."""
+        ready = list(self.outbox)
+        self.outbox.clear()
+
+        for operation_id in [operation_id for operation_id, due in self.due.items() if due <= now]:
+            del self.due[operation_id]
+            ready.append(self.pending.pop(operation_id))
+            self.last_sent[operation_id] = now
+
+        return ready
+
+    def next_due(self) -> Optional[float]:
+        """When the next coalesced update may be sent, if any is pending."""
+        return min(self.due.values()) if self.due else None
+
+
+class ProgressEventHub:
+    """
+    Fans `ProgressTracker` events out to subscribed clients.
+    """
+
+    def __init__(self):
+        self.subscriptions: Dict[int, Subscription] = {}
+        self.published = 0
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def subscribe(self, send: Callable[[Dict[str, Any]], None], max_rate: Optional[float] = DEFAULT_MAX_RATE) -> int:
+        """
+        Start streaming progress events to a client.
+
+        Args:
+            send: Writes a message to the client; called on the hub's sender thread
+            max_rate: Maximum progress updates per second per operation; 0 disables coalescing
+
+        Returns:
+            Subscription id
+        """
+        with self._condition:
+            subscription = Subscription(next(self._ids), send, max_rate)
+            self.subscriptions[subscription.id] = subscription
+            self._ensure_sender()
+            return subscription.id
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        """Stop a subscription; returns whether it existed."""
+        with self._condition:
+            return self.subscriptions.pop(subscription_id, None) is not None
+
+    def publish(self, event_type: str, operation_data: Dict[str, Any]) -> None:
+        """`ProgressTracker` listener queuing an event for every subscriber."""
+        with self._condition:
+            if not self.subscriptions:
+                return
+
+            self.published += 1
+            operation = snapshot_operation(operation_data)
+            for subscription in self.subscriptions.values():
+                subscription.add(event_type, operation)
+            self._condition.notify()
+
+    def _ensure_sender(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._send_loop, name="BlenderMCPProgressEvents", daemon=True)
+            self._thread.start()
+
+    def _send_loop(self) -> None:
+        """Deliver queued events, waking up when coalesced updates fall due."""
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                batches = [(subscription, subscription.take_ready(now)) for subscription in self.subscriptions.values()]
+                batches = [(subscription, messages) for subscription, messages in batches if messages]
+
+                if not batches:
+                    due_times = [due for due in (s.next_due() for s in self.subscriptions.values()) if due is not None]
+                    timeout = max(min(due_times) - now, 0.0) if due_times else None
+                    self._condition.wait(timeout)
+                    continue
+
+            for subscription, messages in batches:
+                for message in messages:
+                    try:
+                        subscription.send(message)
+                        subscription.delivered += 1
+                    except Exception as e:
+                        print(f"Error sending progress event: {str(e)}")
+                        self.unsubscribe(subscription.id)
+                        break
+
+    def get_stats(self) -> Dict:
+        """Get subscriber count and delivery metrics."""
+        with self._condition:
+            return {
+                "subscriptions": len(self.subscriptions),
+                "published": self.published,
+                "delivered": sum(s.delivered for s in self.subscriptions.values()),
+                "coalesced": sum(s.coalesced for s in self.subscriptions.values())
+            }
+
+
+# Hub the addon registers with its progress tracker
+progress_events = ProgressEventHub()
@@ -0,0 +1,70 @@
+"""
+BlenderMCP lazy imports.
+
+`LazyObject` stands in for a module-level object of another module and only
+imports that module the first time the object is used, so heavy subsystems
+(and their dependencies such as `requests` or `psutil`) stay out of startup.
+"""
+
+import importlib
+import threading
+import time
+from typing import Any, Dict
+
+# Seconds spent importing each lazily loaded module, for diagnostics
+load_times: Dict[str, float] = {}
+
+_import_lock = threading.RLock()
+
+
+class LazyObject:
+    """
+    Proxy for `getattr(import_module(module_path), attribute)`, resolved on first use.
+    """
+
+    __slots__ = ("_module_path", "_attribute", "_target")
+
+    def __init__(self, module_path: str, attribute: str):
+        object.__setattr__(self, "_module_path", module_path)
+        object.__setattr__(self, "_attribute", attribute)
+        object.__setattr__(self, "_target", None)
+
+    @property
+    def module_path(self) -> str:
+        """Dotted name of the module defining the target."""
+        return self._module_path
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the target has been imported."""
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        """Import the target's module if needed and return the target."""
+        target = self._target
+        if target is None:
+            with _import_lock:
+                if self._target is None:
+                    start_time = time.perf_counter()
+                    module = importlib.import_module(self._module_path)
+                    load_times.setdefault(self._module_path, time.perf_counter() - start_time)
+                    object.__setattr__(self, "_target", getattr(module, self._attribute))
+                target = self._target
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __dir__(self):
+        return dir(self.resolve())
+
+    def __repr__(self) -> str:
+        if self._target is None:
+            return f"<lazy {self._module_path}.{self._attribute}>"
+        return repr(self._target)
@@ -0,0 +1,272 @@
+"""
+BlenderMCP metrics registry.
+
+Records every measured command instead of keeping only its last sample:
+
+- Wall time from `time.perf_counter_ns` and CPU time of the calling thread
+  from `time.thread_time_ns`.
+- Peak memory allocated by Python during the command from `tracemalloc`,
+  only when enabled, since tracing slows every allocation down.
+
+Latencies go into histograms with fixed buckets, so memory stays bounded no
+matter how many commands run. Each command keeps a cumulative histogram and a
+ring of per-minute histograms that are merged to report percentiles over a
+rolling window.
+"""
+
+import bisect
+import contextlib
+import math
+import threading
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Any, Optional, Sequence
+
+# Histogram bucket upper bounds in seconds; the last bucket is unbounded
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, math.inf
+)
+
+# Seconds covered by each histogram of the rolling window
+WINDOW_SLOT_SECONDS = 60
+
+# Histograms kept for the rolling window, i.e. the longest window in slots
+WINDOW_SLOTS = 60
+
+# Window reported by default, in seconds
+DEFAULT_WINDOW = 300.0
+
+
+class Histogram:
+    """
+    Counts of observations per fixed bucket.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram with the same buckets to this one."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating within its bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None without observations
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                if math.isinf(upper):
+                    # Nothing to interpolate towards; report the bucket's lower bound
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-2]
+
+    def cumulative_counts(self) -> List[int]:
+        """Observations less than or equal to each bucket bound."""
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class CommandMetrics:
+    """
+    Metrics of a single command.
+    """
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.cpu_time = 0.0
+        self.memory_peak_max = 0
+        self.last_sample: Optional[Dict[str, Any]] = None
+        # Ring of (slot number, histogram) for the rolling window
+        self.slots: List[Optional[tuple]] = [None] * WINDOW_SLOTS
+
+    def observe(self, sample: Dict[str, Any], slot: int) -> None:
+        self.latency.observe(sample["execution_time"])
+        if sample["cpu_time"] is not None:
+            self.cpu_time += sample["cpu_time"]
+        if not sample["success"]:
+            self.errors += 1
+        if sample["memory_usage"] is not None:
+            self.memory_peak_max = max(self.memory_peak_max, sample["memory_usage"])
+        self.last_sample = sample
+
+        index = slot % WINDOW_SLOTS
+        entry = self.slots[index]
+        if entry is None or entry[0] != slot:
+            entry = (slot, Histogram())
+            self.slots[index] = entry
+        entry[1].observe(sample["execution_time"])
+
+    def window(self, slot: int, slot_count: int) -> Histogram:
+        """Merge the histograms of the last `slot_count` slots up to `slot`."""
+        merged = Histogram()
+        for entry in self.slots:
+            if entry is not None and slot - slot_count < entry[0] <= slot:
+                merged.merge(entry[1])
+        return merged
+
+
+class MetricsRegistry:
+    """
+    Per-command latency, CPU time and memory metrics.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.commands: Dict[str, CommandMetrics] = {}
+        self.trace_memory = trace_memory
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable_memory_tracing(self, enabled: bool = True) -> None:
+        """
+        Turn tracemalloc peak measurements on or off.
+
+        Args:
+            enabled: Whether to trace allocations of measured commands
+        """
+        self.trace_memory = enabled
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def measure(self, name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Measure the enclosed block as one sample of a command.
+
+        The yielded sample dict is filled in when the block exits; set its
+        "success" to False to count the sample as an error without raising.
+        Exceptions are recorded as errors and re-raised.
+
+        Args:
+            name: Command name
+        """
+        sample = {"operation_name": name, "success": True}
+
+        # Only the outermost measurement traces memory; nested ones would reset its peak
+        depth = getattr(self._local, "depth", 0)
+        trace = self.trace_memory and depth == 0 and tracemalloc.is_tracing()
+        if trace:
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+
+        self._local.depth = depth + 1
+        cpu_start = time.thread_time_ns()
+        start = time.perf_counter_ns()
+        try:
+            yield sample
+        except BaseException:
+            sample["success"] = False
+            raise
+        finally:
+            wall_ns = time.perf_counter_ns() - start
+            cpu_ns = time.thread_time_ns() - cpu_start
+            self._local.depth = depth
+
+            sample.update(
+                execution_time=wall_ns / 1e9,
+                cpu_time=cpu_ns / 1e9,
+                memory_usage=tracemalloc.get_traced_memory()[1] - memory_start if trace else None,
+                timestamp=time.time()
+            )
+            self.record(sample)
+
+    def record(self, sample: Dict[str, Any]) -> None:
+        """
+        Add a sample with "operation_name", "execution_time", "cpu_time"
+        and "memory_usage" (either may be None) and "success".
+        """
+        slot = int(time.monotonic() // WINDOW_SLOT_SECONDS)
+        with self._lock:
+            command = self.commands.get(sample["operation_name"])
+            if command is None:
+                command = self.commands[sample["operation_name"]] = CommandMetrics()
+            command.observe(sample, slot)
+
+    def summary(self, name: str, window: Optional[float] = DEFAULT_WINDOW) -> Optional[Dict[str, Any]]:
+        """
+        Summarize a command's metrics.
+
+        Args:
+            name: Command name
+            window: Seconds to compute percentiles over, rounded up to whole
+                minutes; None for all samples since startup
+
+        Returns:
+            Dict with the window's sample count, mean and p50/p95/p99 latency in
+            seconds, plus error count, mean CPU time and largest traced memory
+            peak since startup, or None if the command was never measured
+        """
+        with self._lock:
+            command = self.commands.get(name)
+            if command is None:
+                return None
+
+            if window is None:
+                latency = command.latency
+            else:
+                slot = int(time.monotonic() // WINDOW_SLOT_SECONDS)
+                slot_count = min(WINDOW_SLOTS, max(1, math.ceil(window / WINDOW_SLOT_SECONDS)))
+                latency = command.window(slot, slot_count)
+
+            return {
+                "count": latency.count,
+                "total_count": command.latency.count,
+                "errors": command.errors,
+                "mean": latency.sum / latency.count if latency.count else None,
+                "p50": latency.quantile(0.50),
+                "p95": latency.quantile(0.95),
+                "p99": latency.quantile(0.99),
+                "cpu_time_mean": command.cpu_time / command.latency.count if command.latency.count else None,
+                "memory_peak_max": command.memory_peak_max if self.trace_memory or command.memory_peak_max else None
+            }
+
+    def summaries(self, window: Optional[float] = DEFAULT_WINDOW) -> Dict[str, Dict[str, Any]]:
+        """Summarize every measured command; see `summary`."""
+        with self._lock:
+            names = list(self.commands)
+        return {name: self.summary(name, window) for name in names}
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        with self._lock:
+            self.commands.clear()
+
+
+# Registry shared by the addon's performance measurements
+metrics = MetricsRegistry()
@@ -0,0 +1,143 @@
+"""
+BlenderMCP Ultimate Cinematic Upgrade - Cost Model
+Rough cost estimates for planning cinematic sequences before running them.
+
+The constants are deliberately coarse defaults for a mid-range workstation.
+Where a measured value exists, such as a command's running average duration
+or the size of files already in an asset cache, it is used instead.
+"""
+
+import os
+from typing import Dict, Optional
+
+MB = 1024 * 1024
+
+# Reference frame size the per-frame render costs are given for
+REFERENCE_PIXELS = 1920 * 1080
+
+# Seconds per frame at the reference size and 64 samples, per render engine
+RENDER_SECONDS_PER_FRAME = {
+    "BLENDER_EEVEE": 0.5,
+    "BLENDER_EEVEE_NEXT": 0.5,
+    "BLENDER_WORKBENCH": 0.05,
+    "CYCLES": 12.0
+}
+
+# Samples the per-frame render costs are given for
+REFERENCE_SAMPLES = 64
+
+# Output size of a scene reset to factory settings: (x, y, percentage)
+FACTORY_RESOLUTION = (1920, 1080, 100)
+
+# Bytes per pixel of a rendered PNG frame on disk, after compression
+FRAME_BYTES_PER_PIXEL = 1.5
+
+# Bytes per pixel of render buffers held in memory while rendering
+RENDER_BUFFER_BYTES_PER_PIXEL = 64
+
+# Simulation bake cost per frame: (seconds, bytes written to the cache)
+BAKE_COST_PER_FRAME = {
+    "particles": (0.02, 0.5 * MB),
+    "cloth": (0.15, 0.2 * MB),
+    "hair": (0.1, 0.3 * MB),
+    "rigid_body": (0.01, 0.05 * MB),
+    "fluid": (2.0, 20 * MB)
+}
+
+# Bytes per second assumed for asset downloads
+DOWNLOAD_BANDWIDTH = 20 * MB
+
+# Download size assumed for an asset when its cache has nothing to go by
+DEFAULT_DOWNLOAD_BYTES = {
+    "hdri": 24 * MB,
+    "character": 8 * MB,
+    "model": 16 * MB
+}
+
+
+def cache_download_bytes(cache_dir: str, asset_kind: str, asset_name: Optional[str] = None) -> float:
+    """
+    Estimate the download size of an asset from an asset cache.
+
+    Args:
+        cache_dir: Directory the asset's integration caches downloads in
+        asset_kind: Key of DEFAULT_DOWNLOAD_BYTES used when the cache is empty
+        asset_name: Asset name, if known; a cached file starting with it means no download
+
+    Returns:
+        Expected bytes to download: zero for a cached asset, otherwise the mean
+        size of the cached files of the same kind
+    """
+    sizes = []
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if asset_name and entry.name.startswith(asset_name):
+                    return 0.0
+                sizes.append(entry.stat().st_size)
+    except OSError:
+        pass
+
+    if sizes:
+        return sum(sizes) / len(sizes)
+    return float(DEFAULT_DOWNLOAD_BYTES.get(asset_kind, 0))
+
+
+def bake_cost(simulation: str, frames: int, quality_steps: int = 5) -> Dict[str, float]:
+    """
+    Estimate a simulation bake.
+
+    Args:
+        simulation: Key of BAKE_COST_PER_FRAME
+        frames: Number of frames to bake
+        quality_steps: Solver steps per frame; costs are given for 5
+
+    Returns:
+        Cost with seconds and disk_bytes
+    """
+    seconds_per_frame, bytes_per_frame = BAKE_COST_PER_FRAME.get(simulation, (0.0, 0.0))
+    return {
+        "seconds": seconds_per_frame * frames * quality_steps / 5,
+        "disk_bytes": bytes_per_frame * frames
+    }
+
+
+def render_cost(preset: Dict, frames: int, resolution_x: int = FACTORY_RESOLUTION[0],
+                resolution_y: int = FACTORY_RESOLUTION[1],
+                resolution_percentage: int = FACTORY_RESOLUTION[2]) -> Dict[str, float]:
+    """
+    Estimate rendering a sequence with a render preset.
+
+    Args:
+        preset: Render preset settings with "engine" and "samples"
+        frames: Number of frames to render
+        resolution_x: Horizontal resolution
+        resolution_y: Vertical resolution
+        resolution_percentage: Resolution scale
+
+    Returns:
+        Cost with seconds, seconds_per_frame, memory_bytes and disk_bytes
+    """
+    scale = resolution_percentage / 100
+    pixels = resolution_x * scale * resolution_y * scale
+    engine = preset.get("engine", "CYCLES")
+    samples = preset.get("samples", REFERENCE_SAMPLES)
+
+    seconds_per_frame = (RENDER_SECONDS_PER_FRAME.get(engine, RENDER_SECONDS_PER_FRAME["CYCLES"])
+                         * samples / REFERENCE_SAMPLES * pixels / REFERENCE_PIXELS)
+    if preset.get("use_denoising"):
+        seconds_per_frame += 0.1 * pixels / REFERENCE_PIXELS
+
+    return {
+        "seconds": seconds_per_frame * frames,
+        "seconds_per_frame": seconds_per_frame,
+        "memory_bytes": pixels * RENDER_BUFFER_BYTES_PER_PIXEL,
+        "disk_bytes": pixels * FRAME_BYTES_PER_PIXEL * frames
+    }
+
+
+def download_seconds(download_bytes: float) -> float:
+    """Estimate how long a download takes at DOWNLOAD_BANDWIDTH."""
+    return download_bytes / DOWNLOAD_BANDWIDTH
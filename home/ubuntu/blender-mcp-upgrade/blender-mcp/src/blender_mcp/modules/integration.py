@@ -5,51 +5,114 @@ This module integrates all the enhanced functionality modules with the existing
 
 import bpy
 import os
+import sys
 import json
+import platform
+import tempfile
+import time
 import importlib
 from typing import Dict, List, Optional, Any, Union
 
-# Import BlenderMCP modules
-from blender_mcp.modules.asset_management import (
-    mixamo_integration,
-    sketchfab_integration,
-    turbosquid_integration,
-    quixel_integration
-)
-from blender_mcp.modules.scene_setup import (
-    hdri_lighting,
-    procedural_environment,
-    scene_composition
-)
-from blender_mcp.modules.character_animation import (
-    rigify_auto_rigging,
-    animation_retargeting,
-    ikfk_switching,
-    keyframe_generation,
-    cinematic_camera
-)
-from blender_mcp.modules.physics_vfx import (
-    cloth_physics,
-    hair_physics,
-    rigid_body_physics,
-    particle_effects
-)
-from blender_mcp.modules.rendering import (
-    render_engine_manager,
-    post_processing,
-    multi_camera_manager
-)
-from blender_mcp.modules.progress_tracking import (
-    progress_tracker,
-    progress_wrapper,
-    progress_ui,
-    ProgressStatus
-)
-from blender_mcp.modules.performance_optimization import (
-    performance_optimizer,
-    error_handler,
-    compatibility_tester
-)
+from blender_mcp.events import progress_events
+from blender_mcp.lazy import LazyObject
+from blender_mcp.metrics import metrics
+from blender_mcp.pipeline import StageGraph, pipeline_executor, plan, stage_cache
+from blender_mcp.profiler import command_profiler
+from blender_mcp.modules import cost_model
+from blender_mcp.modules.manifest import CommandManifest
+from blender_mcp.modules.route_table import Route, RouteError, RouteTable
+from blender_mcp.modules.stage_artifacts import blend_library_artifacts
+
+# BlenderMCP subsystems are imported the first time one of their objects is
+# used, so importing this module and creating BlenderMCPUltimate stay cheap
+_ASSET_MANAGEMENT = "blender_mcp.modules.asset_management"
+_SCENE_SETUP = "blender_mcp.modules.scene_setup"
+_CHARACTER_ANIMATION = "blender_mcp.modules.character_animation"
+_PHYSICS_VFX = "blender_mcp.modules.physics_vfx"
+_RENDERING = "blender_mcp.modules.rendering"
+_PROGRESS_TRACKING = "blender_mcp.modules.progress_tracking"
+_PERFORMANCE_OPTIMIZATION = "blender_mcp.modules.performance_optimization"
+_MEMORY_ACCOUNTING = "blender_mcp.modules.memory_accounting"
+
+mixamo_integration = LazyObject(_ASSET_MANAGEMENT, "mixamo_integration")
+sketchfab_integration = LazyObject(_ASSET_MANAGEMENT, "sketchfab_integration")
+turbosquid_integration = LazyObject(_ASSET_MANAGEMENT, "turbosquid_integration")
+quixel_integration = LazyObject(_ASSET_MANAGEMENT, "quixel_integration")
+
+hdri_lighting = LazyObject(_SCENE_SETUP, "hdri_lighting")
+procedural_environment = LazyObject(_SCENE_SETUP, "procedural_environment")
+scene_composition = LazyObject(_SCENE_SETUP, "scene_composition")
+
+rigify_auto_rigging = LazyObject(_CHARACTER_ANIMATION, "rigify_auto_rigging")
+animation_retargeting = LazyObject(_CHARACTER_ANIMATION, "animation_retargeting")
+ikfk_switching = LazyObject(_CHARACTER_ANIMATION, "ikfk_switching")
+keyframe_generation = LazyObject(_CHARACTER_ANIMATION, "keyframe_generation")
+cinematic_camera = LazyObject(_CHARACTER_ANIMATION, "cinematic_camera")
+
+cloth_physics = LazyObject(_PHYSICS_VFX, "cloth_physics")
+hair_physics = LazyObject(_PHYSICS_VFX, "hair_physics")
+rigid_body_physics = LazyObject(_PHYSICS_VFX, "rigid_body_physics")
+particle_effects = LazyObject(_PHYSICS_VFX, "particle_effects")
+
+render_engine_manager = LazyObject(_RENDERING, "render_engine_manager")
+post_processing = LazyObject(_RENDERING, "post_processing")
+multi_camera_manager = LazyObject(_RENDERING, "multi_camera_manager")
+
+progress_tracker = LazyObject(_PROGRESS_TRACKING, "progress_tracker")
+progress_wrapper = LazyObject(_PROGRESS_TRACKING, "progress_wrapper")
+progress_ui = LazyObject(_PROGRESS_TRACKING, "progress_ui")
+ProgressStatus = LazyObject(_PROGRESS_TRACKING, "ProgressStatus")
+
+performance_optimizer = LazyObject(_PERFORMANCE_OPTIMIZATION, "performance_optimizer")
+error_handler = LazyObject(_PERFORMANCE_OPTIMIZATION, "error_handler")
+compatibility_tester = LazyObject(_PERFORMANCE_OPTIMIZATION, "compatibility_tester")
+
+memory_accountant = LazyObject(_MEMORY_ACCOUNTING, "memory_accountant")
+register_memory_tracking = LazyObject(_MEMORY_ACCOUNTING, "register_memory_tracking")
+
+# Mixamo character imported by create_cinematic_sequence
+CINEMATIC_CHARACTER_ID = "ybot"
+
+# Compatibility check results are cached here per Blender and Python version
+COMPATIBILITY_CACHE_PATH = os.path.join(tempfile.gettempdir(), "blendermcp_compatibility.json")
+
+
+def _environment_key() -> str:
+    """Identify the environment the compatibility checks depend on."""
+    return f"{bpy.app.version_string}|{sys.version}|{platform.platform()}"
+
+
+def load_compatibility_results(refresh: bool = False) -> Dict:
+    """
+    Get the compatibility check results, running the checks only if no
+    cached results exist for this Blender and Python version.
+
+    Args:
+        refresh: Run the checks even if cached results exist
+
+    Returns:
+        Dict with compatibility check results
+    """
+    key = _environment_key()
+
+    if not refresh:
+        try:
+            with open(COMPATIBILITY_CACHE_PATH, "r") as f:
+                cached = json.load(f)
+            if cached.get("key") == key:
+                return cached["results"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    results = compatibility_tester.run_all_checks()
+
+    try:
+        with open(COMPATIBILITY_CACHE_PATH, "w") as f:
+            json.dump({"key": key, "results": results}, f)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Could not cache compatibility results: {str(e)}")
+
+    return results
 
 class BlenderMCPUltimate:
     """
@@ -100,14 +163,46 @@ class BlenderMCPUltimate:
             }
         }
         
+        # Commands are compiled to routes the first time they are executed
+        self.routes = RouteTable(self.modules)
+        
+        # Command descriptions are built once and cached across sessions
+        self.manifest = CommandManifest(self.routes)
+        
+        # Progress UI, event streaming and error handlers are set up by the
+        # first command, so creating the integration does not import them
+        self._started = False
+        self._compatibility_results = None
+    
+    def _ensure_started(self):
+        """Start the subsystems every command relies on, once."""
+        if self._started:
+            return
+        self._started = True
+        
         # Initialize progress tracking UI
         progress_ui.start_updates()
         
-        # Run compatibility checks
-        self.compatibility_results = compatibility_tester.run_all_checks()
+        # Stream progress events to subscribed MCP clients
+        progress_tracker.add_listener(progress_events.publish)
         
         # Register error handlers
         self._register_error_handlers()
+        
+        # Record datablock use for least-recently-used memory eviction
+        register_memory_tracking()
+    
+    @property
+    def compatibility_results(self) -> Dict:
+        """Compatibility check results, computed on first use and cached per Blender/Python version."""
+        if self._compatibility_results is None:
+            self._compatibility_results = load_compatibility_results()
+        return self._compatibility_results
+    
+    def refresh_compatibility_results(self) -> Dict:
+        """Run the compatibility checks again, e.g. after changing add-ons or drivers."""
+        self._compatibility_results = load_compatibility_results(refresh=True)
+        return self._compatibility_results
     
     def _register_error_handlers(self):
         """Register error handlers for common error types."""
@@ -134,20 +229,54 @@ class BlenderMCPUltimate:
         
         error_handler.register_error_handler("RenderError", handle_render_error)
     
-    def execute_command(self, command: str, params: Dict = None) -> Dict:
+    def execute_command(self, command: str, params: Dict = None, track_progress: Optional[bool] = None) -> Dict:
         """
         Execute a command with the specified parameters.
         
         Args:
             command: Command to execute
             params: Parameters for the command
+            track_progress: Report the command through the progress tracker. By
+                default only commands not known to finish within a millisecond
+                are tracked.
             
         Returns:
             Dict with command result
         """
+        # Profiled only when selected with command_profiler.configure
+        return command_profiler.call(command, self._execute_command, command, params, track_progress)
+    
+    def _execute_command(self, command: str, params: Optional[Dict], track_progress: Optional[bool]) -> Dict:
+        """Route, validate and run a command; see `execute_command`."""
         if params is None:
             params = {}
         
+        self._ensure_started()
+        
+        try:
+            route = self.routes.get(command)
+        except RouteError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        
+        validation_error = route.validate(params)
+        if validation_error:
+            return {
+                "status": "error",
+                "message": validation_error
+            }
+        
+        # Objects named by the command count as used for memory eviction
+        memory_accountant.touch_named(params)
+        
+        if track_progress is None:
+            track_progress = not self.routes.is_fast(command)
+        
+        if not track_progress:
+            return self._execute_route(route, params)
+        
         # Generate a unique operation ID for progress tracking
         operation_id = f"cmd_{command}_{id(params)}"
         
@@ -159,105 +288,35 @@ class BlenderMCPUltimate:
         )
         
         try:
-            # Update progress
-            progress_tracker.update_progress(
-                operation_id=operation_id,
-                step=10,
-                message=f"Parsing command: {command}"
-            )
-            
-            # Parse the command to determine which module and function to call
-            command_parts = command.split('.')
-            
-            if len(command_parts) < 2:
-                return {
-                    "status": "error",
-                    "message": f"Invalid command format: {command}"
-                }
-            
-            # Extract module and function names
-            module_name = command_parts[0]
-            function_name = command_parts[-1]
-            submodule_path = command_parts[1:-1] if len(command_parts) > 2 else []
-            
-            # Update progress
-            progress_tracker.update_progress(
-                operation_id=operation_id,
-                step=20,
-                message=f"Locating module: {module_name}"
-            )
-            
-            # Check if the module exists
-            if module_name not in self.modules:
-                progress_tracker.fail_operation(
-                    operation_id=operation_id,
-                    error_message=f"Module not found: {module_name}"
-                )
-                return {
-                    "status": "error",
-                    "message": f"Module not found: {module_name}"
-                }
-            
-            # Navigate to the submodule if specified
-            module = self.modules[module_name]
-            for submodule in submodule_path:
-                if submodule not in module:
-                    progress_tracker.fail_operation(
-                        operation_id=operation_id,
-                        error_message=f"Submodule not found: {submodule}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"Submodule not found: {submodule}"
-                    }
-                module = module[submodule]
-            
-            # Update progress
-            progress_tracker.update_progress(
-                operation_id=operation_id,
-                step=30,
-                message=f"Locating function: {function_name}"
-            )
-            
-            # Check if the function exists
-            if not hasattr(module, function_name):
-                progress_tracker.fail_operation(
-                    operation_id=operation_id,
-                    error_message=f"Function not found: {function_name}"
-                )
+            # Stop before the expensive part if the calling command was cancelled
+            if progress_tracker.is_cancelled(operation_id):
                 return {
                     "status": "error",
-                    "message": f"Function not found: {function_name}"
+                    "message": f"Command cancelled: {command}",
+                    "cancelled": True
                 }
             
-            # Get the function
-            func = getattr(module, function_name)
-            
             # Update progress
             progress_tracker.update_progress(
                 operation_id=operation_id,
                 step=50,
-                message=f"Executing function: {function_name}"
+                message=f"Executing function: {route.func.__name__}"
             )
             
             # Measure performance
+            start_time = time.perf_counter()
             performance_result = performance_optimizer.measure_performance(
                 operation_name=command,
-                callback=lambda: func(**params)
+                callback=lambda: route.func(**params)
             )
+            self.routes.record_duration(command, time.perf_counter() - start_time)
             
             # Get the result
             result = performance_result["result"]
             
-            # Update progress
-            progress_tracker.update_progress(
-                operation_id=operation_id,
-                step=90,
-                message=f"Processing result"
-            )
-            
             # Add performance metrics to the result
             if isinstance(result, dict):
+                memory_accountant.touch_named(result)
                 result["performance_metrics"] = performance_result["metrics"]
             
             # Complete the operation
@@ -269,89 +328,110 @@ class BlenderMCPUltimate:
             return result
         
         except Exception as e:
-            # Log the error
-            error_info = error_handler.log_error(
-                error_type=type(e).__name__,
-                error_message=str(e),
-                operation_name=command,
-                context=params
-            )
-            
             # Fail the operation
             progress_tracker.fail_operation(
                 operation_id=operation_id,
                 error_message=str(e)
             )
             
-            return {
-                "status": "error",
-                "message": str(e),
-                "error_info": error_info
-            }
+            return self._command_error(command, params, e)
     
-    def get_available_commands(self) -> Dict:
+    def _execute_route(self, route: Route, params: Dict) -> Dict:
+        """
+        Call a route without progress tracking or performance snapshots.
+        
+        The call is still recorded in the metrics registry, so fast commands
+        keep counting towards latency percentiles and exported histograms.
+        """
+        start_time = time.perf_counter()
+        try:
+            with metrics.measure(route.name):
+                result = route.func(**params)
+        except Exception as e:
+            return self._command_error(route.name, params, e)
+        self.routes.record_duration(route.name, time.perf_counter() - start_time)
+        if isinstance(result, dict):
+            memory_accountant.touch_named(result)
+        return result
+    
+    def _command_error(self, command: str, params: Dict, error: Exception) -> Dict:
+        """Log a command failure and build its error response."""
+        error_info = error_handler.log_error(
+            error_type=type(error).__name__,
+            error_message=str(error),
+            operation_name=command,
+            context=params
+        )
+        
+        return {
+            "status": "error",
+            "message": str(error),
+            "error_info": error_info
+        }
+    
+    def get_available_commands(self, refresh: bool = False) -> Dict:
         """
         Get a list of all available commands.
         
+        The manifest includes a JSON schema of each command's parameters and
+        is cached on disk until one of the modules changes.
+        
+        Args:
+            refresh: Rebuild the manifest even if a cached one exists
+            
         Returns:
             Dict with available commands
         """
-        commands = {}
-        
-        for module_name, module in self.modules.items():
-            commands[module_name] = self._get_module_commands(module, module_name)
-        
-        return commands
+        return self.manifest.get(refresh=refresh)
     
-    def _get_module_commands(self, module, prefix):
+    def get_manifest_version(self) -> str:
+        """Version key of the command manifest, for clients caching it."""
+        return self.manifest.key
+    
+    def configure_profiling(self, commands: Optional[List[str]] = None, sample_every: Optional[int] = None,
+                            interval: Optional[float] = None) -> Dict:
         """
-        Recursively get commands from a module.
+        Select commands for the sampling profiler.
         
         Args:
-            module: Module to get commands from
-            prefix: Command prefix
+            commands: Commands to profile on every call; an empty list for none
+            sample_every: Profile 1 in this many commands; 0 for none
+            interval: Seconds between stack snapshots
             
         Returns:
-            Dict with module commands
+            Dict with the profiler settings
         """
-        commands = {}
-        
-        if isinstance(module, dict):
-            # This is a module dictionary
-            for submodule_name, submodule in module.items():
-                subcommands = self._get_module_commands(submodule, f"{prefix}.{submodule_name}")
-                commands.update(subcommands)
-        else:
-            # This is an actual module
-            for attr_name in dir(module):
-                # Skip private attributes
-                if attr_name.startswith('_'):
-                    continue
-                
-                attr = getattr(module, attr_name)
-                
-                # Only include functions and methods
-                if callable(attr):
-                    command = f"{prefix}.{attr_name}"
-                    commands[command] = {
-                        "name": command,
-                        "doc": attr.__doc__ or "No documentation available"
-                    }
-        
-        return commands
+        return command_profiler.configure(commands, sample_every, interval)
+    
+    def get_profiles(self) -> List[Dict]:
+        """Summaries and collapsed-stack file paths of the most recent profiles."""
+        return command_profiler.get_profiles()
     
-    def create_cinematic_sequence(self, prompt: str, duration: int = 250, quality: str = "medium") -> Dict:
+    def create_cinematic_sequence(self, prompt: str, duration: int = 250, quality: str = "medium",
+                                  use_cache: bool = True, dry_run: bool = False) -> Dict:
         """
         Create a complete cinematic sequence from a text prompt.
         
+        The steps run as a stage graph: each stage that builds the scene runs
+        on the main thread as soon as its inputs are ready. Stages whose
+        inputs did not change since an earlier run are restored from the
+        stage cache instead of being rebuilt.
+        
         Args:
             prompt: Text prompt describing the desired sequence
             duration: Duration of the sequence in frames
             quality: Quality level (preview, medium, high, ultra)
+            use_cache: Reuse and store stage outputs
+            dry_run: Only estimate the cost, see `plan_cinematic_sequence`
             
         Returns:
-            Dict with sequence creation result
+            Dict with sequence creation result, per-stage timings and the critical path
         """
+        if dry_run:
+            return self.plan_cinematic_sequence(prompt, duration, quality, use_cache)
+        
+        self._ensure_started()
+        
         # Generate a unique operation ID for progress tracking
         operation_id = f"cinematic_sequence_{id(prompt)}"
         
@@ -362,102 +442,224 @@ class BlenderMCPUltimate:
             total_steps=100
         )
         
-        try:
-            # Step 1: Parse the prompt to extract key elements
-            progress_tracker.update_progress(
-                operation_id=operation_id,
-                step=5,
-                message="Analyzing prompt"
-            )
-            
-            # In a real implementation, this would use AI to parse the prompt
-            # For now, we'll just use some simple parsing
-            
-            # Step 2: Set up the scene
-            progress_tracker.update_progress(
-                operation_id=operation_id,
-                step=10,
-                message="Setting up scene"
-            )
-            
-            # Clear the existing scene
-            bpy.ops.wm.read_factory_settings(use_empty=True)
-            
-            # Step 3: Create environment
+        def on_stage_done(stage_name, completed, total):
             progress_tracker.update_progress(
                 operation_id=operation_id,
-                step=20,
-                message="Creating environment"
-            )
-            
-            # Create a simple environment based on the prompt
-            environment_result = self.execute_command(
-                "scene_setup.procedural_environment.create_environment",
-                {
-                    "environment_type": "generic",
-                    "prompt": prompt
-                }
-            )
-            
-            # Step 4: Import characters
-            progress_tracker.update_progress(
-                operation_id=operation_id,
-                step=30,
-                message="Importing characters"
+                step=int(completed * 100 / total),
+                message=f"Finished stage: {stage_name}"
             )
+        
+        try:
+            graph = self._cinematic_sequence_graph(prompt, duration, quality)
+            run = pipeline_executor.run(graph, on_stage_done=on_stage_done,
+                                        cache=stage_cache if use_cache else None)
             
-            # Import a character
-            character_result = self.execute_command(
-                "asset_management.mixamo.import_character",
-                {
-                    "character_type": "generic"
-                }
+            critical_path = " -> ".join(
+                f"{stage['stage']} ({stage['duration'] * 1000:.0f} ms)" for stage in run["critical_path"]
             )
             
-            # Step 5: Set up animation
-            progress_tracker.update_progress(
+            progress_tracker.complete_operation(
                 operation_id=operation_id,
-                step=40,
-                message="Setting up animation"
-            )
-            
-            # Create a simple animation based on the prompt
-            animation_result = self.execute_command(
-                "character_animation.keyframe_generation.generate_animation",
-                {
-                    "character_name": character_result.get("character_name", "Character"),
-                    "animation_type": "generic",
-                    "prompt": prompt,
-                    "duration": duration
-                }
+                message=f"Cinematic sequence created in {run['wall_time']:.2f}s; critical path: {critical_path}"
             )
             
-            # Step 6: Set up camera
-            progress_tracker.update_progress(
+            return {
+                "status": "success",
+                "message": "Cinematic sequence created",
+                "results": {
+                    name: result for name, result in run["results"].items()
+                    if name != "clear_scene"
+                },
+                "cached_stages": run["cached"],
+                "timings": run["timings"],
+                "critical_path": run["critical_path"],
+                "wall_time": run["wall_time"],
+                "stage_time": run["stage_time"]
+            }
+        
+        except Exception as e:
+            progress_tracker.fail_operation(
                 operation_id=operation_id,
-                step=50,
-                message="Setting up camera"
+                error_message=str(e)
             )
             
-            # Create a cinematic camera
-            camera_result = self.execute_command(
-                "character_animation.cinematic_camera.create_cinematic_camera",
-                {
-                    "camera_type": "tracking",
-                    "target_name": character_result.get("character_name", "Character"),
-                    "duration": duration
-                }
-            )
+            return self._command_error("create_cinematic_sequence", {
+                "prompt": prompt,
+                "duration": duration,
+                "quality": quality
+            }, e)
+    
+    def plan_cinematic_sequence(self, prompt: str, duration: int = 250, quality: str = "medium",
+                                use_cache: bool = True) -> Dict:
+        """
+        Estimate the time, memory, disk and download cost of a cinematic
+        sequence without changing the scene.
+        
+        Walks the same stage graph as `create_cinematic_sequence`. Download
+        sizes come from the asset caches, and assets that are already cached
+        cost nothing. Stage durations come from the measured command averages
+        where available, simulation bakes from the frame count and render time
+        from the quality's render preset at the resolution the sequence
+        renders at: the factory default it starts from, unless the preset sets
+        one. Stages already in the stage cache are costed as restores.
+        
+        Args:
+            prompt: Text prompt describing the desired sequence
+            duration: Duration of the sequence in frames
+            quality: Quality level (preview, medium, high, ultra)
+            use_cache: Account for stage outputs in the stage cache
             
-            # Step 7: Add physics and effects
-            progress_tracker.update_progress(
-                operation_id=operation_id,
-                step=60,
-                message="Adding physics and effects"
-            )
+        Returns:
+            Dict with per-stage costs, the critical path, the render estimate
+            and an overall budget
+        """
+        graph = self._cinematic_sequence_graph(prompt, duration, quality)
+        sequence_plan = plan(graph, stage_cache if use_cache else None)
+        
+        # The sequence starts from factory settings, which the presets only
+        # change where they set a resolution
+        presets = render_engine_manager.render_presets
+        preset = presets.get(quality, presets["medium"])
+        resolution_x, resolution_y, resolution_percentage = cost_model.FACTORY_RESOLUTION
+        render = cost_model.render_cost(
+            preset, duration,
+            resolution_x=preset.get("resolution_x", resolution_x),
+            resolution_y=preset.get("resolution_y", resolution_y),
+            resolution_percentage=preset.get("resolution_percentage", resolution_percentage)
+        )
+        totals = sequence_plan["totals"]
+        
+        return {
+            "status": "success",
+            "dry_run": True,
+            "stages": sequence_plan["stages"],
+            "critical_path": sequence_plan["critical_path"],
+            "render": render,
+            "budget": {
+                "build_seconds": totals["wall_seconds"],
+                "render_seconds": render["seconds"],
+                "total_seconds": totals["wall_seconds"] + render["seconds"],
+                "memory_bytes": totals["memory_bytes"] + render["memory_bytes"],
+                "disk_bytes": totals["disk_bytes"] + render["disk_bytes"],
+                "download_bytes": totals["download_bytes"],
+                "cached_stages": totals["cached_stages"]
+            }
+        }
+    
+    def _cinematic_sequence_graph(self, prompt: str, duration: int, quality: str) -> StageGraph:
+        """
+        Build the stage graph of `create_cinematic_sequence`.
+        
+        Args:
+            prompt: Text prompt describing the desired sequence
+            duration: Duration of the sequence in frames
+            quality: Quality level (preview, medium, high, ultra)
             
-            # Add some physics effects based on the prompt
-            physics_result = self.execute_command(
-                "physics_vfx.particle_effects.create_fog",
-                {
-                    "name": "At<response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
+        Returns:
+            Stage graph; MAIN stages touch bpy, IO and CPU stages must not
+        """
+        graph = StageGraph()
+        
+        # Stage outputs also depend on the code of the modules producing them
+        code = self.manifest.key
+        
+        def character_name(inputs):
+            return inputs["character"].get("object_name", "Character")
+        
+        def measured(command, default):
+            # Costs for planning; a command's measured average beats the default
+            average = self.routes.average_duration(command)
+            return default if average is None else average
+        
+        def download(cache_dir, asset_kind, asset_name, seconds, memory_bytes):
+            download_bytes = cost_model.cache_download_bytes(cache_dir, asset_kind, asset_name)
+            return {
+                "seconds": seconds + cost_model.download_seconds(download_bytes),
+                "download_bytes": download_bytes,
+                "disk_bytes": download_bytes,
+                "memory_bytes": memory_bytes
+            }
+        
+        # Clear the existing scene; memoized stages are appended back into it
+        def clear_scene(inputs):
+            bpy.ops.wm.read_factory_settings(use_empty=True)
+        
+        graph.add("clear_scene", clear_scene, params={}, memoize=False, estimate=lambda: {"seconds": 0.2})
+        
+        # Create a simple environment based on the prompt
+        graph.add("environment", lambda inputs: self.execute_command(
+            "scene_setup.procedural_environment.create_environment",
+            {
+                "environment_type": "generic",
+                "prompt": prompt
+            }
+        ), deps=["clear_scene"], params={"code": code, "prompt": prompt}, artifacts=blend_library_artifacts,
+            estimate=lambda: {
+                "seconds": measured("scene_setup.procedural_environment.create_environment", 2.0),
+                "memory_bytes": 64 * cost_model.MB
+            })
+        
+        # Import a character
+        graph.add("character", lambda inputs: self.execute_command(
+            "asset_management.mixamo.import_character",
+            {
+                "character_id": CINEMATIC_CHARACTER_ID
+            }
+        ), deps=["clear_scene"], params={"code": code, "character_id": CINEMATIC_CHARACTER_ID},
+            artifacts=blend_library_artifacts,
+            estimate=lambda: download(mixamo_integration.cache_dir, "character", CINEMATIC_CHARACTER_ID,
+                                      measured("asset_management.mixamo.import_character", 1.0),
+                                      32 * cost_model.MB))
+        
+        # Create a simple animation based on the prompt
+        graph.add("animation", lambda inputs: self.execute_command(
+            "character_animation.keyframe_generation.generate_animation",
+            {
+                "character_name": character_name(inputs),
+                "animation_type": "generic",
+                "prompt": prompt,
+                "duration": duration
+            }
+        ), deps=["character"], params={"code": code, "prompt": prompt, "duration": duration},
+            artifacts=blend_library_artifacts,
+            estimate=lambda: {
+                "seconds": measured("character_animation.keyframe_generation.generate_animation", 0.002 * duration),
+                "memory_bytes": 1024 * duration
+            })
+        
+        # Create a cinematic camera
+        graph.add("camera", lambda inputs: self.execute_command(
+            "character_animation.cinematic_camera.create_cinematic_camera",
+            {
+                "camera_type": "tracking",
+                "target_name": character_name(inputs),
+                "duration": duration
+            }
+        ), deps=["character"], params={"code": code, "duration": duration}, artifacts=blend_library_artifacts,
+            estimate=lambda: {
+                "seconds": measured("character_animation.cinematic_camera.create_cinematic_camera", 0.5),
+                "memory_bytes": 256 * duration
+            })
+        
+        # Add some physics effects based on the prompt
+        graph.add("physics", lambda inputs: self.execute_command(
+            "physics_vfx.particle_effects.create_fog",
+            {
+                "name": "Atmosphere"
+            }
+        ), deps=["environment"], params={"code": code}, artifacts=blend_library_artifacts,
+            estimate=lambda: dict(
+                cost_model.bake_cost("particles", duration),
+                memory_bytes=64 * cost_model.MB
+            ))
+        
+        # Set up rendering for the requested quality; cheap enough to always run
+        graph.add("render_settings", lambda inputs: self.execute_command(
+            "rendering.render_engine_manager.apply_render_preset",
+            {
+                "preset": quality
+            }
+        ), deps=["clear_scene"], params={"code": code, "quality": quality}, memoize=False,
+            estimate=lambda: {"seconds": 0.05})
+        
+        return graph
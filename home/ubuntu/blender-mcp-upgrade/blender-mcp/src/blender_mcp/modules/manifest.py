@@ -0,0 +1,354 @@
+"""
+BlenderMCP Ultimate Cinematic Upgrade - Command Manifest
+Describes every command with a JSON schema of its parameters, so clients can
+cache the manifest and validate calls locally.
+
+The manifest is built from the route table once and saved to a cache file
+keyed by the source files of the modules it describes. Later processes load
+it from disk without importing any subsystem until one of its commands runs.
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import tempfile
+import threading
+import typing
+from typing import Any, Dict, Iterable, List, Optional
+
+from blender_mcp.lazy import LazyObject
+from blender_mcp.modules.route_table import Route, RouteTable
+
+# Bump when the manifest layout changes so stale cache files are ignored
+MANIFEST_FORMAT = 1
+
+# The command manifest is cached here per set of module versions
+MANIFEST_CACHE_PATH = os.path.join(tempfile.gettempdir(), "blendermcp_manifest.json")
+
+# JSON schema types of Python types, most specific first (bool is an int)
+_JSON_TYPES = (
+    (bool, "boolean"),
+    (int, "integer"),
+    (float, "number"),
+    (str, "string"),
+    (dict, "object"),
+    (list, "array"),
+    (tuple, "array"),
+    (set, "array"),
+    (frozenset, "array"),
+    (type(None), "null"),
+)
+
+
+def _json_type(python_type) -> Optional[str]:
+    """Get the JSON schema type name of a Python type, if it has one."""
+    for candidate, json_type in _JSON_TYPES:
+        if isinstance(python_type, type) and issubclass(python_type, candidate):
+            return json_type
+    return None
+
+
+def annotation_schema(annotation) -> Dict[str, Any]:
+    """
+    Convert a type annotation to a JSON schema.
+
+    Args:
+        annotation: Annotation from a signature
+
+    Returns:
+        JSON schema; empty (accepting anything) for types without a JSON equivalent
+    """
+    if annotation is Any or annotation is inspect.Parameter.empty:
+        return {}
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Union:
+        options = [annotation_schema(arg) for arg in args]
+        if any(not option for option in options):
+            return {}
+        types = []
+        for option in options:
+            option_types = option.get("type")
+            if not isinstance(option_types, list):
+                option_types = [option_types]
+            types.extend(t for t in option_types if t not in types)
+        if all(set(option) == {"type"} for option in options):
+            return {"type": types[0] if len(types) == 1 else types}
+        return {"anyOf": options}
+
+    json_type = _json_type(origin or annotation)
+    if json_type is None:
+        return {}
+
+    schema = {"type": json_type}
+    if json_type == "array" and origin is tuple and args and args[-1] is not Ellipsis:
+        schema["items"] = [annotation_schema(arg) for arg in args]
+        schema["minItems"] = schema["maxItems"] = len(args)
+    elif json_type == "array" and args:
+        schema["items"] = annotation_schema(args[0])
+    elif json_type == "object" and len(args) == 2:
+        schema["additionalProperties"] = annotation_schema(args[1])
+    return schema
+
+
+def _default_schema(default) -> Dict[str, Any]:
+    """Infer a JSON schema from a default value, for unannotated parameters."""
+    json_type = _json_type(type(default))
+    if json_type in (None, "null"):
+        return {}
+    if json_type == "integer":
+        # Callers routinely pass 1.5 where the default happens to be 1
+        return {"type": "number"}
+    return {"type": json_type}
+
+
+def _json_default(default) -> Any:
+    """The default value as JSON, or None if it cannot be represented."""
+    if isinstance(default, (tuple, set, frozenset)):
+        default = list(default)
+    try:
+        json.dumps(default)
+    except (TypeError, ValueError):
+        return None
+    return default
+
+
+def parameter_schema(parameter: inspect.Parameter) -> Dict[str, Any]:
+    """
+    Build the JSON schema of a signature parameter from its annotation or default.
+
+    Args:
+        parameter: Parameter from `inspect.signature`
+
+    Returns:
+        JSON schema of the parameter
+    """
+    schema = annotation_schema(parameter.annotation)
+    has_default = parameter.default is not parameter.empty
+
+    if not schema and has_default:
+        schema = _default_schema(parameter.default)
+
+    if has_default:
+        default = _json_default(parameter.default)
+        if default is not None or parameter.default is None:
+            schema["default"] = default
+        if parameter.default is None and "type" in schema:
+            # None means "not given" here, whatever the annotation says
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            if "null" not in types:
+                schema["type"] = types + ["null"]
+
+    return schema
+
+
+def route_schema(route: Route) -> Dict[str, Any]:
+    """
+    Describe a route for the manifest.
+
+    Args:
+        route: Compiled route
+
+    Returns:
+        Dict with the command name, documentation and a JSON schema of its parameters
+    """
+    properties = {}
+    try:
+        signature = inspect.signature(route.func)
+    except (TypeError, ValueError):
+        signature = None
+
+    if signature is not None:
+        for parameter in signature.parameters.values():
+            if parameter.name in route.parameters:
+                properties[parameter.name] = parameter_schema(parameter)
+
+    parameters = {
+        "type": "object",
+        "properties": properties,
+        "required": sorted(route.required),
+        "additionalProperties": route.accepts_any
+    }
+
+    return {
+        "name": route.name,
+        "doc": inspect.getdoc(route.func) or "No documentation available",
+        "parameters": parameters
+    }
+
+
+def build_manifest(routes: RouteTable) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Describe every command of a route table.
+
+    Args:
+        routes: Route table to describe; all of its routes are compiled
+
+    Returns:
+        Dict mapping each top-level module name to its commands
+    """
+    manifest = {module_name: {} for module_name in routes.modules}
+    for name, route in sorted(routes.compile_all().items()):
+        manifest[name.split('.', 1)[0]][name] = route_schema(route)
+    return manifest
+
+
+def _module_paths(modules: Dict) -> List[str]:
+    """Names of the Python modules defining the objects in a nested module dict."""
+    paths = set()
+
+    def walk(module):
+        if isinstance(module, dict):
+            for submodule in module.values():
+                walk(submodule)
+        elif isinstance(module, LazyObject):
+            paths.add(module.module_path)
+        else:
+            paths.add(type(module).__module__)
+
+    walk(modules)
+    return sorted(paths)
+
+
+def module_versions_key(module_paths: Iterable[str]) -> str:
+    """
+    Hash the versions of some modules without importing them.
+
+    A module's version combines its `__version__`, if it is already imported
+    and has one, with the size and modification time of its source file.
+
+    Args:
+        module_paths: Dotted module names
+
+    Returns:
+        Hex digest that changes whenever one of the modules does
+    """
+    digest = hashlib.sha256(f"{MANIFEST_FORMAT}|{sys.version}".encode())
+
+    for module_path in sorted(module_paths):
+        version = getattr(sys.modules.get(module_path), "__version__", None)
+        origin = None
+        try:
+            spec = importlib.util.find_spec(module_path)
+            origin = spec.origin if spec is not None else None
+        except (ImportError, ValueError):
+            pass
+
+        if origin and os.path.exists(origin):
+            stat = os.stat(origin)
+            version = f"{version}|{stat.st_size}|{stat.st_mtime_ns}"
+
+        digest.update(f"|{module_path}={version}".encode())
+
+    return digest.hexdigest()
+
+
+def validate_params(command_schema: Dict[str, Any], params: Dict[str, Any]) -> Optional[str]:
+    """
+    Check parameters against a manifest entry without asking Blender.
+
+    Checks required and unknown parameters and the JSON types of top-level
+    values, which is what `Route.validate` and the handlers rely on.
+
+    Args:
+        command_schema: The command's manifest entry
+        params: Parameters for the command
+
+    Returns:
+        Error message, or None if the parameters are valid
+    """
+    name = command_schema.get("name", "command")
+    schema = command_schema.get("parameters", {})
+    properties = schema.get("properties", {})
+
+    missing = [key for key in schema.get("required", []) if key not in params]
+    if missing:
+        return f"Missing parameters for {name}: {', '.join(sorted(missing))}"
+
+    if not schema.get("additionalProperties", True):
+        unknown = set(params).difference(properties)
+        if unknown:
+            return f"Unknown parameters for {name}: {', '.join(sorted(unknown))}"
+
+    for key, value in params.items():
+        expected = properties.get(key, {}).get("type")
+        if expected is None:
+            continue
+        expected = expected if isinstance(expected, list) else [expected]
+        actual = _json_type(type(value))
+        if actual in expected or (actual == "integer" and "number" in expected):
+            continue
+        return f"Invalid type for {name} parameter {key}: expected {' or '.join(expected)}, got {actual}"
+
+    return None
+
+
+class CommandManifest:
+    """
+    Command manifest of a route table, built once and cached on disk.
+    """
+
+    def __init__(self, routes: RouteTable, cache_path: str = MANIFEST_CACHE_PATH):
+        self.routes = routes
+        self.cache_path = cache_path
+        self._manifest = None
+        self._key = None
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        """Version key of the manifest; changes whenever a described module does."""
+        if self._key is None:
+            self._key = module_versions_key(_module_paths(self.routes.modules))
+        return self._key
+
+    def get(self, refresh: bool = False) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get the manifest, loading it from the cache file or building it if needed.
+
+        Args:
+            refresh: Rebuild the manifest even if a cached one exists
+
+        Returns:
+            Dict mapping each top-level module name to its commands
+        """
+        with self._lock:
+            if refresh:
+                self._manifest = None
+                self._key = None
+            elif self._manifest is not None:
+                return self._manifest
+
+            key = self.key
+            manifest = None if refresh else self._load(key)
+            if manifest is None:
+                manifest = build_manifest(self.routes)
+                self._save(key, manifest)
+
+            self._manifest = manifest
+            return manifest
+
+    def _load(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self.cache_path, "r") as f:
+                cached = json.load(f)
+            if cached.get("key") == key:
+                return cached["commands"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _save(self, key: str, manifest: Dict) -> None:
+        # Write to a temporary file first so concurrent readers never see half a manifest
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({"key": key, "commands": manifest}, f)
+            os.replace(temp_path, self.cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Could not cache command manifest: {str(e)}")
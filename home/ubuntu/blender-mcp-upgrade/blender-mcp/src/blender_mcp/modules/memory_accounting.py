@@ -0,0 +1,412 @@
+"""
+BlenderMCP Ultimate Cinematic Upgrade - Memory Accounting
+Estimates the memory held by meshes, images and actions, and keeps the total
+under a budget by evicting the least recently used data first.
+
+The estimates count the arrays that dominate each datablock's size: vertices,
+edges, loops and faces of a mesh, the loaded pixels of an image, and the
+keyframes of an action. Unlike the process RSS, they do not move with
+allocator noise, so they can be compared before and after an eviction.
+
+A datablock counts as used whenever it is updated in the depsgraph, belongs to
+an object a command names in its parameters or result (see `touching`), or is
+referenced by the active scene when memory is scanned.
+"""
+
+import bpy
+import functools
+import inspect
+import time
+from typing import Callable, Dict, List, Any, Iterable
+
+from blender_mcp.scene_cache import query_cache
+
+# Bytes per vertex: position, normal and flags
+VERTEX_BYTES = 32
+
+# Bytes per edge: two vertex indices
+EDGE_BYTES = 8
+
+# Bytes per face corner: vertex and edge index
+LOOP_BYTES = 8
+
+# Bytes per face corner for each UV map
+LOOP_UV_BYTES = 8
+
+# Bytes per face: loop offset, material index and flags
+POLYGON_BYTES = 16
+
+# Bytes per keyframe (a BezTriple with its handles)
+KEYFRAME_BYTES = 72
+
+# Bytes per F-Curve besides its keyframes
+FCURVE_BYTES = 256
+
+# Datablock collections that are accounted, by datablock type
+ACCOUNTED_COLLECTIONS = {
+    "mesh": "meshes",
+    "image": "images",
+    "action": "actions"
+}
+
+# Datablock collections cleared of orphans by `remove_orphans`
+ORPHAN_COLLECTIONS = ("meshes", "materials", "textures", "images", "actions", "armatures")
+
+# Image sources whose pixels Blender can load again after they are freed
+RELOADABLE_IMAGE_SOURCES = {"FILE", "SEQUENCE", "MOVIE", "TILED"}
+
+
+def mesh_bytes(mesh) -> int:
+    """Estimate the geometry memory of a mesh."""
+    loops = len(mesh.loops)
+    return (
+        len(mesh.vertices) * VERTEX_BYTES
+        + len(mesh.edges) * EDGE_BYTES
+        + loops * (LOOP_BYTES + LOOP_UV_BYTES * len(mesh.uv_layers))
+        + len(mesh.polygons) * POLYGON_BYTES
+    )
+
+
+def image_bytes(image) -> int:
+    """Estimate the memory of an image's loaded pixels and packed file."""
+    size = image.packed_file.size if image.packed_file else 0
+    if image.has_data:
+        width, height = image.size
+        size += width * height * image.channels * (4 if image.is_float else 1)
+    return size
+
+
+def action_fcurves(action) -> Iterable:
+    """F-Curves of an action, including those in the channelbags of layered actions."""
+    fcurves = getattr(action, "fcurves", None)
+    if fcurves is not None:
+        return fcurves
+    return [
+        fcurve
+        for layer in getattr(action, "layers", [])
+        for strip in layer.strips
+        for channelbag in getattr(strip, "channelbags", [])
+        for fcurve in channelbag.fcurves
+    ]
+
+
+def action_bytes(action) -> int:
+    """Estimate the memory of an action's keyframes."""
+    return sum(FCURVE_BYTES + len(fcurve.keyframe_points) * KEYFRAME_BYTES for fcurve in action_fcurves(action))
+
+
+def remove_orphans(collection_names: Iterable[str] = ORPHAN_COLLECTIONS) -> Dict[str, int]:
+    """
+    Remove datablocks without users or a fake user.
+
+    The orphans are collected first and removed in one go; removing while
+    iterating a collection skips items.
+
+    Args:
+        collection_names: Names of the `bpy.data` collections to clear
+
+    Returns:
+        Number of removed datablocks per collection
+    """
+    orphans = {
+        collection_name: [
+            datablock for datablock in getattr(bpy.data, collection_name)
+            if datablock.users == 0 and not datablock.use_fake_user
+        ]
+        for collection_name in collection_names
+    }
+    removed = [datablock for datablocks in orphans.values() for datablock in datablocks]
+    if removed:
+        bpy.data.batch_remove(removed)
+    return {collection_name: len(datablocks) for collection_name, datablocks in orphans.items()}
+
+
+def _node_tree_images(node_tree) -> Iterable[int]:
+    """Session uids of the images used by a node tree's nodes."""
+    if node_tree is None:
+        return
+    for node in node_tree.nodes:
+        image = getattr(node, "image", None)
+        if image is not None:
+            yield image.session_uid
+
+
+def _object_datablocks(obj) -> Iterable[int]:
+    """Session uids of an object's data, active action and material images."""
+    if obj.data is not None:
+        yield obj.data.session_uid
+    if obj.animation_data and obj.animation_data.action:
+        yield obj.animation_data.action.session_uid
+    for slot in obj.material_slots:
+        if slot.material is not None and slot.material.use_nodes:
+            yield from _node_tree_images(slot.material.node_tree)
+
+
+ESTIMATORS = {
+    "mesh": mesh_bytes,
+    "image": image_bytes,
+    "action": action_bytes
+}
+
+
+class MemoryAccountant:
+    """
+    Tracks the estimated memory and last use of meshes, images and actions.
+    """
+
+    def __init__(self):
+        # Last use of each datablock by session_uid
+        self.last_used: Dict[int, float] = {}
+
+    def touch(self, datablock) -> None:
+        """Mark a datablock as used now."""
+        self.last_used[datablock.session_uid] = time.time()
+
+    def touch_object(self, obj) -> None:
+        """Mark an object's data, action and material images as used now."""
+        now = time.time()
+        for uid in _object_datablocks(obj):
+            self.last_used[uid] = now
+
+    def touch_named(self, values: Dict[str, Any]) -> None:
+        """
+        Mark the datablocks of objects and images named in a command's
+        parameters or result as used now.
+
+        Args:
+            values: Parameters or result; top-level strings and lists of strings
+                are looked up as object and image names
+        """
+        for value in values.values():
+            if isinstance(value, str):
+                names = (value,)
+            elif isinstance(value, (list, tuple)):
+                names = [name for name in value if isinstance(name, str)]
+            else:
+                continue
+
+            for name in names:
+                obj = bpy.data.objects.get(name)
+                if obj is not None:
+                    self.touch_object(obj)
+                    continue
+                image = bpy.data.images.get(name)
+                if image is not None:
+                    self.touch(image)
+
+    def _scene_datablocks(self, scene) -> set:
+        """Session uids of the datablocks the scene references."""
+        used = set()
+        for obj in scene.objects:
+            used.update(_object_datablocks(obj))
+
+        if scene.world is not None and scene.world.use_nodes:
+            used.update(_node_tree_images(scene.world.node_tree))
+
+        return used
+
+    def scan(self) -> List[Dict[str, Any]]:
+        """
+        Estimate every accounted datablock.
+
+        Datablocks the scene references are marked as used now; datablocks seen
+        for the first time count as used at the time of the scan.
+
+        Returns:
+            Entries with the datablock, its type, name, estimated bytes, users,
+            whether the scene uses it and its last use
+        """
+        now = time.time()
+        in_scene = self._scene_datablocks(bpy.context.scene)
+
+        entries = []
+        for datablock_type, collection_name in ACCOUNTED_COLLECTIONS.items():
+            estimate = ESTIMATORS[datablock_type]
+            for datablock in getattr(bpy.data, collection_name):
+                uid = datablock.session_uid
+                if uid in in_scene or uid not in self.last_used:
+                    self.last_used[uid] = now
+                entries.append({
+                    "datablock": datablock,
+                    "type": datablock_type,
+                    "name": datablock.name,
+                    "bytes": estimate(datablock),
+                    "users": datablock.users,
+                    "in_scene": uid in in_scene,
+                    "last_used": self.last_used[uid]
+                })
+
+        # Forget datablocks that no longer exist
+        existing = {entry["datablock"].session_uid for entry in entries}
+        for uid in [uid for uid in self.last_used if uid not in existing]:
+            del self.last_used[uid]
+
+        return entries
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Summarize the estimated memory use.
+
+        Args:
+            top: Number of largest datablocks to list
+
+        Returns:
+            Dict with the total, per-type totals and the largest datablocks
+        """
+        entries = self.scan()
+        by_type = {datablock_type: 0 for datablock_type in ACCOUNTED_COLLECTIONS}
+        for entry in entries:
+            by_type[entry["type"]] += entry["bytes"]
+
+        largest = sorted(entries, key=lambda entry: entry["bytes"], reverse=True)[:top]
+        return {
+            "total_bytes": sum(by_type.values()),
+            "by_type": by_type,
+            "largest": [{key: value for key, value in entry.items() if key != "datablock"} for entry in largest]
+        }
+
+    def enforce_budget(self, limit: int) -> Dict[str, Any]:
+        """
+        Evict data until the estimated total fits in `limit` bytes.
+
+        Evictions happen in order, least recently used first within each step,
+        stopping as soon as the total fits:
+
+        1. Pixels of images that can be reloaded from their file, first of
+           images the scene does not use. Blender loads them again on demand.
+        2. Query results cached for earlier scene versions.
+        3. Meshes, images and actions without users or a fake user.
+
+        Data the scene uses is never removed.
+
+        Args:
+            limit: Memory budget in bytes
+
+        Returns:
+            Dict with the estimated totals before and after, and the evictions
+        """
+        entries = self.scan()
+        total = initial = sum(entry["bytes"] for entry in entries)
+        evicted = []
+
+        if total > limit:
+            images = [
+                entry for entry in entries
+                if entry["type"] == "image" and entry["datablock"].has_data and not entry["datablock"].is_dirty
+                and entry["datablock"].source in RELOADABLE_IMAGE_SOURCES
+            ]
+            images.sort(key=lambda entry: (entry["in_scene"], entry["last_used"]))
+            for entry in images:
+                if total <= limit:
+                    break
+                image = entry["datablock"]
+                image.buffers_free()
+                freed = entry["bytes"] - image_bytes(image)
+                total -= freed
+                evicted.append({"type": "image_pixels", "name": entry["name"], "bytes": freed})
+
+        if total > limit:
+            dropped = query_cache.drop_stale()
+            if dropped:
+                evicted.append({"type": "query_cache", "name": "stale results", "entries": dropped})
+
+        if total > limit:
+            orphans = [
+                entry for entry in entries
+                if entry["users"] == 0 and not entry["datablock"].use_fake_user
+            ]
+            orphans.sort(key=lambda entry: entry["last_used"])
+
+            removed = []
+            for entry in orphans:
+                if total <= limit:
+                    break
+                # The image's pixels may already have been freed above
+                size = image_bytes(entry["datablock"]) if entry["type"] == "image" else entry["bytes"]
+                total -= size
+                removed.append(entry["datablock"])
+                evicted.append({"type": entry["type"], "name": entry["name"], "bytes": size})
+
+            # Collect first and remove in one go; removing while iterating a collection skips items
+            if removed:
+                bpy.data.batch_remove(removed)
+
+        return {
+            "limit": limit,
+            "initial_bytes": initial,
+            "final_bytes": total,
+            "within_limit": total <= limit,
+            "evicted": evicted
+        }
+
+    def clear(self) -> None:
+        """Forget every recorded use."""
+        self.last_used.clear()
+
+
+# Accountant shared by the performance optimizer
+memory_accountant = MemoryAccountant()
+
+
+def touching(func: Callable) -> Callable:
+    """
+    Wrap a command handler so the objects and images named in its parameters,
+    and in its result, count as used by the command.
+
+    Args:
+        func: Command handler, possibly a generator (chunked) handler
+
+    Returns:
+        Wrapped handler
+    """
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def touch_chunked(**params):
+            memory_accountant.touch_named(params)
+            result = yield from func(**params)
+            if isinstance(result, dict):
+                memory_accountant.touch_named(result)
+            return result
+
+        return touch_chunked
+
+    @functools.wraps(func)
+    def touch(**params):
+        memory_accountant.touch_named(params)
+        result = func(**params)
+        if isinstance(result, dict):
+            memory_accountant.touch_named(result)
+        return result
+
+    return touch
+
+
+def on_depsgraph_update(scene, depsgraph=None) -> None:
+    """Handler for `depsgraph_update_post` that marks updated datablocks as used."""
+    if depsgraph is None:
+        return
+    now = time.time()
+    for update in depsgraph.updates:
+        memory_accountant.last_used[update.id.original.session_uid] = now
+
+
+def on_load_post(*args) -> None:
+    """Handler for `load_post`; uses recorded for the previous file no longer apply."""
+    memory_accountant.clear()
+
+
+def register_memory_tracking() -> None:
+    """Install the Blender handlers that record datablock use."""
+    for handlers, handler in ((bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+                              (bpy.app.handlers.load_post, on_load_post)):
+        handler = bpy.app.handlers.persistent(handler)
+        if handler not in handlers:
+            handlers.append(handler)
+
+
+def unregister_memory_tracking() -> None:
+    """Remove the Blender handlers installed by `register_memory_tracking`."""
+    for handlers, handler in ((bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+                              (bpy.app.handlers.load_post, on_load_post)):
+        if handler in handlers:
+            handlers.remove(handler)
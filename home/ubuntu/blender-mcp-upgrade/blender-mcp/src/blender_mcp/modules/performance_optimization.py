@@ -11,13 +11,17 @@ import platform
 import sys
 from typing import Dict, List, Optional, Callable, Any, Union
 
+from blender_mcp.metrics import DEFAULT_WINDOW, metrics
+from blender_mcp.modules.memory_accounting import memory_accountant, remove_orphans
+from blender_mcp.system_sampler import system_sampler
+
 class PerformanceOptimizer:
     """
     Handles performance optimization for BlenderMCP operations.
     """
     
     def __init__(self):
-        self.performance_metrics = {}
+        self.metrics = metrics
         self.optimization_settings = {
             "memory_limit": 8 * 1024 * 1024 * 1024,  # 8 GB default memory limit
             "viewport_quality": "medium",
@@ -33,6 +37,9 @@ class PerformanceOptimizer:
         """
         Measure the performance of an operation.
         
+        Every call is recorded in the metrics registry; see
+        `analyze_performance_metrics` for latency percentiles.
+        
         Args:
             operation_name: Name of the operation to measure
             callback: Function to execute and measure
@@ -40,55 +47,54 @@ class PerformanceOptimizer:
         Returns:
             Dict with performance metrics
         """
-        # Get initial memory usage
-        process = psutil.Process()
-        initial_memory = process.memory_info().rss
-        
-        # Get initial time
-        start_time = time.time()
-        
-        # Execute the callback
-        try:
-            result = callback()
-            success = True
-        except Exception as e:
-            result = str(e)
-            success = False
-        
-        # Get final time
-        end_time = time.time()
-        
-        # Get final memory usage
-        final_memory = process.memory_info().rss
-        
-        # Calculate metrics
-        execution_time = end_time - start_time
-        memory_usage = final_memory - initial_memory
-        
-        # Store metrics
-        metrics = {
-            "operation_name": operation_name,
-            "execution_time": execution_time,
-            "memory_usage": memory_usage,
-            "success": success,
-            "timestamp": time.time()
+        with self.metrics.measure(operation_name) as sample:
+            try:
+                result = callback()
+            except Exception as e:
+                result = str(e)
+                sample["success"] = False
+        
+        return {
+            "metrics": sample,
+            "result": result
         }
+    
+    def enable_memory_tracing(self, enabled: bool = True) -> Dict:
+        """
+        Measure the peak Python memory allocated by each operation with tracemalloc.
         
-        self.performance_metrics[operation_name] = metrics
+        Tracing slows down every allocation, so it is off by default.
         
+        Args:
+            enabled: Whether to trace memory
+            
+        Returns:
+            Dict with the new setting
+        """
+        self.metrics.enable_memory_tracing(enabled)
         return {
-            "metrics": metrics,
-            "result": result
+            "trace_memory": enabled
         }
     
-    def optimize_memory_usage(self) -> Dict:
+    def optimize_memory_usage(self, memory_limit: Optional[int] = None) -> Dict:
         """
         Optimize memory usage in Blender.
         
+        Collects garbage, purges orphan data and clears the undo history, then
+        evicts data until the estimated memory of meshes, images and actions
+        fits the memory limit; see `MemoryAccountant.enforce_budget` for the
+        eviction order.
+        
+        Args:
+            memory_limit: Budget in bytes; defaults to the "memory_limit" setting
+            
         Returns:
             Dict with optimization results
         """
-        initial_memory = psutil.Process().memory_info().rss
+        if memory_limit is None:
+            memory_limit = self.optimization_settings["memory_limit"]
+        
+        initial_memory = memory_accountant.report(top=0)["total_bytes"]
         
         # Force garbage collection
         gc.collect()
@@ -101,23 +107,39 @@ class PerformanceOptimizer:
         bpy.ops.ed.undo_push()
         bpy.context.preferences.edit.undo_steps = 32  # Reset to default
         
-        # Remove unused datablocks
-        for datablock in [bpy.data.meshes, bpy.data.materials, bpy.data.textures, 
-                         bpy.data.images, bpy.data.actions, bpy.data.armatures]:
-            for item in datablock:
-                if item.users == 0:
-                    datablock.remove(item)
+        # Remove unused datablocks the purge left behind
+        removed_orphans = remove_orphans()
         
-        final_memory = psutil.Process().memory_info().rss
-        memory_saved = initial_memory - final_memory
+        budget = memory_accountant.enforce_budget(memory_limit)
         
         return {
+            "memory_limit": memory_limit,
             "initial_memory": initial_memory,
-            "final_memory": final_memory,
-            "memory_saved": memory_saved,
-            "success": memory_saved > 0
+            "final_memory": budget["final_bytes"],
+            "memory_saved": initial_memory - budget["final_bytes"],
+            "removed_orphans": removed_orphans,
+            "evicted": budget["evicted"],
+            # Informational only; RSS moves with allocator noise
+            "process_rss": psutil.Process().memory_info().rss,
+            "success": budget["within_limit"]
         }
     
+    def get_memory_usage(self, top: int = 10) -> Dict:
+        """
+        Estimate the memory held by meshes, images and actions.
+        
+        Args:
+            top: Number of largest datablocks to list
+            
+        Returns:
+            Dict with the estimated total, per-type totals, the largest
+            datablocks and the memory limit
+        """
+        report = memory_accountant.report(top)
+        report["memory_limit"] = self.optimization_settings["memory_limit"]
+        report["within_limit"] = report["total_bytes"] <= report["memory_limit"]
+        return report
+    
     def optimize_viewport_performance(self, quality: str = "medium") -> Dict:
         """
         Optimize viewport performance.
@@ -339,18 +361,26 @@ class PerformanceOptimizer:
         """
         Get system information for performance analysis.
         
+        Load figures come from the background system sampler, so this returns
+        immediately; the sampler is started by the first call.
+        
         Returns:
-            Dict with system information
+            Dict with system information, the latest load snapshot and load
+            aggregated over the last 10 and 60 seconds
         """
+        load = system_sampler.summary()
+        latest = load["latest"]
+        
         system_info = {
             "platform": platform.platform(),
             "processor": platform.processor(),
             "python_version": platform.python_version(),
             "blender_version": bpy.app.version_string,
             "memory_total": psutil.virtual_memory().total,
-            "memory_available": psutil.virtual_memory().available,
+            "memory_available": latest["memory_available"],
             "cpu_count": psutil.cpu_count(),
-            "cpu_percent": psutil.cpu_percent(interval=1),
+            "cpu_percent": latest["cpu_percent"],
+            "load": load,
             "gpu_info": self._get_gpu_info()
         }
         
@@ -378,11 +408,27 @@ class PerformanceOptimizer:
         
         return gpu_info
     
-    def analyze_performance_metrics(self) -> Dict:
+    def analyze_performance_metrics(self, window: Optional[float] = DEFAULT_WINDOW) -> Dict:
         """
         Analyze collected performance metrics.
         
+        Args:
+            window: Seconds to compute latency percentiles over; None for all
+                samples since startup
+            
         Returns:
             Dict with performance analysis
         """
-  <response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
+        summaries = {name: summary for name, summary in self.metrics.summaries(window).items() if summary["count"]}
+        
+        # Commands with the worst tail latency first
+        slowest = sorted(summaries, key=lambda name: summaries[name]["p95"], reverse=True)
+        
+        return {
+            "window": window,
+            "commands": summaries,
+            "slowest_commands": slowest[:5],
+            "total_count": sum(summary["count"] for summary in summaries.values()),
+            "errors_since_startup": sum(summary["errors"] for summary in summaries.values()),
+            "trace_memory": self.metrics.trace_memory
+        }
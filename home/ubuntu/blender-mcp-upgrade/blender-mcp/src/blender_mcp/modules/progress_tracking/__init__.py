@@ -11,6 +11,8 @@ import json
 from enum import Enum
 from typing import Dict, List, Optional, Callable, Any, Union
 
+from blender_mcp.cancellation import CancelToken, current_token
+
 class ProgressStatus(Enum):
     """Status values for progress tracking"""
     NOT_STARTED = "not_started"
@@ -33,6 +35,8 @@ class ProgressTracker:
         self.listeners = []
         self.log_entries = []
         self.max_log_entries = 1000
+        # Cancellation tokens of the commands that started each operation
+        self.cancel_tokens: Dict[str, CancelToken] = {}
         
         # Create a property group for Blender UI
         if not hasattr(bpy.types, "BlenderMCPProgressProperties"):
@@ -98,6 +102,11 @@ class ProgressTracker:
         
         self.operations[operation_id] = operation
         
+        # Link the operation to the command running it, so cancelling one cancels the other
+        token = current_token()
+        if token is not None:
+            self.cancel_tokens[operation_id] = token
+        
         # If this is a sub-operation, add it to the parent
         if parent_id and parent_id in self.operations:
             self.operations[parent_id]["sub_operations"].append(operation_id)
@@ -198,6 +207,7 @@ class ProgressTracker:
         
         # Update operation status
         operation["status"] = ProgressStatus.COMPLETED.value
+        self.cancel_tokens.pop(operation_id, None)
         operation["progress"] = 1.0
         operation["current_step"] = operation["total_steps"]
         operation["end_time"] = datetime.datetime.now().isoformat()
@@ -258,6 +268,7 @@ class ProgressTracker:
         
         # Update operation status
         operation["status"] = ProgressStatus.FAILED.value
+        self.cancel_tokens.pop(operation_id, None)
         operation["end_time"] = datetime.datetime.now().isoformat()
         operation["message"] = f"Failed: {error_message}"
         
@@ -307,6 +318,11 @@ class ProgressTracker:
         operation["end_time"] = datetime.datetime.now().isoformat()
         operation["message"] = "Cancelled"
         
+        # Stop the command running the operation at its next cancellation check
+        token = self.cancel_tokens.pop(operation_id, None)
+        if token is not None:
+            token.cancel(f"Operation cancelled: {operation['name']}")
+        
         # Calculate final elapsed time
         start_time = datetime.datetime.fromisoformat(operation["start_time"])
         end_time = datetime.datetime.fromisoformat(operation["end_time"])
@@ -334,6 +350,34 @@ class ProgressTracker:
         
         return operation
     
+    def is_cancelled(self, operation_id: str) -> bool:
+        """
+        Check whether an operation should stop.
+        
+        Long operations call this between chunks of work. An operation whose
+        command was cancelled by the client or ran past its deadline is
+        marked as cancelled here.
+        
+        Args:
+            operation_id: ID of the operation to check
+            
+        Returns:
+            True if the operation was cancelled
+        """
+        operation = self.operations.get(operation_id)
+        if operation is None:
+            return False
+        
+        if operation["status"] == ProgressStatus.CANCELLED.value:
+            return True
+        
+        token = self.cancel_tokens.get(operation_id)
+        if token is not None and token.should_stop and operation["status"] == ProgressStatus.IN_PROGRESS.value:
+            self.cancel_operation(operation_id)
+            return True
+        
+        return False
+    
     def get_operation(self, operation_id: str) -> Dict:
         """
         Get information about an operation.
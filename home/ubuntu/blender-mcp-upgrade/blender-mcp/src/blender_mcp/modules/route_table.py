@@ -0,0 +1,184 @@
+"""
+BlenderMCP Ultimate Cinematic Upgrade - Route Table
+Maps dotted command names to bound callables with precomputed signatures.
+"""
+
+import inspect
+import threading
+import types
+from typing import Callable, Dict, FrozenSet, Mapping, NamedTuple, Optional
+
+# Commands whose average run time is below this many seconds skip progress tracking unless asked for
+PROGRESS_TRACKING_THRESHOLD = 0.001
+
+# Weight of the newest sample in a route's running average duration
+DURATION_SMOOTHING = 0.2
+
+
+class RouteError(LookupError):
+    """Raised when a command name does not resolve to a callable."""
+
+
+class Route(NamedTuple):
+    """A compiled command route."""
+    name: str
+    func: Callable
+    parameters: FrozenSet[str]
+    required: FrozenSet[str]
+    accepts_any: bool
+
+    def validate(self, params: Dict) -> Optional[str]:
+        """
+        Check parameters against the route's signature.
+
+        Args:
+            params: Parameters for the command
+
+        Returns:
+            Error message, or None if the parameters are valid
+        """
+        missing = self.required.difference(params)
+        if missing:
+            return f"Missing parameters for {self.name}: {', '.join(sorted(missing))}"
+
+        if not self.accepts_any:
+            unknown = set(params).difference(self.parameters)
+            if unknown:
+                return f"Unknown parameters for {self.name}: {', '.join(sorted(unknown))}"
+
+        return None
+
+
+def compile_route(name: str, func: Callable) -> Route:
+    """
+    Compile a route from a callable's signature.
+
+    Args:
+        name: Full dotted command name
+        func: Bound callable handling the command
+
+    Returns:
+        Compiled route
+    """
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        # No introspectable signature; accept anything and let the call fail
+        return Route(name, func, frozenset(), frozenset(), True)
+
+    parameters = set()
+    required = set()
+    accepts_any = False
+
+    for parameter in signature.parameters.values():
+        if parameter.kind == parameter.VAR_KEYWORD:
+            accepts_any = True
+        elif parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY):
+            parameters.add(parameter.name)
+            if parameter.default is parameter.empty:
+                required.add(parameter.name)
+
+    return Route(name, func, frozenset(parameters), frozenset(required), accepts_any)
+
+
+class RouteTable:
+    """
+    Compiled routes for a nested module dict.
+
+    Routes are compiled the first time a command is routed and never change
+    afterwards, so lazily loaded subsystems are only imported when one of
+    their commands is used. `compile_all` compiles every route up front.
+    """
+
+    def __init__(self, modules: Dict):
+        self.modules = modules
+        self._routes: Dict[str, Route] = {}
+        self._durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def routes(self) -> Mapping[str, Route]:
+        """Read-only view of the routes compiled so far."""
+        return types.MappingProxyType(self._routes)
+
+    def get(self, command: str) -> Route:
+        """
+        Get the compiled route for a command.
+
+        Args:
+            command: Dotted command name, e.g. "rendering.post_processing.add_bloom"
+
+        Returns:
+            Compiled route
+
+        Raises:
+            RouteError: If the command does not resolve to a callable
+        """
+        route = self._routes.get(command)
+        if route is None:
+            route = self._resolve(command)
+            with self._lock:
+                route = self._routes.setdefault(command, route)
+        return route
+
+    def _resolve(self, command: str) -> Route:
+        """Walk the module dict to the callable for a command."""
+        command_parts = command.split('.')
+        if len(command_parts) < 2:
+            raise RouteError(f"Invalid command format: {command}")
+
+        module_name = command_parts[0]
+        function_name = command_parts[-1]
+
+        if module_name not in self.modules:
+            raise RouteError(f"Module not found: {module_name}")
+
+        module = self.modules[module_name]
+        for submodule in command_parts[1:-1]:
+            if not isinstance(module, dict) or submodule not in module:
+                raise RouteError(f"Submodule not found: {submodule}")
+            module = module[submodule]
+
+        func = None if function_name.startswith('_') else getattr(module, function_name, None)
+        if not callable(func):
+            raise RouteError(f"Function not found: {function_name}")
+
+        return compile_route(command, func)
+
+    def compile_all(self) -> Mapping[str, Route]:
+        """
+        Compile the routes of every public callable in every module.
+
+        Returns:
+            Read-only view of all routes
+        """
+        def walk(module, prefix):
+            if isinstance(module, dict):
+                for name, submodule in module.items():
+                    walk(submodule, f"{prefix}.{name}")
+                return
+
+            for attr_name in dir(module):
+                if not attr_name.startswith('_') and callable(getattr(module, attr_name)):
+                    self.get(f"{prefix}.{attr_name}")
+
+        for module_name, module in self.modules.items():
+            walk(module, module_name)
+
+        return self.routes
+
+    def record_duration(self, command: str, seconds: float) -> None:
+        """Update a command's running average duration."""
+        average = self._durations.get(command)
+        self._durations[command] = seconds if average is None else (
+            average + DURATION_SMOOTHING * (seconds - average)
+        )
+
+    def average_duration(self, command: str) -> Optional[float]:
+        """A command's running average duration in seconds, if it has run."""
+        return self._durations.get(command)
+
+    def is_fast(self, command: str) -> bool:
+        """Whether a command is known to finish below the progress tracking threshold."""
+        average = self._durations.get(command)
+        return average is not None and average < PROGRESS_TRACKING_THRESHOLD
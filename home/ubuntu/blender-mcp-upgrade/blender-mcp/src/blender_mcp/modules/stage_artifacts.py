@@ -0,0 +1,115 @@
+"""
+BlenderMCP Ultimate Cinematic Upgrade - Stage Artifacts
+Saves the datablocks a pipeline stage created to a .blend library in the
+stage cache, and appends them again when the stage's output is reused.
+"""
+
+import bpy
+import json
+import os
+from typing import Any, Dict, List
+
+from blender_mcp.pipeline import StageArtifacts
+
+# File names inside a stage cache entry
+LIBRARY_FILE = "stage.blend"
+CONTENTS_FILE = "contents.json"
+
+
+class BlendLibraryArtifacts(StageArtifacts):
+    """
+    Captures the objects, worlds and actions a stage added to the file.
+
+    Objects are linked back into the collections they were in, the scene's
+    world is reassigned if the stage replaced it, and new actions are
+    reassigned to the objects they animated, which may come from an earlier
+    stage.
+    """
+
+    def begin(self) -> Dict[str, Any]:
+        return {
+            "objects": set(bpy.data.objects.keys()),
+            "worlds": set(bpy.data.worlds.keys()),
+            "actions": set(bpy.data.actions.keys())
+        }
+
+    def save(self, state: Dict[str, Any], directory: str) -> None:
+        objects = [obj for obj in bpy.data.objects if obj.name not in state["objects"]]
+        worlds = [world for world in bpy.data.worlds if world.name not in state["worlds"]]
+        actions = [action for action in bpy.data.actions if action.name not in state["actions"]]
+
+        scene = bpy.context.scene
+        contents = {
+            "objects": {obj.name: [collection.name for collection in obj.users_collection] for obj in objects},
+            "worlds": [world.name for world in worlds],
+            "scene_world": scene.world.name if scene.world in worlds else None,
+            "animated": {
+                obj.name: obj.animation_data.action.name
+                for obj in bpy.data.objects
+                if obj.animation_data and obj.animation_data.action in actions
+            },
+            "actions": [action.name for action in actions]
+        }
+
+        bpy.data.libraries.write(os.path.join(directory, LIBRARY_FILE), set(objects + worlds + actions), fake_user=True)
+        with open(os.path.join(directory, CONTENTS_FILE), "w") as f:
+            json.dump(contents, f)
+
+    def restore(self, directory: str) -> None:
+        with open(os.path.join(directory, CONTENTS_FILE), "r") as f:
+            contents = json.load(f)
+
+        existing = set(bpy.data.objects.keys())
+
+        with bpy.data.libraries.load(os.path.join(directory, LIBRARY_FILE), link=False) as (data_from, data_to):
+            data_to.objects = list(contents["objects"])
+            data_to.worlds = contents["worlds"]
+            data_to.actions = contents["actions"]
+
+        self._merge_dependencies(existing, set(contents["objects"]))
+
+        scene = bpy.context.scene
+        for obj in data_to.objects:
+            if obj is None:
+                continue
+            collections = [bpy.data.collections.get(name) for name in contents["objects"].get(obj.name, [])]
+            collections = [collection for collection in collections if collection is not None] or [scene.collection]
+            for collection in collections:
+                if obj.name not in collection.objects:
+                    collection.objects.link(obj)
+
+        if contents["scene_world"] and contents["scene_world"] in bpy.data.worlds:
+            scene.world = bpy.data.worlds[contents["scene_world"]]
+
+        for object_name, action_name in contents["animated"].items():
+            obj = bpy.data.objects.get(object_name)
+            action = bpy.data.actions.get(action_name)
+            if obj is None or action is None:
+                continue
+            if obj.animation_data is None:
+                obj.animation_data_create()
+            obj.animation_data.action = action
+
+    @staticmethod
+    def _merge_dependencies(existing: set, requested: set) -> None:
+        """
+        Replace objects appended only because a restored object references
+        them (e.g. a camera's track target) with the objects already in the
+        scene that they were copied from.
+        """
+        duplicates: List = []
+        for obj in bpy.data.objects:
+            if obj.name in existing or obj.name in requested:
+                continue
+            original_name = obj.name.rsplit('.', 1)[0]
+            original = bpy.data.objects.get(original_name)
+            if original is not None and original_name in existing:
+                obj.user_remap(original)
+                duplicates.append(obj)
+
+        for obj in duplicates:
+            bpy.data.objects.remove(obj)
+
+
+# Artifacts shared by the cinematic sequence stages
+blend_library_artifacts = BlendLibraryArtifacts()
@@ -0,0 +1,397 @@
+"""
+BlenderMCP OpenMetrics exporter.
+
+`MetricsExporter` serves the text exposition format on
+`http://<host>:<port>/metrics` from its own thread, for Prometheus to scrape.
+It runs in the addon (started by `AddonSocketServer` when given a metrics
+port) and in the MCP server (`BLENDER_MCP_METRICS_PORT`).
+
+Collectors read counters the rest of the code already keeps. None of them
+touch `bpy`: datablock counts are refreshed by a cheap job on Blender's main
+thread, requested by the scrape but never waited for, and the scrape reports
+the latest counts.
+"""
+
+import http.server
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
+
+from blender_mcp.metrics import Histogram, MetricsRegistry
+
+logger = logging.getLogger("BlenderMCPMetrics")
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Metric name prefix
+NAMESPACE = "blendermcp"
+
+# Environment variable enabling the exporter, e.g. "9877" or "0.0.0.0:9877"
+METRICS_PORT_ENV = "BLENDER_MCP_METRICS_PORT"
+
+# Datablock collections counted for the datablock gauge
+DATABLOCK_COLLECTIONS = (
+    "objects", "meshes", "materials", "images", "textures", "actions",
+    "armatures", "cameras", "lights", "worlds", "node_groups", "collections"
+)
+
+# Seconds between datablock count refreshes requested by scrapes
+DATABLOCK_REFRESH_INTERVAL = 5.0
+
+Labels = Dict[str, str]
+
+
+class MetricFamily:
+    """
+    A metric family: a name, type and help text plus its samples.
+    """
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        self.name = f"{NAMESPACE}_{name}"
+        self.type = metric_type
+        self.help = help_text
+        # (name suffix, labels, value)
+        self.samples: List[Tuple[str, Labels, float]] = []
+
+    def add(self, value: float, labels: Optional[Labels] = None, suffix: str = "") -> "MetricFamily":
+        """Add a sample; returns the family for chaining."""
+        self.samples.append((suffix, labels or {}, value))
+        return self
+
+    def add_histogram(self, histogram: Histogram, labels: Optional[Labels] = None) -> "MetricFamily":
+        """Add the buckets, count and sum of a histogram."""
+        labels = labels or {}
+        for bound, count in zip(histogram.buckets, histogram.cumulative_counts()):
+            self.add(count, dict(labels, le=_format_bound(bound)), "_bucket")
+        self.add(histogram.count, labels, "_count")
+        self.add(histogram.sum, labels, "_sum")
+        return self
+
+
+def gauge(name: str, help_text: str, value: Optional[float] = None) -> MetricFamily:
+    family = MetricFamily(name, "gauge", help_text)
+    return family.add(value) if value is not None else family
+
+
+def counter(name: str, help_text: str, value: Optional[float] = None) -> MetricFamily:
+    family = MetricFamily(name, "counter", help_text)
+    return family.add(value, suffix="_total") if value is not None else family
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render(families: Iterable[MetricFamily]) -> str:
+    """
+    Render metric families in the OpenMetrics text format.
+
+    Args:
+        families: Families to render; families without samples are skipped
+
+    Returns:
+        Exposition text ending with "# EOF"
+    """
+    lines = []
+    for family in families:
+        if not family.samples:
+            continue
+        lines.append(f"# TYPE {family.name} {family.type}")
+        lines.append(f"# HELP {family.name} {_escape(family.help)}")
+        for suffix, labels, value in family.samples:
+            label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            label_text = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{family.name}{suffix}{label_text} {_format_value(value)}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def registry_families(registry: MetricsRegistry, prefix: str = "command",
+                      include_cpu: bool = True) -> List[MetricFamily]:
+    """
+    Latency histograms and error counters from a metrics registry.
+
+    Args:
+        registry: Registry to export
+        prefix: Metric name prefix, e.g. "command" for
+            blendermcp_command_duration_seconds
+        include_cpu: Whether to export CPU time, for registries whose samples have it
+
+    Returns:
+        Metric families labelled by command
+    """
+    latency = MetricFamily(f"{prefix}_duration_seconds", "histogram", f"{prefix.capitalize()} wall time")
+    errors = counter(f"{prefix}_errors", f"{prefix.capitalize()}s that failed")
+    cpu = counter(f"{prefix}_cpu_seconds", f"CPU time of the thread running each {prefix}")
+
+    with registry._lock:
+        # Copy under the lock so buckets, count and sum are consistent
+        commands = [(name, _copy_histogram(command.latency), command.errors, command.cpu_time)
+                    for name, command in registry.commands.items()]
+
+    for name, histogram, error_count, cpu_time in commands:
+        labels = {"command": name}
+        latency.add_histogram(histogram, labels)
+        errors.add(error_count, labels, "_total")
+        cpu.add(cpu_time, labels, "_total")
+
+    return [latency, errors, cpu] if include_cpu else [latency, errors]
+
+
+def _copy_histogram(histogram: Histogram) -> Histogram:
+    copy = Histogram(histogram.buckets)
+    copy.merge(histogram)
+    return copy
+
+
+def scheduler_families(stats: Dict[str, Any]) -> List[MetricFamily]:
+    """Queue depth and job counters from `MainThreadScheduler.get_stats()`."""
+    depth = gauge("queue_depth", "Jobs waiting for Blender's main thread")
+    jobs = counter("scheduler_jobs", "Main-thread jobs by lane and outcome")
+    wait = gauge("scheduler_p95_wait_seconds", "95th percentile queue wait of recent jobs")
+
+    for lane, lane_stats in stats["lanes"].items():
+        depth.add(lane_stats["depth"], {"lane": lane})
+        wait.add(lane_stats["p95_wait_time"], {"lane": lane})
+        for outcome in ("submitted", "completed", "failed", "cancelled"):
+            jobs.add(lane_stats[outcome], {"lane": lane, "outcome": outcome}, "_total")
+
+    return [
+        depth, jobs, wait,
+        counter("scheduler_ticks", "Scheduler timer ticks", stats["ticks"]),
+        counter("scheduler_overrun_ticks", "Ticks that ran past their time budget", stats["overrun_ticks"])
+    ]
+
+
+def cache_families(caches: Dict[str, Dict[str, Any]]) -> List[MetricFamily]:
+    """Hit ratios and lookup counters of caches reporting "hits" and "misses"."""
+    ratio = gauge("cache_hit_ratio", "Cache hits per lookup since startup")
+    lookups = counter("cache_lookups", "Cache lookups by result")
+
+    for name, stats in caches.items():
+        hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+        ratio.add(hits / (hits + misses) if hits + misses else 0.0, {"cache": name})
+        lookups.add(hits, {"cache": name, "result": "hit"}, "_total")
+        lookups.add(misses, {"cache": name, "result": "miss"}, "_total")
+
+    return [ratio, lookups]
+
+
+def pool_families(stats: Dict[str, Any]) -> List[MetricFamily]:
+    """
+    Connection health and in-flight requests from `ConnectionPool.get_stats()`,
+    or per worker from `WorkerRegistry.get_stats()`.
+    """
+    workers = stats["workers"] if "workers" in stats else {"default": stats}
+    healthy = gauge("pool_healthy_connections", "Healthy pooled connections to Blender")
+    in_flight = gauge("pool_in_flight_requests", "Requests sent to Blender and not yet answered")
+    reconnects = counter("pool_reconnects", "Reconnects of pooled connections")
+    timeouts = counter("pool_checkout_timeouts", "Checkouts that timed out waiting for a connection")
+    worker_healthy = gauge("worker_healthy", "Whether the worker is taking new sessions (1) or not (0)")
+
+    for name, worker in workers.items():
+        labels = {"worker": name}
+        healthy.add(worker["healthy"], labels)
+        in_flight.add(worker["in_flight"], labels)
+        reconnects.add(worker["reconnects"], labels, "_total")
+        timeouts.add(worker["checkout_timeouts"], labels, "_total")
+        if "worker_healthy" in worker:
+            worker_healthy.add(worker["worker_healthy"], labels)
+
+    families = [healthy, in_flight, reconnects, timeouts]
+    if "workers" in stats:
+        families.append(worker_healthy)
+    return families
+
+
+def process_resident_memory() -> Optional[int]:
+    """Resident set size of this process in bytes, if it can be determined."""
+    psutil = sys.modules.get("psutil")
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def process_families() -> List[MetricFamily]:
+    """Resident memory of this process (Blender's RSS in the addon)."""
+    rss = process_resident_memory()
+    return [gauge("process_resident_memory_bytes", "Resident memory of the process", rss)] if rss is not None else []
+
+
+def progress_families() -> List[MetricFamily]:
+    """Active operations of the progress tracker, if the addon has loaded it."""
+    module = sys.modules.get("blender_mcp.modules.progress_tracking")
+    if module is None:
+        return []
+
+    statuses: Dict[str, int] = {}
+    for operation in list(module.progress_tracker.operations.values()):
+        status = operation.get("status")
+        status = getattr(status, "value", status)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    active = gauge("active_operations", "Operations in progress", statuses.get("in_progress", 0))
+    by_status = gauge("operations", "Tracked operations by status")
+    for status, count in statuses.items():
+        by_status.add(count, {"status": str(status)})
+    return [active, by_status]
+
+
+class DatablockCounts:
+    """
+    Datablock counts of the open file, refreshed on Blender's main thread.
+    """
+
+    def __init__(self, schedule: Callable[[Callable[[], None]], None],
+                 refresh_interval: float = DATABLOCK_REFRESH_INTERVAL):
+        """
+        Args:
+            schedule: Runs a callback on Blender's main thread
+            refresh_interval: Minimum seconds between refreshes
+        """
+        self.schedule = schedule
+        self.refresh_interval = refresh_interval
+        self.counts: Dict[str, int] = {}
+        self.refreshed_at = 0.0
+        self._pending = False
+
+    def refresh(self) -> None:
+        """Count the datablocks; must run on the main thread."""
+        self._pending = False
+        bpy = sys.modules.get("bpy")
+        if bpy is None:
+            return
+        self.counts = {
+            name: len(getattr(bpy.data, name)) for name in DATABLOCK_COLLECTIONS if hasattr(bpy.data, name)
+        }
+        self.refreshed_at = time.time()
+
+    def request_refresh(self) -> None:
+        """Ask the main thread for fresh counts unless they are recent or already requested."""
+        if self._pending or time.time() - self.refreshed_at < self.refresh_interval:
+            return
+        if "bpy" not in sys.modules:
+            return
+        self._pending = True
+        self.schedule(self.refresh)
+
+    def families(self) -> List[MetricFamily]:
+        self.request_refresh()
+        if not self.counts:
+            return []
+        family = gauge("datablocks", "Datablocks in the open file by type")
+        for name, count in self.counts.items():
+            family.add(count, {"type": name})
+        return [family, gauge("datablocks_age_seconds", "Seconds since the datablock counts were taken",
+                              time.time() - self.refreshed_at)]
+
+
+class MetricsExporter:
+    """
+    HTTP endpoint serving OpenMetrics text from a background thread.
+    """
+
+    def __init__(self, collectors: Iterable[Callable[[], List[MetricFamily]]],
+                 host: str = "127.0.0.1", port: int = 9877):
+        """
+        Args:
+            collectors: Callables returning metric families, called on each scrape
+            host: Interface to listen on; local only by default
+            port: Port to listen on; 0 picks a free port
+        """
+        self.collectors = list(collectors)
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self.httpd = None
+        self.thread = None
+
+    def collect(self) -> str:
+        """Run every collector and render the result; failing collectors are skipped."""
+        families = []
+        for collector in self.collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.warning(f"Error collecting metrics from {getattr(collector, '__name__', collector)}: {str(e)}")
+        self.scrapes += 1
+        families.append(counter("metrics_scrapes", "Scrapes served by this exporter", self.scrapes))
+        return render(families)
+
+    def start(self) -> None:
+        """Start serving in a daemon thread."""
+        if self.httpd is not None:
+            return
+
+        exporter = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.collect().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="BlenderMCPMetrics", daemon=True)
+        self.thread.start()
+        logger.info(f"BlenderMCP metrics served on http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self.httpd is None:
+            return
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.httpd = None
+        self.thread = None
+
+
+def parse_metrics_address(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """
+    Parse a metrics address such as "9877" or "0.0.0.0:9877".
+
+    Args:
+        value: Address, or None/empty for no exporter
+
+    Returns:
+        (host, port), or None
+    """
+    if not value:
+        return None
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
@@ -0,0 +1,656 @@
+"""
+BlenderMCP stage graph executor.
+
+Long commands such as `create_cinematic_sequence` are expressed as a graph of
+stages with dependencies instead of a fixed sequence, so independent work
+overlaps:
+
+- `IO` stages (downloads, API searches) run in a thread pool sized for
+  waiting on the network.
+- `CPU` stages (prompt analysis, heightfields, lookup tables) run in a thread
+  pool with one worker per core. They must not touch `bpy`.
+- `MAIN` stages touch `bpy` and run one at a time on the thread driving the
+  graph, Blender's main thread, as soon as their inputs are ready.
+
+`PipelineExecutor.execute` is a generator that yields while it waits for
+worker stages, so the main-thread scheduler keeps serving other commands in
+the meantime; `run` drives it to completion in one go. Both report per-stage
+timings and the critical path of the run.
+
+Stages that declare their parameters are content addressed: a stage's key
+hashes its name, parameters and the keys of its dependencies, so changing
+one parameter changes the keys of that stage and everything downstream of
+it. Given a `StageCache`, the executor reuses the stored result of every
+stage whose key is unchanged. MAIN stages change the scene rather than just
+returning a result, so they are only memoized with `StageArtifacts` that
+save and restore what they changed.
+
+`plan` walks a graph without running it: every stage's `estimate` reports
+its expected cost, cached stages are costed as restores, and the main-thread
+serialization is simulated to estimate the wall time of a real run.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from blender_mcp.cancellation import activate, check_cancelled, current_token
+from blender_mcp.scheduler import run_to_completion
+
+MAIN = "main"
+IO = "io"
+CPU = "cpu"
+
+STAGE_KINDS = (MAIN, IO, CPU)
+
+# Threads for IO stages; downloads mostly wait on the network
+DEFAULT_IO_WORKERS = 8
+
+# Seconds to wait for a worker stage before yielding to the scheduler
+DEFAULT_POLL_INTERVAL = 0.005
+
+# Memoized stage outputs are stored here, one directory per stage key
+STAGE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "blendermcp_stage_cache")
+
+# Stage outputs kept on disk; the least recently used are removed first
+DEFAULT_MAX_CACHE_ENTRIES = 256
+
+# Bump when the cache entry layout changes so old entries are ignored
+STAGE_CACHE_FORMAT = 1
+
+# Cost fields of a stage estimate; missing fields count as zero
+COST_FIELDS = ("seconds", "memory_bytes", "disk_bytes", "download_bytes")
+
+# Seconds to append a memoized MAIN stage's library back into the scene
+RESTORE_SECONDS = 0.05
+
+
+class StageArtifacts:
+    """
+    Saves and restores what a MAIN stage changed besides its result, so the
+    stage can be memoized. The base class saves nothing.
+    """
+
+    def begin(self) -> Any:
+        """Called before the stage runs; returns state passed on to `save`."""
+        return None
+
+    def save(self, state: Any, directory: str) -> None:
+        """Write what the stage changed since `begin` into a cache entry directory."""
+
+    def restore(self, directory: str) -> None:
+        """Reapply what `save` wrote, instead of running the stage."""
+
+
+class Stage:
+    """
+    A node of a stage graph.
+
+    `func` receives a dict mapping each dependency's name to its result and
+    returns the stage's result.
+    """
+
+    __slots__ = ("name", "func", "kind", "deps", "index", "params", "memoize", "artifacts", "estimate")
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], kind: str, deps: Iterable[str], index: int,
+                 params: Optional[Dict[str, Any]] = None, memoize: bool = True,
+                 artifacts: Optional[StageArtifacts] = None,
+                 estimate: Optional[Callable[[], Dict[str, float]]] = None):
+        self.name = name
+        self.func = func
+        self.kind = kind
+        self.deps = tuple(deps)
+        self.index = index
+        self.params = params
+        self.memoize = memoize
+        self.artifacts = artifacts
+        self.estimate = estimate
+
+    @property
+    def memoizable(self) -> bool:
+        """Whether the stage's output can be reused from a cache."""
+        if self.params is None or not self.memoize:
+            return False
+        return self.kind != MAIN or self.artifacts is not None
+
+
+def stage_key(stage: Stage, dep_keys: Dict[str, Optional[str]]) -> Optional[str]:
+    """
+    Compute the content address of a stage.
+
+    Args:
+        stage: Stage to address
+        dep_keys: Keys of the stage's dependencies
+
+    Returns:
+        Hex digest, or None if the stage or one of its dependencies does not
+        declare its parameters
+    """
+    if stage.params is None:
+        return None
+
+    deps = {}
+    for dep in stage.deps:
+        if dep_keys.get(dep) is None:
+            return None
+        deps[dep] = dep_keys[dep]
+
+    payload = json.dumps({
+        "format": STAGE_CACHE_FORMAT,
+        "stage": stage.name,
+        "kind": stage.kind,
+        "params": stage.params,
+        "deps": deps
+    }, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class StageCache:
+    """
+    On-disk store of stage outputs keyed by content address.
+
+    Each entry is a directory holding `metadata.json` with the stage's result
+    plus whatever the stage's artifacts saved, such as appended .blend
+    libraries or baked caches.
+    """
+
+    def __init__(self, directory: str = STAGE_CACHE_DIR, max_entries: int = DEFAULT_MAX_CACHE_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        """Directory of a cache entry."""
+        return os.path.join(self.directory, key)
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cache entry.
+
+        Args:
+            key: Stage key
+
+        Returns:
+            Entry metadata with the stage's "result", or None on a miss
+        """
+        metadata_path = os.path.join(self.path(key), "metadata.json")
+        try:
+            with open(metadata_path, "r") as f:
+                metadata = json.load(f)
+            # Mark the entry as recently used for pruning
+            os.utime(metadata_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return metadata
+
+    def store(self, key: str, stage_name: str, result: Any, save: Optional[Callable[[str], None]] = None) -> bool:
+        """
+        Store a stage's output.
+
+        Args:
+            key: Stage key
+            stage_name: Stage name, for diagnostics
+            result: Stage result; must be JSON serializable
+            save: Writes additional files into the entry directory
+
+        Returns:
+            Whether the output was stored
+        """
+        temp_directory = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_directory = tempfile.mkdtemp(prefix=f".{key}.", dir=self.directory)
+            if save is not None:
+                save(temp_directory)
+            with open(os.path.join(temp_directory, "metadata.json"), "w") as f:
+                json.dump({"stage": stage_name, "result": result, "created": time.time()}, f)
+
+            # Publish the complete entry at once; another process may have won the race
+            try:
+                os.rename(temp_directory, self.path(key))
+                temp_directory = None
+            except OSError:
+                pass
+        except Exception as e:
+            print(f"Could not cache stage {stage_name}: {str(e)}")
+            return False
+        finally:
+            if temp_directory is not None:
+                shutil.rmtree(temp_directory, ignore_errors=True)
+
+        self.stores += 1
+        self.prune()
+        return True
+
+    def prune(self) -> None:
+        """Remove the least recently used entries beyond `max_entries`."""
+        with self._lock:
+            try:
+                entries = [entry for entry in os.scandir(self.directory) if entry.is_dir() and not entry.name.startswith('.')]
+            except OSError:
+                return
+
+            if len(entries) <= self.max_entries:
+                return
+
+            def last_used(entry):
+                try:
+                    return os.stat(os.path.join(entry.path, "metadata.json")).st_mtime
+                except OSError:
+                    return 0.0
+
+            entries.sort(key=last_used)
+            for entry in entries[:len(entries) - self.max_entries]:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def get_stats(self) -> Dict:
+        """Get cache hit and store counts."""
+        return {
+            "directory": self.directory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores
+        }
+
+
+class StageGraph:
+    """
+    Stages and their dependencies. Dependencies must be added before the
+    stages that use them, so a graph can never contain a cycle.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+
+    def add(self, name: str, func: Callable[[Dict[str, Any]], Any], kind: str = MAIN, deps: Iterable[str] = (),
+            params: Optional[Dict[str, Any]] = None, memoize: bool = True,
+            artifacts: Optional[StageArtifacts] = None,
+            estimate: Optional[Callable[[], Dict[str, float]]] = None) -> None:
+        """
+        Add a stage.
+
+        Args:
+            name: Unique stage name
+            func: Called with the results of the dependencies, keyed by stage name
+            kind: Where the stage runs: MAIN, IO or CPU
+            deps: Names of the stages whose results this stage needs
+            params: Everything besides its dependencies that the stage's output
+                depends on; None leaves the stage and its dependents unaddressed
+            memoize: Reuse cached output; False still addresses the stage for
+                its dependents but always runs it
+            artifacts: Saves and restores a MAIN stage's scene changes
+            estimate: Returns the stage's expected cost for `plan`, with any of
+                the COST_FIELDS; must not touch the scene
+        """
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"Unknown stage kind: {kind}")
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+
+        deps = tuple(deps)
+        unknown = [dep for dep in deps if dep not in self.stages]
+        if unknown:
+            raise ValueError(f"Stage {name} depends on unknown stages: {', '.join(unknown)}")
+
+        self.stages[name] = Stage(name, func, kind, deps, len(self.stages), params, memoize, artifacts, estimate)
+
+    def dependents(self) -> Dict[str, List[str]]:
+        """Map each stage to the stages that depend on it."""
+        dependents = {name: [] for name in self.stages}
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                dependents[dep].append(stage.name)
+        return dependents
+
+
+def critical_path(graph: StageGraph, timings: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Find the chain of stages that determined a run's wall time.
+
+    Starting from the stage that finished last, follows the dependency that
+    finished last at each step.
+
+    Args:
+        graph: Graph that was run
+        timings: Per-stage timings reported by the executor
+
+    Returns:
+        Stages on the critical path in execution order, each with the time it
+        waited after its inputs were ready and the time it ran
+    """
+    if not timings:
+        return []
+
+    path = []
+    name = max(timings, key=lambda stage_name: timings[stage_name]["end"])
+    while name is not None:
+        timing = timings[name]
+        path.append({
+            "stage": name,
+            "kind": timing["kind"],
+            "wait": timing["wait"],
+            "duration": timing["duration"]
+        })
+        deps = graph.stages[name].deps
+        name = max(deps, key=lambda dep: timings[dep]["end"]) if deps else None
+
+    path.reverse()
+    return path
+
+
+def plan(graph: StageGraph, cache: Optional[StageCache] = None) -> Dict[str, Any]:
+    """
+    Estimate what running a graph would cost, without running any stage.
+
+    Worker stages are assumed to start as soon as their inputs are ready;
+    MAIN stages are simulated one at a time in the order the executor would
+    pick them. Memory is what the stages add to the scene, so it is summed.
+
+    Args:
+        graph: Stages to plan
+        cache: Stages with a cached output are costed as restores
+
+    Returns:
+        Dict with per-stage costs and simulated start/end times, the critical
+        path and the totals
+    """
+    keys: Dict[str, Optional[str]] = {}
+    costs: Dict[str, Dict[str, Any]] = {}
+
+    for stage in graph.stages.values():
+        keys[stage.name] = key = stage_key(stage, keys)
+        cached = (cache is not None and key is not None and stage.memoizable
+                  and os.path.exists(os.path.join(cache.path(key), "metadata.json")))
+
+        estimate = stage.estimate() if stage.estimate is not None else {}
+        cost = {field: float(estimate.get(field, 0.0)) for field in COST_FIELDS}
+        if cached:
+            # Only the appended library is loaded; nothing is downloaded or written
+            cost.update(seconds=RESTORE_SECONDS if stage.kind == MAIN else 0.0, disk_bytes=0.0, download_bytes=0.0)
+            if stage.kind != MAIN:
+                cost["memory_bytes"] = 0.0
+        cost.update(kind=stage.kind, cached=cached)
+        costs[stage.name] = cost
+
+    # Simulate the schedule
+    timings: Dict[str, Dict[str, Any]] = {}
+    main_free = 0.0
+    while len(timings) < len(graph.stages):
+        progressed = True
+        while progressed:
+            progressed = False
+            for stage in graph.stages.values():
+                if stage.name in timings or stage.kind == MAIN or any(dep not in timings for dep in stage.deps):
+                    continue
+                ready = max((timings[dep]["end"] for dep in stage.deps), default=0.0)
+                timings[stage.name] = {"kind": stage.kind, "ready": ready, "start": ready, "wait": 0.0,
+                                       "end": ready + costs[stage.name]["seconds"],
+                                       "duration": costs[stage.name]["seconds"]}
+                progressed = True
+
+        candidates = [stage for stage in graph.stages.values()
+                      if stage.name not in timings and stage.kind == MAIN
+                      and all(dep in timings for dep in stage.deps)]
+        if not candidates:
+            if len(timings) < len(graph.stages):
+                raise RuntimeError("Stage graph stalled with unfinished stages")
+            break
+
+        def start_time(candidate):
+            return max([timings[dep]["end"] for dep in candidate.deps] + [main_free])
+
+        stage = min(candidates, key=lambda candidate: (start_time(candidate), candidate.index))
+        ready = max((timings[dep]["end"] for dep in stage.deps), default=0.0)
+        started = max(ready, main_free)
+        main_free = started + costs[stage.name]["seconds"]
+        timings[stage.name] = {"kind": stage.kind, "ready": ready, "start": started, "wait": started - ready,
+                               "end": main_free, "duration": costs[stage.name]["seconds"]}
+
+    for name, cost in costs.items():
+        cost.update(start=timings[name]["start"], end=timings[name]["end"])
+
+    return {
+        "stages": costs,
+        "critical_path": critical_path(graph, timings),
+        "totals": {
+            "wall_seconds": max((timing["end"] for timing in timings.values()), default=0.0),
+            "stage_seconds": sum(cost["seconds"] for cost in costs.values()),
+            "memory_bytes": sum(cost["memory_bytes"] for cost in costs.values()),
+            "disk_bytes": sum(cost["disk_bytes"] for cost in costs.values()),
+            "download_bytes": sum(cost["download_bytes"] for cost in costs.values()),
+            "cached_stages": sum(1 for cost in costs.values() if cost["cached"])
+        }
+    }
+
+
+class PipelineExecutor:
+    """
+    Runs stage graphs, keeping worker stages off the main thread.
+    """
+
+    def __init__(self, io_workers: int = DEFAULT_IO_WORKERS, cpu_workers: Optional[int] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            io_workers: Threads for IO stages
+            cpu_workers: Threads for CPU stages; defaults to the number of cores
+            poll_interval: Seconds to wait for a worker stage before yielding
+        """
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.poll_interval = poll_interval
+        self._pools: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, kind: str) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            pool = self._pools.get(kind)
+            if pool is None:
+                workers = self.io_workers if kind == IO else self.cpu_workers
+                pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"BlenderMCP{kind.upper()}")
+                self._pools[kind] = pool
+            return pool
+
+    def shutdown(self) -> None:
+        """Stop the worker pools once their running stages finish."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=False)
+
+    def run(self, graph: StageGraph, on_stage_done: Optional[Callable[[str, int, int], None]] = None,
+            cache: Optional[StageCache] = None) -> Dict[str, Any]:
+        """
+        Run a graph to completion on the calling thread.
+
+        Args:
+            graph: Stages to run
+            on_stage_done: Called on the calling thread with the stage name, the
+                number of finished stages and the total after each stage
+            cache: Reuse and store the outputs of memoizable stages
+
+        Returns:
+            Dict with the results, per-stage timings and critical path
+        """
+        return run_to_completion(self.execute(graph, on_stage_done, cache), current_token())
+
+    def execute(self, graph: StageGraph, on_stage_done: Optional[Callable[[str, int, int], None]] = None,
+                cache: Optional[StageCache] = None):
+        """
+        Run a graph, yielding whenever it waits for a worker stage.
+
+        The first failing stage stops the run: stages not started yet are
+        dropped and its exception propagates. The calling command's cancel
+        token is checked between stages and passed on to worker stages.
+
+        Args:
+            graph: Stages to run
+            on_stage_done: Called on the calling thread with the stage name, the
+                number of finished stages and the total after each stage
+            cache: Reuse and store the outputs of memoizable stages
+
+        Returns:
+            Dict with the results, per-stage timings, critical path and the
+            names of the stages whose output came from the cache
+        """
+        token = current_token()
+        dependents = graph.dependents()
+        waiting_for = {name: set(stage.deps) for name, stage in graph.stages.items()}
+        results: Dict[str, Any] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+        ready_at: Dict[str, float] = {}
+        ready_main: List[Stage] = []
+        running: Dict[concurrent.futures.Future, Stage] = {}
+        keys: Dict[str, Optional[str]] = {}
+        cached: Dict[str, Dict[str, Any]] = {}
+
+        start_time = time.perf_counter()
+
+        def make_ready(stage: Stage) -> None:
+            # Ready when the last input finished, even if that is noticed later
+            ready_at[stage.name] = max((timings[dep]["end"] for dep in stage.deps), default=0.0)
+            keys[stage.name] = key = stage_key(stage, keys)
+
+            if cache is not None and key is not None and stage.memoizable:
+                entry = cache.load(key)
+                if entry is not None:
+                    cached[stage.name] = entry
+                    if stage.kind != MAIN:
+                        now = time.perf_counter() - start_time
+                        finish(stage, entry["result"], now, now)
+                        return
+
+            if stage.kind == MAIN:
+                ready_main.append(stage)
+            else:
+                inputs = {dep: results[dep] for dep in stage.deps}
+                future = self._pool(stage.kind).submit(self._run_stage, stage, inputs, token, start_time)
+                running[future] = stage
+
+        def remember(stage: Stage, result: Any, save: Optional[Callable[[str], None]] = None) -> None:
+            key = keys[stage.name]
+            if cache is None or key is None or not stage.memoizable:
+                return
+            if isinstance(result, dict) and result.get("status") == "error":
+                return
+            cache.store(key, stage.name, result, save)
+
+        def finish(stage: Stage, result: Any, started: float, ended: float) -> None:
+            results[stage.name] = result
+            timings[stage.name] = {
+                "kind": stage.kind,
+                "ready": ready_at[stage.name],
+                "start": started,
+                "end": ended,
+                "wait": started - ready_at[stage.name],
+                "duration": ended - started,
+                "cached": stage.name in cached
+            }
+            for name in dependents[stage.name]:
+                waiting_for[name].discard(stage.name)
+                if not waiting_for[name]:
+                    make_ready(graph.stages[name])
+            if on_stage_done is not None:
+                on_stage_done(stage.name, len(results), len(graph.stages))
+
+        def collect(done: Iterable[concurrent.futures.Future]) -> None:
+            for future in done:
+                stage = running.pop(future)
+                result, started, ended = future.result()
+                remember(stage, result)
+                finish(stage, result, started, ended)
+
+        try:
+            for name, deps in waiting_for.items():
+                if not deps:
+                    make_ready(graph.stages[name])
+
+            while len(results) < len(graph.stages):
+                check_cancelled()
+
+                # Start the dependents of worker stages that finished meanwhile first
+                collect([future for future in running if future.done()])
+
+                if ready_main:
+                    # bpy stages run one at a time, in graph order among the ready ones
+                    stage = min(ready_main, key=lambda ready: ready.index)
+                    ready_main.remove(stage)
+                    started = time.perf_counter() - start_time
+                    if stage.name in cached:
+                        entry = cached[stage.name]
+                        stage.artifacts.restore(cache.path(keys[stage.name]))
+                        result = entry["result"]
+                    else:
+                        result = self._run_main_stage(stage, {dep: results[dep] for dep in stage.deps}, remember)
+                    finish(stage, result, started, time.perf_counter() - start_time)
+                    yield
+                    continue
+
+                if not running:
+                    raise RuntimeError("Stage graph stalled with unfinished stages")
+
+                done, _ = concurrent.futures.wait(running, timeout=self.poll_interval,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                collect(done)
+
+                if not done:
+                    yield
+        finally:
+            for future in running:
+                future.cancel()
+
+        wall_time = time.perf_counter() - start_time
+        return {
+            "results": results,
+            "timings": timings,
+            "critical_path": critical_path(graph, timings),
+            "wall_time": wall_time,
+            "stage_time": sum(timing["duration"] for timing in timings.values()),
+            "cached": [name for name in graph.stages if name in cached]
+        }
+
+    @staticmethod
+    def _run_main_stage(stage: Stage, inputs: Dict[str, Any], remember: Callable) -> Any:
+        """Run a MAIN stage, saving its artifacts if it is memoizable."""
+        if stage.artifacts is None:
+            result = stage.func(inputs)
+            remember(stage, result)
+            return result
+
+        state = stage.artifacts.begin()
+        result = stage.func(inputs)
+        remember(stage, result, lambda directory: stage.artifacts.save(state, directory))
+        return result
+
+    @staticmethod
+    def _run_stage(stage: Stage, inputs: Dict[str, Any], token, start_time: float):
+        """Run a worker stage under the calling command's cancel token."""
+        with activate(token):
+            check_cancelled()
+            started = time.perf_counter() - start_time
+            result = stage.func(inputs)
+            return result, started, time.perf_counter() - start_time
+
+
+# Executor shared by the addon's long-running commands
+pipeline_executor = PipelineExecutor()
+
+# Stage output cache shared by the addon's long-running commands
+stage_cache = StageCache()
@@ -0,0 +1,286 @@
+"""
+BlenderMCP connection pool.
+
+Keeps a small set of `AsyncBlenderConnection`s to the addon. Connections are
+pinged periodically, and a connection that fails is taken out of rotation
+and re-established in the background with jittered exponential backoff, so
+callers never race each other to reconnect. Idempotent reads that fail
+because their connection broke are retried transparently on another one.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, Any, List, Optional
+
+from blender_mcp.client import AsyncBlenderConnection, ProgressSubscription
+from blender_mcp.events import DEFAULT_MAX_RATE
+from blender_mcp.protocol import DEFAULT_MAX_FRAME_SIZE
+from blender_mcp.scheduler import INTERACTIVE_COMMANDS
+
+logger = logging.getLogger("BlenderMCPPool")
+
+# Read-only commands that are safe to send again after a connection failure
+IDEMPOTENT_COMMANDS = INTERACTIVE_COMMANDS | {"ping", "get_mesh_vertices"}
+
+
+class PooledConnection:
+    """
+    A pool member and its health state.
+    """
+
+    def __init__(self, index: int, connection: AsyncBlenderConnection):
+        self.index = index
+        self.connection = connection
+        self.healthy = False
+        self.failures = 0
+        self.reconnect_task: Optional[asyncio.Task] = None
+
+
+class ConnectionPool:
+    """
+    Health-checked pool of connections to the Blender addon.
+    """
+
+    def __init__(self, host: str, port: int, size: int = 2,
+                 max_frame_size: int = DEFAULT_MAX_FRAME_SIZE, unix_path: Optional[str] = None,
+                 health_check_interval: float = 5.0, health_check_timeout: float = 2.0,
+                 backoff_base: float = 0.1, backoff_max: float = 10.0,
+                 checkout_timeout: float = 10.0, max_retries: int = 2,
+                 connection_factory: Callable[[], AsyncBlenderConnection] = None):
+        """
+        Args:
+            host: Addon host
+            port: Addon port
+            size: Number of connections to keep open
+            max_frame_size: Largest accepted frame
+            unix_path: Connect over this Unix domain socket instead of TCP
+            health_check_interval: Seconds between pings of each connection
+            health_check_timeout: Seconds a ping may take before the connection is considered dead
+            backoff_base: Delay before the first reconnect attempt
+            backoff_max: Cap on the reconnect delay
+            checkout_timeout: Seconds to wait for a healthy connection
+            max_retries: Retries of an idempotent command after connection failures
+            connection_factory: Creates pool members; defaults to `AsyncBlenderConnection`
+        """
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.checkout_timeout = checkout_timeout
+        self.max_retries = max_retries
+
+        factory = connection_factory or (
+            lambda: AsyncBlenderConnection(host, port, max_frame_size, unix_path=unix_path)
+        )
+        self.members: List[PooledConnection] = [PooledConnection(index, factory()) for index in range(size)]
+
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.checkout_timeouts = 0
+        self.retries = 0
+        self.failed_health_checks = 0
+
+        self._available = asyncio.Condition()
+        self._health_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._random = random.Random()
+
+    @property
+    def connected(self) -> bool:
+        """Whether at least one connection is healthy."""
+        return any(member.healthy for member in self.members)
+
+    async def connect(self) -> bool:
+        """
+        Open the pool's connections and start health checking.
+
+        Connections that cannot be opened are retried in the background.
+
+        Returns:
+            Whether at least one connection is healthy
+        """
+        self._closed = False
+        await asyncio.gather(*(self._open(member) for member in self.members))
+
+        if self._health_task is None:
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop())
+
+        return self.connected
+
+    async def disconnect(self) -> None:
+        """Stop health checks and reconnects and close every connection."""
+        self._closed = True
+
+        tasks = [self._health_task] + [member.reconnect_task for member in self.members]
+        for task in tasks:
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._health_task = None
+
+        for member in self.members:
+            member.reconnect_task = None
+            member.healthy = False
+            await member.connection.disconnect()
+
+    async def _open(self, member: PooledConnection) -> None:
+        """Try to open a member once, scheduling background reconnects on failure."""
+        if await member.connection.connect():
+            await self._mark_healthy(member)
+        else:
+            self._mark_failed(member)
+
+    async def _mark_healthy(self, member: PooledConnection) -> None:
+        member.healthy = True
+        member.failures = 0
+        async with self._available:
+            self._available.notify_all()
+
+    def _mark_failed(self, member: PooledConnection) -> None:
+        """Take a member out of rotation and reconnect it in the background."""
+        member.healthy = False
+        if self._closed or (member.reconnect_task is not None and not member.reconnect_task.done()):
+            return
+        member.reconnect_task = asyncio.get_running_loop().create_task(self._reconnect(member))
+
+    def backoff_delay(self, failures: int) -> float:
+        """
+        Get the delay before the next reconnect attempt.
+
+        Exponential in the number of consecutive failures, capped, with
+        jitter so the members (and other clients) do not reconnect in lockstep.
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** failures))
+        return delay / 2 + self._random.uniform(0, delay / 2)
+
+    async def _reconnect(self, member: PooledConnection) -> None:
+        """Reconnect a member with jittered exponential backoff until it succeeds."""
+        await member.connection.disconnect()
+
+        while not self._closed:
+            await asyncio.sleep(self.backoff_delay(member.failures))
+            member.failures += 1
+
+            if await member.connection.connect():
+                logger.info(f"Pool connection {member.index} re-established after {member.failures} attempt(s)")
+                await self._mark_healthy(member)
+                return
+
+    async def _health_loop(self) -> None:
+        """Ping every healthy member periodically."""
+        while not self._closed:
+            await asyncio.sleep(self.health_check_interval)
+            await asyncio.gather(*(self._check(member) for member in self.members if member.healthy))
+
+    async def _check(self, member: PooledConnection) -> None:
+        """Ping a member and take it out of rotation if it does not answer."""
+        try:
+            await member.connection.send_command("ping", timeout=self.health_check_timeout)
+        except Exception as e:
+            self.failed_health_checks += 1
+            logger.warning(f"Pool connection {member.index} failed its health check: {str(e)}")
+            self._mark_failed(member)
+
+    async def checkout(self) -> PooledConnection:
+        """
+        Get the healthy member with the fewest requests in flight.
+
+        Waits up to `checkout_timeout` seconds for a member to become healthy.
+        """
+        start = time.perf_counter()
+        deadline = start + self.checkout_timeout
+
+        async with self._available:
+            while True:
+                for member in self.members:
+                    if member.healthy and not member.connection.connected:
+                        # The read loop saw the connection drop since the last check
+                        self._mark_failed(member)
+
+                healthy = [member for member in self.members if member.healthy]
+                if healthy:
+                    break
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self.checkout_timeouts += 1
+                    raise ConnectionError("No healthy connection to Blender available")
+
+                try:
+                    await asyncio.wait_for(self._available.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+        waited = time.perf_counter() - start
+        self.checkouts += 1
+        self.checkout_wait_total += waited
+        self.checkout_wait_max = max(self.checkout_wait_max, waited)
+
+        return min(healthy, key=lambda member: member.connection.in_flight)
+
+    async def run(self, operation: Callable[[AsyncBlenderConnection], Awaitable[Any]], idempotent: bool = False) -> Any:
+        """
+        Run an operation on a pooled connection.
+
+        Args:
+            operation: Coroutine function taking the connection to use
+            idempotent: Retry on another connection if this one breaks
+
+        Returns:
+            The operation's result
+        """
+        attempts = 1 + (self.max_retries if idempotent else 0)
+
+        for attempt in range(attempts):
+            member = await self.checkout()
+            try:
+                return await operation(member.connection)
+            except ConnectionError:
+                self._mark_failed(member)
+                if attempt + 1 >= attempts:
+                    raise
+                self.retries += 1
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None,
+                           timeout: Optional[float] = None, session: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send a command on a pooled connection, retrying idempotent reads on connection failures.
+
+        `session` is accepted for compatibility with `WorkerRegistry.send_command`
+        and ignored: every pooled connection reaches the same Blender instance.
+        """
+        return await self.run(
+            lambda connection: connection.send_command(command_type, params, timeout),
+            idempotent=command_type in IDEMPOTENT_COMMANDS
+        )
+
+    async def subscribe_progress(self, max_rate: Optional[float] = DEFAULT_MAX_RATE) -> ProgressSubscription:
+        """Subscribe to progress events on one of the pool's connections."""
+        return await self.run(lambda connection: connection.subscribe_progress(max_rate))
+
+    async def cancel_all(self, reason: str = "Cancelled by client") -> int:
+        """Cancel every unfinished command on the addon; returns how many were flagged."""
+        return await self.run(lambda connection: connection.cancel_all(reason), idempotent=True)
+
+    def get_stats(self) -> Dict:
+        """
+        Get pool health and checkout metrics.
+
+        Returns:
+            Dict with pool size, healthy members, checkout wait times, retries and reconnects
+        """
+        return {
+            "size": self.size,
+            "healthy": sum(1 for member in self.members if member.healthy),
+            "in_flight": sum(member.connection.in_flight for member in self.members),
+            "checkouts": self.checkouts,
+            "average_checkout_wait": self.checkout_wait_total / self.checkouts if self.checkouts else 0.0,
+            "max_checkout_wait": self.checkout_wait_max,
+            "checkout_timeouts": self.checkout_timeouts,
+            "retries": self.retries,
+            "failed_health_checks": self.failed_health_checks,
+            "reconnects": sum(member.connection.reconnects for member in self.members)
+        }
@@ -0,0 +1,287 @@
+"""
+BlenderMCP sampling profiler.
+
+Profiles selected commands by taking snapshots of the running thread's stack
+from a helper thread every few milliseconds (`sys._current_frames`). This
+shows where a slow command spends its time, whether in bpy operators,
+depsgraph updates or our own Python. Commands are selected by name, by a
+"profile" flag in the command envelope, or by sampling 1 in N commands.
+
+Each profile is written as a collapsed-stack file ("frame;frame;frame count"
+per line) that flamegraph.pl, speedscope and similar tools read directly.
+
+Profiling is off by default. While nothing is selected, `call` costs one
+attribute check and the helper thread is not even started. Stacks are only
+sampled while Python code runs: a C call that holds the GIL, such as most bpy
+operators, delays the next sample until it returns, so its samples land on
+the Python frame that called it.
+"""
+
+import collections
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("BlenderMCPProfiler")
+
+# Seconds between stack snapshots
+DEFAULT_INTERVAL = 0.005
+
+# Directory the collapsed-stack files are written to
+PROFILE_DIR = os.path.join(tempfile.gettempdir(), "blendermcp_profiles")
+
+# Summaries of recent profiles kept for `get_profiles`
+MAX_RECENT_PROFILES = 20
+
+# Leaf frames reported in a profile summary
+HOT_FRAMES = 10
+
+
+class ProfileSession:
+    """
+    Stack samples of one profiled command.
+    """
+
+    __slots__ = ("name", "thread_id", "base_frame", "active", "stacks", "samples", "started", "wall_time")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.thread_id = threading.get_ident()
+        # Frame that called into the command; frames above it are not sampled
+        self.base_frame = None
+        self.active = False
+        self.stacks: Dict[str, int] = collections.Counter()
+        self.samples = 0
+        self.started = time.time()
+        self.wall_time = 0.0
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for command execution.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, output_dir: str = PROFILE_DIR):
+        """
+        Args:
+            interval: Seconds between stack snapshots
+            output_dir: Directory for the collapsed-stack files
+        """
+        self.interval = interval
+        self.output_dir = output_dir
+        # Commands profiled on every call
+        self.commands = frozenset()
+        # Profile 1 in this many commands; 0 for none
+        self.sample_every = 0
+        self.recent = collections.deque(maxlen=MAX_RECENT_PROFILES)
+        self._calls = 0
+        self._sequence = 0
+        self._sessions: List[ProfileSession] = []
+        self._labels: Dict[types.CodeType, str] = {}
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._thread = None
+
+    def configure(self, commands: Optional[Iterable[str]] = None, sample_every: Optional[int] = None,
+                  interval: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Select the commands to profile.
+
+        Args:
+            commands: Command names to profile on every call; an empty list
+                turns per-command profiling off
+            sample_every: Profile 1 in this many commands; 0 turns sampling off
+            interval: Seconds between stack snapshots
+
+        Returns:
+            The resulting profiler settings
+        """
+        if commands is not None:
+            self.commands = frozenset(commands)
+        if sample_every is not None:
+            self.sample_every = max(0, int(sample_every))
+        if interval is not None:
+            self.interval = max(0.0005, float(interval))
+        return self.get_settings()
+
+    def get_settings(self) -> Dict[str, Any]:
+        """Get the current selection, interval and output directory."""
+        return {
+            "commands": sorted(self.commands),
+            "sample_every": self.sample_every,
+            "interval": self.interval,
+            "output_dir": self.output_dir
+        }
+
+    def get_profiles(self) -> List[Dict[str, Any]]:
+        """
+        Get summaries of the most recent profiles.
+
+        Returns:
+            Newest first, each with the command, collapsed-stack file path,
+            sample count, wall time and the leaf frames with the most samples
+        """
+        return list(reversed(self.recent))
+
+    def call(self, name: str, func: Callable, *args, force: bool = False, **kwargs) -> Any:
+        """
+        Call `func`, profiling it if the command is selected.
+
+        Generator results (chunked handlers) are profiled across all of their
+        chunks, sampling only while a chunk runs. Calls made while the thread
+        is already being profiled are not profiled separately.
+
+        Args:
+            name: Command name
+            func: Command implementation
+            force: Profile regardless of the selection
+        """
+        if not (force or self.commands or self.sample_every):
+            return func(*args, **kwargs)
+        if getattr(self._local, "session", None) is not None or not (force or self._selects(name)):
+            return func(*args, **kwargs)
+
+        session = ProfileSession(name)
+        self._begin(session)
+        finished = False
+        try:
+            result = self._run_active(session, func, args, kwargs)
+            if isinstance(result, types.GeneratorType):
+                finished = True
+                return self._profile_generator(session, result)
+            return result
+        finally:
+            if not finished:
+                self._end(session)
+
+    def _selects(self, name: str) -> bool:
+        if name in self.commands:
+            return True
+        if self.sample_every:
+            self._calls += 1
+            return self._calls % self.sample_every == 0
+        return False
+
+    def _run_active(self, session: ProfileSession, func: Callable, args, kwargs) -> Any:
+        """Run `func` with the session sampling this frame's callees."""
+        session.base_frame = sys._getframe()
+        self._local.session = session
+        session.active = True
+        start_time = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session.active = False
+            session.wall_time += time.perf_counter() - start_time
+            self._local.session = None
+
+    def _profile_generator(self, session: ProfileSession, generator):
+        """Resume a generator chunk by chunk, sampling only inside the chunks."""
+        try:
+            value = None
+            while True:
+                try:
+                    value = yield self._run_active(session, generator.send, (value,), {})
+                except StopIteration as stop:
+                    return stop.value
+        finally:
+            generator.close()
+            self._end(session)
+
+    def _begin(self, session: ProfileSession) -> None:
+        with self._condition:
+            self._sessions.append(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="BlenderMCPProfiler", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _end(self, session: ProfileSession) -> None:
+        with self._condition:
+            self._sessions.remove(session)
+            # The sampler only counts sessions still in the list, so these can't change under us
+            stacks = dict(session.stacks)
+            samples = session.samples
+
+        try:
+            path = self._write(session, stacks)
+        except OSError as e:
+            logger.warning(f"Could not write profile of {session.name}: {str(e)}")
+            path = None
+
+        leaves = collections.Counter()
+        for stack, count in stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+
+        self.recent.append({
+            "command": session.name,
+            "path": path,
+            "samples": samples,
+            "wall_time": session.wall_time,
+            "started": session.started,
+            "hot_frames": leaves.most_common(HOT_FRAMES)
+        })
+
+    def _write(self, session: ProfileSession, stacks: Dict[str, int]) -> str:
+        """Write a session's stack counts as a collapsed-stack file."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._sequence += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(session.started))
+        file_name = f"{re.sub(r'[^A-Za-z0-9_.-]', '_', session.name)}-{stamp}-{os.getpid()}-{self._sequence}.folded"
+        path = os.path.join(self.output_dir, file_name)
+        with open(path, "w") as f:
+            for stack, count in stacks.items():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def _sample_loop(self) -> None:
+        """Snapshot the stacks of the active sessions' threads until the process exits."""
+        while True:
+            with self._condition:
+                while not self._sessions:
+                    self._condition.wait()
+                sessions = list(self._sessions)
+
+            frames = sys._current_frames()
+            samples = []
+            for session in sessions:
+                frame = frames.get(session.thread_id)
+                if session.active and frame is not None:
+                    samples.append((session, self._collapse(session, frame)))
+            del frames
+
+            # Sessions may have ended while their stacks were collapsed; drop those samples
+            with self._condition:
+                for session, stack in samples:
+                    if session in self._sessions:
+                        session.stacks[stack] += 1
+                        session.samples += 1
+
+            time.sleep(self.interval)
+
+    def _collapse(self, session: ProfileSession, frame) -> str:
+        """Render a stack as "command;outermost;...;innermost"."""
+        labels = []
+        base_frame = session.base_frame
+        while frame is not None and frame is not base_frame:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+            labels.append(label)
+            frame = frame.f_back
+        labels.append(session.name)
+        labels.reverse()
+        return ";".join(labels)
+
+
+# Profiler shared by the addon dispatcher and BlenderMCPUltimate
+command_profiler = SamplingProfiler()
@@ -0,0 +1,196 @@
+"""
+BlenderMCP wire protocol.
+
+Every message exchanged between the MCP server and the Blender addon is a
+single JSON document wrapped in a frame:
+
+    +----------------------+---------------------------+
+    | length (4 bytes, BE) | UTF-8 encoded JSON payload |
+    +----------------------+---------------------------+
+
+The length header lets the receiver read exactly one message regardless of
+how the payload was split into TCP segments, so large replies such as
+`get_scene_info` dumps arrive intact in a single round trip.
+"""
+
+import asyncio
+import json
+import socket
+import struct
+from typing import Dict, Any
+
+# Unsigned 32-bit big-endian payload length
+HEADER = struct.Struct("!I")
+
+# Refuse frames larger than this to protect both sides from runaway payloads
+DEFAULT_MAX_FRAME_SIZE = 64 * 1024 * 1024  # 64 MB
+
+# Initial size of the receive buffer, grown on demand up to the max frame size
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends data that does not follow the wire protocol."""
+
+
+class FrameTooLargeError(ProtocolError):
+    """Raised when a frame exceeds the configured maximum frame size."""
+
+
+def encode_message(message: Dict[str, Any], max_frame_size: int = DEFAULT_MAX_FRAME_SIZE) -> bytes:
+    """
+    Serialize a message into a length-prefixed frame.
+
+    Args:
+        message: JSON-serializable message
+        max_frame_size: Maximum allowed payload size in bytes
+
+    Returns:
+        Frame bytes ready to be written to the socket
+    """
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+    if len(payload) > max_frame_size:
+        raise FrameTooLargeError(
+            f"Frame of {len(payload)} bytes exceeds the maximum of {max_frame_size} bytes"
+        )
+
+    # Join header and payload so the frame goes out in as few segments as possible
+    return b"".join((HEADER.pack(len(payload)), payload))
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any], max_frame_size: int = DEFAULT_MAX_FRAME_SIZE) -> None:
+    """
+    Send a single framed message over a connected socket.
+
+    Args:
+        sock: Connected socket
+        message: JSON-serializable message
+        max_frame_size: Maximum allowed payload size in bytes
+    """
+    sock.sendall(encode_message(message, max_frame_size))
+
+
+def decode_payload(payload) -> Dict[str, Any]:
+    """
+    Decode a frame payload into a message.
+
+    Args:
+        payload: Bytes-like frame payload
+
+    Returns:
+        Decoded message
+    """
+    try:
+        return json.loads(str(payload, "utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ProtocolError(f"Invalid frame payload: {str(e)}")
+
+
+class FrameReader:
+    """
+    Reads length-prefixed frames from a blocking socket.
+
+    Incoming bytes are read with `recv_into` into a preallocated buffer that is
+    reused across messages and only grown when a larger frame arrives.
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray(max(buffer_size, HEADER.size))
+        self._view = memoryview(self._buffer)
+
+    def _ensure_capacity(self, size: int) -> None:
+        """Grow the receive buffer so it can hold at least `size` bytes."""
+        if size <= len(self._buffer):
+            return
+
+        # Grow geometrically to avoid reallocating for every slightly larger frame
+        new_size = len(self._buffer)
+        while new_size < size:
+            new_size *= 2
+
+        self._view.release()
+        self._buffer = bytearray(min(new_size, max(size, self.max_frame_size)))
+        self._view = memoryview(self._buffer)
+
+    def _recv_exactly(self, sock: socket.socket, size: int) -> memoryview:
+        """
+        Read exactly `size` bytes into the start of the receive buffer.
+
+        Args:
+            sock: Connected socket
+            size: Number of bytes to read
+
+        Returns:
+            View over the bytes that were read
+        """
+        self._ensure_capacity(size)
+        received = 0
+
+        while received < size:
+            count = sock.recv_into(self._view[received:size], size - received)
+            if count == 0:
+                raise ConnectionError("Connection closed by peer")
+            received += count
+
+        return self._view[:size]
+
+    def read_frame(self, sock: socket.socket) -> memoryview:
+        """
+        Read the payload of the next frame.
+
+        The returned view is only valid until the next read.
+
+        Args:
+            sock: Connected socket
+
+        Returns:
+            View over the frame payload
+        """
+        (length,) = HEADER.unpack(self._recv_exactly(sock, HEADER.size))
+
+        if length > self.max_frame_size:
+            raise FrameTooLargeError(
+                f"Frame of {length} bytes exceeds the maximum of {self.max_frame_size} bytes"
+            )
+
+        return self._recv_exactly(sock, length)
+
+    def read_message(self, sock: socket.socket) -> Dict[str, Any]:
+        """
+        Read and decode the next message.
+
+        Args:
+            sock: Connected socket
+
+        Returns:
+            Decoded message
+        """
+        return decode_payload(self.read_frame(sock))
+
+
+async def read_message_async(reader: asyncio.StreamReader, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE) -> Dict[str, Any]:
+    """
+    Read and decode the next message from an asyncio stream.
+
+    Args:
+        reader: Stream connected to the peer
+        max_frame_size: Maximum allowed payload size in bytes
+
+    Returns:
+        Decoded message
+    """
+    try:
+        (length,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+
+        if length > max_frame_size:
+            raise FrameTooLargeError(
+                f"Frame of {length} bytes exceeds the maximum of {max_frame_size} bytes"
+            )
+
+        payload = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        raise ConnectionError("Connection closed by peer")
+
+    return decode_payload(payload)
@@ -0,0 +1,240 @@
+"""
+BlenderMCP worker routing.
+
+Routes commands across several Blender addon endpoints (e.g. multiple
+headless Blender instances on one render node), each reached through its own
+`ConnectionPool`:
+
+- Commands that read or change the scene are sticky: every command of a
+  session goes to the worker that owns that session's scene.
+- Stateless commands (asset search, status checks) go to the least-loaded
+  healthy worker.
+- When a session's worker dies, the session fails over to the least-loaded
+  healthy worker on its next command.
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
+
+from blender_mcp.client import AsyncBlenderConnection, ProgressSubscription
+from blender_mcp.events import DEFAULT_MAX_RATE
+from blender_mcp.pool import ConnectionPool
+
+logger = logging.getLogger("BlenderMCPRouting")
+
+# Commands that do not depend on a worker's scene
+STATELESS_COMMANDS = {
+    "ping",
+    "get_polyhaven_status",
+    "get_hyper3d_status",
+    "get_polyhaven_categories",
+    "search_polyhaven_assets",
+    "poll_rodin_job_status",
+    "get_handler_stats",
+    "get_scheduler_stats",
+    "get_cache_stats",
+}
+
+DEFAULT_SESSION = "default"
+
+
+def parse_endpoint(endpoint: str) -> Tuple[str, int, Optional[str]]:
+    """
+    Parse an addon endpoint.
+
+    Args:
+        endpoint: "host:port", a bare port, or "unix:/path/to/socket"
+
+    Returns:
+        Tuple of (host, port, unix_path)
+    """
+    endpoint = endpoint.strip()
+    if endpoint.startswith("unix:"):
+        return "localhost", 0, endpoint[len("unix:"):]
+
+    host, _, port = endpoint.rpartition(":")
+    return host or "localhost", int(port), None
+
+
+def parse_endpoints(endpoints: str) -> List[Tuple[str, int, Optional[str]]]:
+    """Parse a comma-separated list of addon endpoints."""
+    return [parse_endpoint(endpoint) for endpoint in endpoints.split(",") if endpoint.strip()]
+
+
+class Worker:
+    """
+    A Blender addon endpoint and its connection pool.
+    """
+
+    def __init__(self, name: str, pool: ConnectionPool):
+        self.name = name
+        self.pool = pool
+        self.routed = 0
+
+    @property
+    def healthy(self) -> bool:
+        return self.pool.connected
+
+    @property
+    def load(self) -> int:
+        """Requests currently in flight to this worker."""
+        return sum(member.connection.in_flight for member in self.pool.members)
+
+
+class WorkerRegistry:
+    """
+    Routes commands across several Blender workers.
+
+    Has the same interface as `ConnectionPool`, so it can back a
+    `BlenderConnection` in place of a single pool.
+    """
+
+    def __init__(self, endpoints: List[Tuple[str, int, Optional[str]]], pool_size: int = 1, **pool_options):
+        """
+        Args:
+            endpoints: (host, port, unix_path) of each worker, see `parse_endpoints`
+            pool_size: Connections per worker
+            **pool_options: Further `ConnectionPool` options
+        """
+        # Fail over quickly instead of waiting for a dead worker to come back
+        pool_options.setdefault("checkout_timeout", 1.0)
+
+        self.workers: List[Worker] = [
+            Worker(unix_path or f"{host}:{port}",
+                   ConnectionPool(host, port, size=pool_size, unix_path=unix_path, **pool_options))
+            for host, port, unix_path in endpoints
+        ]
+        if not self.workers:
+            raise ValueError("At least one worker endpoint is required")
+
+        self.sessions: Dict[str, Worker] = {}
+        self.failovers = 0
+        # Start the round-robin at a random worker, so the first session of each
+        # MCP server process does not always land on the first worker
+        self._tiebreak = itertools.count(random.randrange(len(self.workers)))
+
+    @property
+    def connected(self) -> bool:
+        """Whether at least one worker is healthy."""
+        return any(worker.healthy for worker in self.workers)
+
+    async def connect(self) -> bool:
+        """Connect to every worker; unreachable ones keep reconnecting in the background."""
+        await asyncio.gather(*(worker.pool.connect() for worker in self.workers))
+        return self.connected
+
+    async def disconnect(self) -> None:
+        """Disconnect from every worker."""
+        await asyncio.gather(*(worker.pool.disconnect() for worker in self.workers))
+
+    def least_loaded(self) -> Worker:
+        """
+        Get the healthy worker with the fewest requests in flight.
+
+        Ties are broken round-robin so idle workers share the traffic.
+        """
+        healthy = [worker for worker in self.workers if worker.healthy]
+        if not healthy:
+            raise ConnectionError("No healthy Blender worker available")
+
+        offset = next(self._tiebreak)
+        count = len(self.workers)
+        return min(healthy, key=lambda worker: (worker.load, (self.workers.index(worker) - offset) % count))
+
+    def session_worker(self, session: str = DEFAULT_SESSION) -> Worker:
+        """
+        Get the worker that owns a session's scene, assigning or failing over as needed.
+
+        Args:
+            session: Session id
+
+        Returns:
+            The session's worker
+        """
+        worker = self.sessions.get(session)
+        if worker is not None and worker.healthy:
+            return worker
+
+        new_worker = self.least_loaded()
+        if worker is not None:
+            self.failovers += 1
+            logger.warning(f"Worker {worker.name} is down; moving session {session} to {new_worker.name}")
+
+        self.sessions[session] = new_worker
+        return new_worker
+
+    def route(self, command_type: str, session: str = DEFAULT_SESSION) -> Worker:
+        """Pick the worker for a command."""
+        if command_type in STATELESS_COMMANDS:
+            return self.least_loaded()
+        return self.session_worker(session)
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None,
+                           timeout: Optional[float] = None, session: str = DEFAULT_SESSION) -> Dict[str, Any]:
+        """
+        Send a command to the worker it routes to.
+
+        Stateless commands are retried on another worker if theirs fails.
+
+        Args:
+            command_type: Addon command type
+            params: Parameters for the command
+            timeout: Seconds before the command is abandoned and cancelled
+            session: Session whose worker scene commands go to
+
+        Returns:
+            The command result
+        """
+        attempts = len(self.workers) if command_type in STATELESS_COMMANDS else 1
+
+        for attempt in range(attempts):
+            worker = self.route(command_type, session)
+            worker.routed += 1
+            try:
+                return await worker.pool.send_command(command_type, params, timeout)
+            except ConnectionError:
+                if attempt + 1 >= attempts:
+                    raise
+
+    async def run(self, operation: Callable[[AsyncBlenderConnection], Awaitable[Any]], idempotent: bool = False,
+                  session: str = DEFAULT_SESSION) -> Any:
+        """Run an operation on a connection to the session's worker."""
+        worker = self.session_worker(session)
+        worker.routed += 1
+        return await worker.pool.run(operation, idempotent)
+
+    async def subscribe_progress(self, max_rate: Optional[float] = DEFAULT_MAX_RATE,
+                                 session: str = DEFAULT_SESSION) -> ProgressSubscription:
+        """Subscribe to progress events of the session's worker."""
+        return await self.session_worker(session).pool.subscribe_progress(max_rate)
+
+    async def cancel_all(self, reason: str = "Cancelled by client") -> int:
+        """Cancel every unfinished command on every healthy worker; returns how many were flagged."""
+        counts = await asyncio.gather(
+            *(worker.pool.cancel_all(reason) for worker in self.workers if worker.healthy),
+            return_exceptions=True
+        )
+        return sum(count for count in counts if isinstance(count, int))
+
+    def get_stats(self) -> Dict:
+        """
+        Get per-worker health, load and pool metrics.
+
+        Returns:
+            Dict with worker stats, session assignments and failover count.
+            Each worker's pool stats keep "healthy" as the pool's count of
+            healthy connections; the worker's own health is "worker_healthy".
+        """
+        return {
+            "workers": {
+                worker.name: dict(worker.pool.get_stats(), worker_healthy=worker.healthy, load=worker.load,
+                                  routed=worker.routed)
+                for worker in self.workers
+            },
+            "sessions": {session: worker.name for session, worker in self.sessions.items()},
+            "failovers": self.failovers,
+            "reconnects": sum(worker.pool.get_stats()["reconnects"] for worker in self.workers)
+        }
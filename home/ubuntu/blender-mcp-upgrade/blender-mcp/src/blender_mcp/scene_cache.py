@@ -0,0 +1,427 @@
+"""
+BlenderMCP scene query cache.
+
+Read-only scene queries are answered from memory while the scene is
+unchanged. Every change to the scene bumps a mutation counter: depsgraph
+updates, file loads, and the addon's own write handlers. Cached results are
+only valid for the version they were computed at. Clients can also revalidate
+a result they already hold by sending its version as `if_version` and get a
+tiny "not modified" reply instead of the full payload.
+
+`get_scene_info` also supports delta sync. Per-object changes are recorded
+with the version they happened at, so a client that passes `since_version`
+only receives the objects added, changed or removed after that version.
+"""
+
+import collections
+import functools
+import inspect
+import json
+from typing import Callable, Dict, Any, Optional
+
+# Read-only queries whose results are cached per scene version
+CACHED_QUERIES = {
+    "get_scene_info",
+    "get_object_info",
+}
+
+# Handlers that change the scene and invalidate cached results
+MUTATING_COMMANDS = {
+    "create_object",
+    "modify_object",
+    "delete_object",
+    "set_material",
+    "execute_code",
+    "download_polyhaven_asset",
+    "set_texture",
+    "import_generated_asset",
+}
+
+
+class SceneVersion:
+    """
+    Monotonic scene mutation counter.
+    """
+
+    def __init__(self):
+        self.version = 0
+
+    def bump(self) -> int:
+        """Record a scene change and return the new version."""
+        self.version += 1
+        return self.version
+
+
+class VersionedResultCache:
+    """
+    Results of read-only queries, valid only for the scene version they were
+    computed at.
+    """
+
+    def __init__(self, scene_version: SceneVersion, max_entries: int = 512):
+        self.scene_version = scene_version
+        self.max_entries = max_entries
+        self.entries: "collections.OrderedDict[str, tuple]" = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def make_key(command_type: str, params: Dict[str, Any]) -> str:
+        """Build the cache key for a query."""
+        return command_type + ":" + json.dumps(params, sort_keys=True, default=str)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached result if it is still valid for the current scene version."""
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != self.scene_version.version:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, result: Any) -> None:
+        """Store a result for the current scene version."""
+        self.entries[key] = (self.scene_version.version, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def drop_stale(self) -> int:
+        """Drop results computed at earlier scene versions, which can never be hit again."""
+        stale = [key for key, entry in self.entries.items() if entry[0] != self.scene_version.version]
+        for key in stale:
+            del self.entries[key]
+        return len(stale)
+
+    def get_stats(self) -> Dict:
+        """Get cache size and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "scene_version": self.scene_version.version,
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+def describe_object(obj) -> Dict[str, Any]:
+    """Summarize an object for delta sync."""
+    return {
+        "name": obj.name,
+        "type": obj.type,
+        "location": [round(float(value), 4) for value in obj.location],
+        "rotation": [round(float(value), 4) for value in obj.rotation_euler],
+        "scale": [round(float(value), 4) for value in obj.scale],
+        "parent": obj.parent.name if obj.parent else None,
+        "visible": obj.visible_get()
+    }
+
+
+def current_scene_objects():
+    """Get the objects of the active scene, keyed by name."""
+    import bpy
+    return bpy.context.scene.objects
+
+
+class ObjectChangeTracker:
+    """
+    Records the scene version at which each object was added, changed or removed.
+    """
+
+    def __init__(self, scene_version: SceneVersion, get_objects: Callable = current_scene_objects,
+                 describe: Callable = describe_object, max_removed: int = 10000):
+        self.scene_version = scene_version
+        self.get_objects = get_objects
+        self.describe = describe
+        self.max_removed = max_removed
+        self.added: Dict[str, int] = {}
+        self.changed: Dict[str, int] = {}
+        self.removed: Dict[str, int] = {}
+        # Deltas since versions older than this cannot be answered and need a full resync
+        self.base_version: Optional[int] = None
+
+    def reset(self) -> None:
+        """Start tracking from the objects currently in the scene."""
+        version = self.scene_version.version
+        names = list(self.get_objects().keys())
+        self.added = dict.fromkeys(names, version)
+        self.changed = dict.fromkeys(names, version)
+        self.removed = {}
+        self.base_version = version
+
+    def invalidate(self) -> None:
+        """Forget all history, e.g. after a new file was loaded."""
+        self.base_version = None
+
+    def mark_changed(self, names) -> None:
+        """
+        Record that objects changed at the current scene version.
+
+        Args:
+            names: Names of the changed objects
+        """
+        if self.base_version is None:
+            return
+
+        version = self.scene_version.version
+        for name in names:
+            if name not in self.changed:
+                self.added[name] = version
+            self.changed[name] = version
+            self.removed.pop(name, None)
+
+    def reconcile(self) -> None:
+        """Pick up objects added or removed since the last depsgraph update."""
+        names = set(self.get_objects().keys())
+        new_names = names.difference(self.changed)
+        gone_names = set(self.changed).difference(names)
+
+        if not new_names and not gone_names:
+            return
+
+        # Record the difference at a new version so clients synced at the
+        # current version still receive it
+        version = self.scene_version.bump()
+
+        for name in new_names:
+            self.added[name] = version
+            self.changed[name] = version
+            self.removed.pop(name, None)
+
+        for name in gone_names:
+            self.added.pop(name, None)
+            self.changed.pop(name, None)
+            self.removed[name] = version
+
+        if len(self.removed) > self.max_removed:
+            # Drop the oldest removals; deltas from before them need a resync
+            oldest = sorted(self.removed.items(), key=lambda item: item[1])
+            dropped = oldest[:len(self.removed) - self.max_removed]
+            for name, _ in dropped:
+                del self.removed[name]
+            self.base_version = max(self.base_version, dropped[-1][1])
+
+    def delta(self, since_version: int) -> Dict[str, Any]:
+        """
+        Get the objects added, changed or removed after a scene version.
+
+        Args:
+            since_version: Scene version the client last synced at. Versions the
+                tracker cannot answer for (e.g. -1) return a full snapshot.
+
+        Returns:
+            Dict with added/changed object summaries and removed object names.
+            When "delta" is False, the client must replace its whole mirror.
+        """
+        if self.base_version is None:
+            self.reset()
+        else:
+            self.reconcile()
+
+        version = self.scene_version.version
+        objects = self.get_objects()
+        full = since_version < self.base_version or since_version > version
+
+        if full:
+            added = [self.describe(objects[name]) for name in self.changed]
+            changed = []
+            removed = []
+        else:
+            added = [
+                self.describe(objects[name])
+                for name, added_version in self.added.items()
+                if added_version > since_version
+            ]
+            changed = [
+                self.describe(objects[name])
+                for name, changed_version in self.changed.items()
+                if changed_version > since_version and self.added[name] <= since_version
+            ]
+            removed = [
+                name for name, removed_version in self.removed.items()
+                if removed_version > since_version
+            ]
+
+        return {
+            "delta": not full,
+            "since_version": since_version,
+            "scene_version": version,
+            "object_count": len(self.changed),
+            "added": added,
+            "changed": changed,
+            "removed": removed
+        }
+
+
+# Scene version, query cache and object change tracking used by the addon
+scene_version = SceneVersion()
+query_cache = VersionedResultCache(scene_version)
+object_tracker = ObjectChangeTracker(scene_version)
+
+
+def cached_query(command_type: str, func: Callable) -> Callable:
+    """
+    Wrap a read-only query handler with the versioned result cache.
+
+    The wrapped handler accepts an extra `if_version` parameter. Results are
+    returned with the `scene_version` they are valid for.
+
+    Args:
+        command_type: Command type of the query
+        func: Query handler
+
+    Returns:
+        Wrapped handler
+    """
+    @functools.wraps(func)
+    def query(if_version: Optional[int] = None, **params):
+        version = scene_version.version
+
+        if if_version == version:
+            query_cache.not_modified += 1
+            return {"not_modified": True, "scene_version": version}
+
+        key = query_cache.make_key(command_type, params)
+        result = query_cache.get(key)
+        if result is None:
+            result = func(**params)
+
+            # Stamp with the version after the query ran; delta sync may have bumped it
+            if isinstance(result, dict):
+                result = dict(result, scene_version=scene_version.version)
+            query_cache.put(key, result)
+
+        return result
+
+    return query
+
+
+def with_delta_sync(func: Callable) -> Callable:
+    """
+    Wrap `get_scene_info` so it answers with a delta when `since_version` is given.
+
+    Args:
+        func: Full `get_scene_info` handler
+
+    Returns:
+        Wrapped handler
+    """
+    @functools.wraps(func)
+    def get_scene_info(since_version: Optional[int] = None, **params):
+        if since_version is None:
+            return func(**params)
+        return object_tracker.delta(since_version)
+
+    return get_scene_info
+
+
+def mutating(func: Callable) -> Callable:
+    """
+    Wrap a write handler so it bumps the scene version when it finishes.
+
+    Objects named in the parameters are marked as changed right away, without
+    waiting for the next depsgraph update.
+
+    Args:
+        func: Write handler, possibly a generator (chunked) handler
+
+    Returns:
+        Wrapped handler
+    """
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def write_chunked(**params):
+            try:
+                return (yield from func(**params))
+            finally:
+                _record_write(params)
+
+        return write_chunked
+
+    @functools.wraps(func)
+    def write(**params):
+        try:
+            return func(**params)
+        finally:
+            _record_write(params)
+
+    return write
+
+
+def _record_write(params: Dict[str, Any]) -> None:
+    """Bump the scene version and mark objects named in write parameters as changed."""
+    scene_version.bump()
+    object_tracker.mark_changed(
+        params[key] for key in ("name", "object_name") if isinstance(params.get(key), str)
+    )
+
+
+def wrap_scene_handler(command_type: str, func: Callable) -> Callable:
+    """Apply the cache or invalidation wrapper a command type needs, if any."""
+    if command_type == "get_scene_info":
+        return cached_query(command_type, with_delta_sync(func))
+    if command_type in CACHED_QUERIES:
+        return cached_query(command_type, func)
+    if command_type in MUTATING_COMMANDS:
+        return mutating(func)
+    return func
+
+
+def on_depsgraph_update(scene, depsgraph=None) -> None:
+    """Handler for `depsgraph_update_post` that bumps the scene version and records changed objects."""
+    scene_version.bump()
+
+    if depsgraph is not None:
+        import bpy
+        object_tracker.mark_changed(
+            update.id.name for update in depsgraph.updates if isinstance(update.id, bpy.types.Object)
+        )
+
+
+def on_load_post(*args) -> None:
+    """Handler for `load_post`; a new file invalidates every cached result and delta."""
+    scene_version.bump()
+    object_tracker.invalidate()
+
+
+# Whether the Blender handlers are installed; only ever true inside Blender
+scene_tracking_registered = False
+
+
+def register_scene_tracking() -> None:
+    """Install the Blender handlers that track scene changes."""
+    global scene_tracking_registered
+    import bpy
+
+    for handlers, handler in ((bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+                              (bpy.app.handlers.load_post, on_load_post)):
+        handler = bpy.app.handlers.persistent(handler)
+        if handler not in handlers:
+            handlers.append(handler)
+
+    scene_tracking_registered = True
+    object_tracker.reset()
+
+
+def unregister_scene_tracking() -> None:
+    """
+    Remove the Blender handlers installed by `register_scene_tracking`.
+
+    Does nothing, and does not import bpy, if they were never installed.
+    """
+    global scene_tracking_registered
+    if not scene_tracking_registered:
+        return
+    scene_tracking_registered = False
+
+    import bpy
+
+    for handlers, handler in ((bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+                              (bpy.app.handlers.load_post, on_load_post)):
+        if handler in handlers:
+            handlers.remove(handler)
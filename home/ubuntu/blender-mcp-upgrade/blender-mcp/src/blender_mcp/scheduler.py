@@ -0,0 +1,342 @@
+"""
+BlenderMCP main-thread job scheduler.
+
+Blender only allows scene access from its main thread, so every addon command
+has to run there. Instead of running each command to completion, the
+scheduler drains its queues from a `bpy.app.timers` callback with a fixed
+time budget per tick:
+
+- Jobs are queued in priority lanes. Cheap interactive reads are served before
+  heavy writes and downloads.
+- Handlers may be generators that `yield` between chunks of work. They are
+  resumed on later ticks, so the UI keeps redrawing and interactive commands
+  are answered in between.
+- Jobs may carry a `CancelToken`. A job that was cancelled or ran past its
+  deadline is not started, or is closed before its next chunk.
+"""
+
+import collections
+import inspect
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Any, Optional
+
+from blender_mcp.cancellation import CancelToken, OperationCancelled, activate
+
+INTERACTIVE = "interactive"
+HEAVY = "heavy"
+
+# Lanes in priority order
+LANES = (INTERACTIVE, HEAVY)
+
+# Read-only commands that are served from the interactive lane
+INTERACTIVE_COMMANDS = {
+    "ping",
+    "get_scene_info",
+    "get_object_info",
+    "get_polyhaven_status",
+    "get_hyper3d_status",
+    "get_polyhaven_categories",
+    "search_polyhaven_assets",
+    "poll_rodin_job_status",
+    "get_handler_stats",
+    "get_scheduler_stats",
+    "get_cache_stats",
+}
+
+# Number of recent wait/run time samples kept per lane for metrics
+METRIC_SAMPLES = 1000
+
+
+def command_lane(command: Dict[str, Any]) -> str:
+    """
+    Get the lane a command should be queued in.
+
+    Args:
+        command: Command with "type" and an optional explicit "lane"
+
+    Returns:
+        Lane name
+    """
+    lane = command.get("lane")
+    if lane in LANES:
+        return lane
+    return INTERACTIVE if command.get("type") in INTERACTIVE_COMMANDS else HEAVY
+
+
+def run_to_completion(result: Any, token: Optional[CancelToken] = None) -> Any:
+    """
+    Drive a chunked (generator) result to completion in one go.
+
+    Args:
+        result: Handler result, possibly a generator
+        token: Checked between chunks; the generator is closed if it says to stop
+
+    Returns:
+        The final result
+    """
+    if not inspect.isgenerator(result):
+        return result
+
+    while True:
+        if token is not None and token.should_stop:
+            result.close()
+            token.check()
+
+        try:
+            with activate(token):
+                next(result)
+        except StopIteration as stop:
+            return stop.value
+
+
+def chunked_response(generator) -> Any:
+    """
+    Wrap a chunked handler so its final value becomes a success response.
+
+    Args:
+        generator: Generator returned by a chunked handler
+
+    Returns:
+        Generator yielding between chunks and returning the response dict
+    """
+    result = yield from generator
+    return {"status": "success", "result": result}
+
+
+class Job:
+    """
+    A unit of work queued on the main-thread scheduler.
+    """
+
+    __slots__ = ("id", "lane", "func", "on_done", "token", "generator", "enqueued_at", "started_at", "steps")
+
+    def __init__(self, job_id: int, lane: str, func: Callable[[], Any], on_done: Optional[Callable] = None,
+                 token: Optional[CancelToken] = None):
+        self.id = job_id
+        self.lane = lane
+        self.func = func
+        self.on_done = on_done
+        self.token = token
+        self.generator = None
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+        self.steps = 0
+
+
+class LaneStats:
+    """
+    Queue metrics for a single lane.
+    """
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.wait_times = collections.deque(maxlen=METRIC_SAMPLES)
+        self.run_times = collections.deque(maxlen=METRIC_SAMPLES)
+        self.max_wait_time = 0.0
+
+    def summary(self, depth: int) -> Dict:
+        """Summarize the lane's metrics."""
+        wait_times = sorted(self.wait_times)
+        return {
+            "depth": depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "average_wait_time": sum(wait_times) / len(wait_times) if wait_times else 0.0,
+            "p95_wait_time": wait_times[int(0.95 * (len(wait_times) - 1))] if wait_times else 0.0,
+            "max_wait_time": self.max_wait_time,
+            "average_run_time": sum(self.run_times) / len(self.run_times) if self.run_times else 0.0
+        }
+
+
+class MainThreadScheduler:
+    """
+    Time-sliced job queue drained on Blender's main thread.
+    """
+
+    def __init__(self, time_budget: float = 0.008, register_timer: Optional[Callable[[Callable], None]] = None):
+        """
+        Args:
+            time_budget: Seconds of work to do per timer tick
+            register_timer: Registers the tick callback to run on the main thread.
+                Defaults to `bpy.app.timers.register`.
+        """
+        self.time_budget = time_budget
+        self.register_timer = register_timer or self._register_blender_timer
+        self.lanes: Dict[str, collections.deque] = {lane: collections.deque() for lane in LANES}
+        self.stats: Dict[str, LaneStats] = {lane: LaneStats() for lane in LANES}
+        self.ticks = 0
+        self.overrun_ticks = 0
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._timer_active = False
+
+    @staticmethod
+    def _register_blender_timer(callback: Callable) -> None:
+        import bpy
+        bpy.app.timers.register(callback, first_interval=0.0)
+
+    def submit(self, func: Callable[[], Any], lane: str = HEAVY, on_done: Optional[Callable[[Any, Optional[Exception]], None]] = None,
+               token: Optional[CancelToken] = None) -> Job:
+        """
+        Queue a job to run on the main thread.
+
+        Args:
+            func: Callable doing the work. If it returns a generator, the generator
+                is resumed on later ticks and its return value is the result.
+            lane: Lane to queue the job in
+            on_done: Called with (result, error) when the job finishes
+            token: Cancellation token checked before the job starts and between chunks
+
+        Returns:
+            The queued job
+        """
+        if lane not in self.lanes:
+            raise ValueError(f"Unknown scheduler lane: {lane}")
+
+        job = Job(next(self._job_ids), lane, func, on_done, token)
+
+        with self._lock:
+            self.lanes[lane].append(job)
+            self.stats[lane].submitted += 1
+            start_timer = not self._timer_active
+            self._timer_active = True
+
+        if start_timer:
+            self.register_timer(self.tick)
+
+        return job
+
+    def schedule(self, callback: Callable[[], None]) -> None:
+        """Scheduler hook compatible with `AddonSocketServer(schedule=...)`."""
+        self.submit(callback, lane=HEAVY)
+
+    def tick(self) -> Optional[float]:
+        """
+        Run queued work until the time budget for this tick is used up.
+
+        Returns:
+            Seconds until the next tick, or None when the queues are empty
+        """
+        self.ticks += 1
+        start_time = time.perf_counter()
+        deadline = start_time + self.time_budget
+        ran_heavy = False
+
+        while True:
+            job = self._next_job()
+            if job is None:
+                break
+
+            self._step(job)
+            ran_heavy = ran_heavy or job.lane == HEAVY
+
+            if time.perf_counter() >= deadline:
+                break
+
+        # Interactive traffic must not starve heavy work completely
+        if not ran_heavy:
+            job = self._next_job(HEAVY)
+            if job is not None:
+                self._step(job)
+
+        if time.perf_counter() - start_time > self.time_budget:
+            self.overrun_ticks += 1
+
+        with self._lock:
+            if any(self.lanes.values()):
+                return 0.0
+            self._timer_active = False
+            return None
+
+    def _next_job(self, lane: Optional[str] = None) -> Optional[Job]:
+        """Pop the next job, from the highest-priority non-empty lane by default."""
+        with self._lock:
+            for lane_name in ((lane,) if lane else LANES):
+                if self.lanes[lane_name]:
+                    return self.lanes[lane_name].popleft()
+        return None
+
+    def _step(self, job: Job) -> None:
+        """Run one step of a job and requeue it if it yielded."""
+        now = time.perf_counter()
+        stats = self.stats[job.lane]
+
+        if job.started_at is None:
+            job.started_at = now
+            wait_time = now - job.enqueued_at
+            stats.wait_times.append(wait_time)
+            stats.max_wait_time = max(stats.max_wait_time, wait_time)
+
+        try:
+            if job.token is not None and job.token.should_stop:
+                if job.generator is not None:
+                    job.generator.close()
+                job.token.check()
+
+            with activate(job.token):
+                if job.generator is None:
+                    result = job.func()
+                    if inspect.isgenerator(result):
+                        job.generator = result
+                    else:
+                        self._finish(job, result, None)
+                        return
+
+                job.steps += 1
+                next(job.generator)
+        except StopIteration as stop:
+            self._finish(job, stop.value, None)
+            return
+        except Exception as e:
+            self._finish(job, None, e)
+            return
+
+        # The job yielded; requeue it behind other jobs in its lane
+        with self._lock:
+            self.lanes[job.lane].append(job)
+
+    def _finish(self, job: Job, result: Any, error: Optional[Exception]) -> None:
+        """Record a finished job and notify its owner."""
+        stats = self.stats[job.lane]
+        stats.run_times.append(time.perf_counter() - job.started_at)
+        if error is None:
+            stats.completed += 1
+        elif isinstance(error, OperationCancelled):
+            stats.cancelled += 1
+        else:
+            stats.failed += 1
+
+        if job.on_done:
+            try:
+                job.on_done(result, error)
+            except Exception as e:
+                print(f"Error in scheduler callback: {str(e)}")
+
+    def get_stats(self) -> Dict:
+        """
+        Get queue depth and wait-time metrics.
+
+        Returns:
+            Dict with per-lane metrics and tick counters
+        """
+        with self._lock:
+            depths = {lane: len(jobs) for lane, jobs in self.lanes.items()}
+
+        return {
+            "lanes": {lane: self.stats[lane].summary(depths[lane]) for lane in LANES},
+            "queue_depth": sum(depths.values()),
+            "ticks": self.ticks,
+            "overrun_ticks": self.overrun_ticks,
+            "time_budget": self.time_budget
+        }
+
+
+# Scheduler used by the addon's command server
+main_thread_scheduler = MainThreadScheduler()
@@ -2,7 +2,7 @@ import socket
 import json
 import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Dict, Any, List
 import os
@@ -10,69 +10,124 @@ from pathlib import Path
 import base64
 from urllib.parse import urlparse
 
+from blender_mcp import openmetrics
+from blender_mcp.client import SceneMirror, client_loop
+from blender_mcp.events import DEFAULT_MAX_RATE
+from blender_mcp.metrics import MetricsRegistry
+from blender_mcp.pool import ConnectionPool
+from blender_mcp.routing import DEFAULT_SESSION, WorkerRegistry, parse_endpoints
+from blender_mcp.protocol import DEFAULT_MAX_FRAME_SIZE
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("BlenderMCPServer")
 
+# Round-trip latency of commands sent to Blender, as seen by this server
+command_metrics = MetricsRegistry()
+
 @dataclass
 class BlenderConnection:
+    """
+    Synchronous facade over a `ConnectionPool` of `AsyncBlenderConnection`s,
+    or a `WorkerRegistry` routing across several Blender instances.
+
+    Commands are submitted to a shared background event loop, so calls made
+    from different threads or MCP tools are pipelined over the pool's sockets
+    instead of waiting for each other's round trips. Broken connections are
+    re-established by the pool in the background.
+    """
     host: str
     port: int
-    sock: socket.socket = None
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE
+    unix_path: str = None
+    pool_size: int = 2
+    pool: ConnectionPool = field(default=None, repr=False)
+    scene_mirror: SceneMirror = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.pool is None:
+            self.pool = ConnectionPool(
+                self.host, self.port, size=self.pool_size,
+                max_frame_size=self.max_frame_size, unix_path=self.unix_path
+            )
+        if self.scene_mirror is None:
+            self.scene_mirror = SceneMirror()
+
+    @property
+    def connected(self) -> bool:
+        """Whether at least one pooled connection is healthy"""
+        return self.pool.connected
 
     def connect(self) -> bool:
         """Connect to the Blender addon socket server"""
-        if self.sock:
-            return True
-        
-        try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.connect((self.host, self.port))
-            logger.info(f"Connected to Blender at {self.host}:{self.port}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to connect to Blender: {str(e)}")
-            self.sock = None
-            return False
+        return client_loop.run(self.pool.connect())
     
     def disconnect(self):
         """Disconnect from the Blender addon"""
-        if self.sock:
-            try:
-                self.sock.close()
-            except Exception as e:
-                logger.error(f"Error disconnecting from Blender: {str(e)}")
-            finally:
-                self.sock = None
-
-    def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send a command to Blender and return the response"""
-        if not self.sock and not self.connect():
-            raise ConnectionError("Not connected to Blender")
-        
-        command = {
-            "type": command_type,
-            "params": params or {}
-        }
-        
+        client_loop.run(self.pool.disconnect())
+
+    def send_command(self, command_type: str, params: Dict[str, Any] = None, timeout: float = None,
+                     session: str = DEFAULT_SESSION) -> Dict[str, Any]:
+        """
+        Send a command to Blender and return the response, cancelling it after `timeout` seconds.
+
+        With several workers, scene commands of a `session` all go to the worker
+        owning that session's scene; a single pool ignores it.
+        """
+        with command_metrics.measure(command_type):
+            return client_loop.run(self.pool.send_command(command_type, params, timeout, session=session))
+
+    async def send_command_async(self, command_type: str, params: Dict[str, Any] = None,
+                                 timeout: float = None, session: str = DEFAULT_SESSION) -> Dict[str, Any]:
+        """Send a command to Blender from any event loop and await the response; see `send_command`"""
+        with command_metrics.measure(command_type):
+            return await client_loop.run_async(
+                self.pool.send_command(command_type, params, timeout, session=session)
+            )
+
+    async def progress_events(self, max_rate: float = DEFAULT_MAX_RATE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream progress events from Blender, from any event loop.
+
+        Usage: `async for event in connection.progress_events(): ...`
+
+        Progress updates are coalesced by the addon to at most `max_rate` per
+        second per operation. Raises `ConnectionError` if the connection is lost.
+        """
+        subscription = await client_loop.run_async(self.pool.subscribe_progress(max_rate))
         try:
-            logger.info(f"Sending command: {command_type} with params: {params}")
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
-            logger.info("Command sent, waiting for response...")
-            response_data = self.sock.recv(8192)
-            response = json.loads(response_data.decode('utf-8'))
-            logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
-            
-            if response.get("status") == "error":
-                logger.error(f"Blender error: {response.get('message')}")
-                raise Exception(response.get("message", "Unknown error from Blender"))
-            
-            return response.get("result", {})
-        except Exception as e:
-            logger.error(f"Error communicating with Blender: {str(e)}")
-            self.sock = None
-            raise Exception(f"Communication error with Blender: {str(e)}")
+            while True:
+                event = await client_loop.run_async(subscription.next_event())
+                if event is None:
+                    return
+                yield event
+        finally:
+            await client_loop.run_async(subscription.aclose())
+
+    def cancel_all(self, reason: str = "Cancelled by client") -> int:
+        """Cancel every unfinished command in Blender so the worker can be reused"""
+        return client_loop.run(self.pool.cancel_all(reason))
+
+    def sync_scene(self) -> Dict[str, Dict[str, Any]]:
+        """Bring the local scene mirror up to date and return its objects by name"""
+        return client_loop.run(self.pool.run(self.scene_mirror.sync, idempotent=True))
+
+    def get_mesh_vertices(self, name: str):
+        """Fetch a mesh's vertex coordinates as a flat float32 array of xyz triples"""
+        return client_loop.run(
+            self.pool.run(lambda connection: connection.get_mesh_vertices(name), idempotent=True)
+        )
+
+    def send_batch(self, commands: List[Dict[str, Any]], stop_on_error: bool = False) -> List[Dict[str, Any]]:
+        """Send several commands to Blender in one round trip and return per-command responses"""
+        return client_loop.run(
+            self.pool.run(lambda connection: connection.send_batch(commands, stop_on_error))
+        )
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool (or per-worker) health, checkout wait and reconnect metrics"""
+        return self.pool.get_stats()
 
 @asynccontextmanager
 async def server_lifespan(server):
@@ -81,27 +136,71 @@ async def server_lifespan(server):
         logger.info("BlenderMCP server starting up")
         yield {}
     finally:
-        global _blender_connection
+        global _blender_connection, _metrics_exporter
         if _blender_connection:
             logger.info("Disconnecting from Blender on shutdown")
             _blender_connection.disconnect()
             _blender_connection = None
+        if _metrics_exporter:
+            _metrics_exporter.stop()
+            _metrics_exporter = None
         logger.info("BlenderMCP server shut down")
 
 _blender_connection = None
+_metrics_exporter = None
 
 def get_blender_connection():
     """Get or create a persistent Blender connection"""
     global _blender_connection
     if _blender_connection is None:
-        _blender_connection = BlenderConnection(host="localhost", port=9876)
+        pool_size = int(os.environ.get("BLENDER_MCP_POOL_SIZE", "2"))
+        workers = os.environ.get("BLENDER_MCP_WORKERS")
+        if workers:
+            # Route across several Blender instances, e.g. "localhost:9876,localhost:9877"
+            _blender_connection = BlenderConnection(
+                host="localhost",
+                port=9876,
+                pool=WorkerRegistry(parse_endpoints(workers), pool_size=pool_size)
+            )
+        else:
+            # BLENDER_MCP_SOCKET selects a Unix domain socket for a co-located addon
+            _blender_connection = BlenderConnection(
+                host="localhost",
+                port=9876,
+                unix_path=os.environ.get("BLENDER_MCP_SOCKET"),
+                pool_size=pool_size
+            )
         if not _blender_connection.connect():
             logger.error("Failed to connect to Blender")
             _blender_connection = None
             raise Exception("Could not connect to Blender. Make sure the Blender addon is running.")
         logger.info("Created new persistent connection to Blender")
+        start_metrics_exporter()
     return _blender_connection
 
+def start_metrics_exporter():
+    """Serve round-trip latency and pool metrics if BLENDER_MCP_METRICS_PORT is set"""
+    global _metrics_exporter
+    address = openmetrics.parse_metrics_address(os.environ.get(openmetrics.METRICS_PORT_ENV))
+    if address is None or _metrics_exporter is not None:
+        return
+
+    def pool_metrics():
+        connection = _blender_connection
+        return openmetrics.pool_families(connection.get_pool_stats()) if connection is not None else []
+
+    exporter = openmetrics.MetricsExporter([
+        lambda: openmetrics.registry_families(command_metrics, "command", include_cpu=False),
+        pool_metrics,
+        openmetrics.process_families
+    ], *address)
+    try:
+        exporter.start()
+    except OSError as e:
+        logger.error(f"Could not serve metrics on {address[0]}:{address[1]}: {str(e)}")
+        return
+    _metrics_exporter = exporter
+
 def main():
     """Run the MCP server"""
     logger.info("Starting Blender MCP Server...")
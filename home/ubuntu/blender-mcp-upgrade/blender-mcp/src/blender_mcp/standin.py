@@ -0,0 +1,123 @@
+"""
+BlenderMCP stand-in addon server.
+
+Speaks the addon's framed JSON protocol without Blender, for load tests and
+CI. Every command succeeds after a configurable handler latency and returns a
+payload of a configurable size. Like the real addon, commands run one at a
+time on a single emulated "main thread", and the server can drop connections
+at random to exercise client reconnects.
+"""
+
+import queue
+import random
+import socket
+import threading
+import time
+from typing import Callable, Dict, Any
+
+from blender_mcp.addon_server import AddonSocketServer
+from blender_mcp.cancellation import check_cancelled
+
+
+class EmulatedMainThread:
+    """
+    Runs scheduled callbacks one at a time on a worker thread, like
+    `bpy.app.timers` callbacks on Blender's main thread.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="StandInMainThread", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker thread after the queued callbacks have run."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def schedule(self, callback: Callable[[], None]) -> None:
+        """Scheduler hook compatible with `AddonSocketServer(schedule=...)`."""
+        self._queue.put(callback)
+
+    def _run(self) -> None:
+        while True:
+            callback = self._queue.get()
+            if callback is None:
+                return
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in stand-in callback: {str(e)}")
+
+
+class StandInAddonServer(AddonSocketServer):
+    """
+    Addon socket server with a synthetic command executor.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 0, latency: float = 0.0,
+                 response_size: int = 0, drop_rate: float = 0.0, unix_path: str = None):
+        """
+        Args:
+            host: Host to listen on
+            port: Port to listen on; 0 picks a free port
+            latency: Seconds each command takes on the emulated main thread
+            response_size: Bytes of padding in each result
+            drop_rate: Probability of dropping the connection after a response
+            unix_path: Listen on this Unix domain socket instead of TCP
+        """
+        self.main_thread = EmulatedMainThread()
+        super().__init__(host=host, port=port, execute=self.execute_command,
+                         schedule=self.main_thread.schedule, unix_path=unix_path)
+        self.latency = latency
+        self.response_size = response_size
+        self.drop_rate = drop_rate
+        self.commands = 0
+        self.dropped_connections = 0
+        self._random = random.Random()
+
+    def start(self) -> None:
+        self.main_thread.start()
+        super().start()
+
+    def stop(self) -> None:
+        super().stop()
+        self.main_thread.stop()
+
+    def execute_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answer any command after the configured latency.
+
+        A "duration" parameter simulates a long handler that checks for
+        cancellation between chunks of work.
+        """
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        end_time = time.monotonic() + command.get("params", {}).get("duration", 0)
+        while time.monotonic() < end_time:
+            check_cancelled()
+            time.sleep(0.01)
+
+        return {"status": "success", "result": {
+            "type": command.get("type"),
+            "payload": "x" * self.response_size
+        }}
+
+    def _send_response(self, client: socket.socket, send_lock: threading.Lock, response: Dict[str, Any]) -> None:
+        super()._send_response(client, send_lock, response)
+
+        if self.drop_rate and self._random.random() < self.drop_rate:
+            self.dropped_connections += 1
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
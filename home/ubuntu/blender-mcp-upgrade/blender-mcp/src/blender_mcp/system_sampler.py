@@ -0,0 +1,181 @@
+"""
+BlenderMCP background system sampler.
+
+A daemon thread records CPU, per-core load, memory, swap, disk I/O rates and
+the process RSS at a fixed rate into a ring buffer. Readers get the latest
+snapshot and aggregates over the last few seconds without blocking. Calling
+`psutil.cpu_percent(interval=1)` instead would stall Blender's main thread
+for a full second on every call.
+"""
+
+import collections
+import logging
+import threading
+import time
+from typing import Dict, List, Any, Optional, Sequence
+
+import psutil
+
+logger = logging.getLogger("BlenderMCPSystemSampler")
+
+# Seconds between samples
+DEFAULT_INTERVAL = 1.0
+
+# Samples kept in the ring buffer: five minutes at the default interval
+DEFAULT_HISTORY = 300
+
+# Windows in seconds that `summary` aggregates over
+DEFAULT_WINDOWS = (10.0, 60.0)
+
+# Snapshot fields aggregated as mean and max
+AGGREGATED_FIELDS = (
+    "cpu_percent", "memory_percent", "swap_percent", "disk_read_bytes_per_sec",
+    "disk_write_bytes_per_sec", "process_rss"
+)
+
+
+class SystemSampler:
+    """
+    Samples system load on a background thread.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, history: int = DEFAULT_HISTORY):
+        """
+        Args:
+            interval: Seconds between samples
+            history: Samples kept in the ring buffer
+        """
+        self.interval = interval
+        self.samples = collections.deque(maxlen=history)
+        self.process = psutil.Process()
+        self._previous_disk = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start sampling; does nothing if already started."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            # CPU percentages are measured between calls; the first one only sets the baseline
+            psutil.cpu_percent(interval=None, percpu=True)
+            psutil.cpu_percent(interval=None)
+            self.samples.append(self._sample(cpu=False))
+            self._thread = threading.Thread(target=self._run, name="BlenderMCPSystemSampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling; the collected samples are kept."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout=self.interval + 1.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._append(self._sample())
+            except Exception as e:
+                logger.warning(f"Error sampling system load: {str(e)}")
+
+    def _append(self, sample: Dict[str, Any]) -> None:
+        with self._lock:
+            self.samples.append(sample)
+
+    def _sample(self, cpu: bool = True) -> Dict[str, Any]:
+        """
+        Take a snapshot of the system's load.
+
+        Args:
+            cpu: Whether the CPU percentages have a baseline to be measured against
+
+        Returns:
+            Snapshot; CPU and disk rates are None when there is nothing to compare against
+        """
+        now = time.monotonic()
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+
+        read_rate = write_rate = None
+        disk = psutil.disk_io_counters()
+        if disk is not None:
+            if self._previous_disk is not None:
+                elapsed = now - self._previous_disk[0]
+                if elapsed > 0:
+                    read_rate = (disk.read_bytes - self._previous_disk[1].read_bytes) / elapsed
+                    write_rate = (disk.write_bytes - self._previous_disk[1].write_bytes) / elapsed
+            self._previous_disk = (now, disk)
+
+        return {
+            "timestamp": time.time(),
+            "monotonic": now,
+            "cpu_percent": psutil.cpu_percent(interval=None) if cpu else None,
+            "per_cpu_percent": psutil.cpu_percent(interval=None, percpu=True) if cpu else None,
+            "memory_percent": memory.percent,
+            "memory_used": memory.used,
+            "memory_available": memory.available,
+            "swap_percent": swap.percent,
+            "swap_used": swap.used,
+            "disk_read_bytes_per_sec": read_rate,
+            "disk_write_bytes_per_sec": write_rate,
+            "process_rss": self.process.memory_info().rss
+        }
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Get the most recent snapshot, or None before sampling started."""
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+
+    def window(self, seconds: float) -> List[Dict[str, Any]]:
+        """Get the snapshots taken in the last `seconds`, oldest first."""
+        cutoff = time.monotonic() - seconds
+        with self._lock:
+            return [sample for sample in self.samples if sample["monotonic"] >= cutoff]
+
+    def summary(self, windows: Sequence[float] = DEFAULT_WINDOWS) -> Dict[str, Any]:
+        """
+        Get the latest snapshot and aggregates over recent windows.
+
+        Starts the sampler if it is not running yet; right after starting, the
+        CPU figures are None until the first interval has passed.
+
+        Args:
+            windows: Window lengths in seconds
+
+        Returns:
+            Dict with the latest snapshot, per-window mean and max of each
+            aggregated field plus mean per-core load, and the sampling interval
+        """
+        self.start()
+
+        aggregates = {}
+        for seconds in windows:
+            samples = self.window(seconds)
+            aggregate = {"samples": len(samples)}
+            for field in AGGREGATED_FIELDS:
+                values = [sample[field] for sample in samples if sample[field] is not None]
+                aggregate[field] = {
+                    "mean": sum(values) / len(values) if values else None,
+                    "max": max(values) if values else None
+                }
+
+            per_cpu = [sample["per_cpu_percent"] for sample in samples if sample["per_cpu_percent"] is not None]
+            aggregate["per_cpu_percent_mean"] = [sum(core) / len(core) for core in zip(*per_cpu)] if per_cpu else None
+            aggregates[f"{seconds:g}s"] = aggregate
+
+        return {
+            "latest": self.latest(),
+            "windows": aggregates,
+            "interval": self.interval
+        }
+
+
+# Sampler shared by the addon's performance tools
+system_sampler = SystemSampler()